@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+HACHI Display Probe
+Finds the headset panel from DRM sysfs and EDID instead of xrandr
+"""
+
+import hashlib
+import threading
+import time
+from pathlib import Path
+
+# Connector changes arrive as DRM uevents when available
+try:
+    from hotplug import NetlinkUeventSource
+except ImportError:
+    NetlinkUeventSource = None
+
+SYSFS_DRM = Path("/sys/class/drm")
+
+EDID_HEADER = b"\x00\xff\xff\xff\xff\xff\xff\x00"
+
+# How the Cosmos panel identifies itself
+COSMOS_MANUFACTURERS = ("HVR", "HTC")
+COSMOS_NAME_HINTS = ("VIVE", "COSMOS")
+COSMOS_MODES = {(2880, 1700)}
+
+# Parsed EDIDs by content hash; a monitor's EDID never changes, so it is parsed once
+_edid_cache = {}
+
+def _detailed_timing(d):
+    """Mode dict from an 18-byte detailed timing descriptor"""
+    clock = (d[0] | d[1] << 8) * 10000
+    width = d[2] | (d[4] & 0xf0) << 4
+    hblank = d[3] | (d[4] & 0x0f) << 8
+    height = d[5] | (d[7] & 0xf0) << 4
+    vblank = d[6] | (d[7] & 0x0f) << 8
+    total = (width + hblank) * (height + vblank)
+    return {
+        "width": width,
+        "height": height,
+        "refresh": round(clock / total, 2) if total else 0.0
+    }
+
+def parse_edid(data):
+    """Identity and modes from raw EDID bytes, None if it isn't an EDID"""
+    if len(data) < 128 or data[:8] != EDID_HEADER:
+        return None
+    
+    vendor = data[8] << 8 | data[9]
+    info = {
+        "manufacturer": "".join(chr(((vendor >> shift) & 0x1f) + 64) for shift in (10, 5, 0)),
+        "product": data[10] | data[11] << 8,
+        "serial": "",
+        "name": "",
+        "modes": [],
+        "valid": sum(data[:128]) % 256 == 0
+    }
+    
+    for offset in (54, 72, 90, 108):
+        d = data[offset:offset + 18]
+        if d[0] or d[1]:
+            info["modes"].append(_detailed_timing(d))
+        elif d[3] in (0xfc, 0xff):
+            # Display name / serial string, newline terminated
+            text = d[5:18].split(b"\n", 1)[0].decode("ascii", errors="replace").strip()
+            info["name" if d[3] == 0xfc else "serial"] = text
+    
+    # CTA-861 extension blocks carry more detailed timings
+    for index in range(1, min(data[126], len(data) // 128 - 1) + 1):
+        block = data[index * 128:(index + 1) * 128]
+        if block[0] != 0x02 or block[2] < 4:
+            continue
+        for offset in range(block[2], 128 - 18, 18):
+            d = block[offset:offset + 18]
+            if not (d[0] or d[1]):
+                break
+            info["modes"].append(_detailed_timing(d))
+    
+    # The first detailed timing is the preferred mode
+    info["preferred"] = info["modes"][0] if info["modes"] else None
+    return info
+
+def cached_edid(data):
+    """parse_edid() through the content-hash cache"""
+    key = hashlib.sha1(data).digest()
+    if key not in _edid_cache:
+        _edid_cache[key] = parse_edid(data)
+    return _edid_cache[key]
+
+def is_cosmos(info):
+    """Whether parsed EDID belongs to a Vive Cosmos panel"""
+    if not info:
+        return False
+    if info["manufacturer"] in COSMOS_MANUFACTURERS:
+        return True
+    if any(hint in info["name"].upper() for hint in COSMOS_NAME_HINTS):
+        return True
+    return any((mode["width"], mode["height"]) in COSMOS_MODES for mode in info["modes"])
+
+class DisplayProbe:
+    """DRM connectors and the displays on them
+    
+    scan() reads card*-*/status, and edid only for connected outputs. Works
+    the same under X11, Wayland or with no session at all. Once started,
+    DRM hotplug uevents trigger a rescan; subscribers get the new connector
+    dict whenever it changes. Without uevents the probe rescans every
+    fallback_interval seconds.
+    """
+    
+    def __init__(self, drm_root=SYSFS_DRM, source=None, fallback_interval=5.0):
+        self.drm_root = Path(drm_root)
+        self.source = source
+        self.fallback_interval = fallback_interval
+        self.running = False
+        self.thread = None
+        
+        self.state = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+    
+    def scan(self):
+        """{connector: {"status", "edid"}} for every DRM connector"""
+        connectors = {}
+        for status_file in sorted(self.drm_root.glob("card*-*/status")):
+            connector = status_file.parent
+            try:
+                status = status_file.read_text().strip()
+            except OSError:
+                continue
+            
+            edid = None
+            if status == "connected":
+                try:
+                    data = (connector / "edid").read_bytes()
+                except OSError:
+                    data = b""
+                if data:
+                    edid = cached_edid(data)
+            
+            # "card0-HDMI-A-1" -> "HDMI-A-1"
+            name = connector.name.split("-", 1)[1]
+            connectors[name] = {"status": status, "edid": edid}
+        return connectors
+    
+    def refresh(self):
+        """Rescan and notify subscribers if anything changed"""
+        state = self.scan()
+        with self._lock:
+            changed = state != self.state
+            self.state = state
+            subscribers = list(self._subscribers) if changed else []
+        for callback in subscribers:
+            try:
+                callback(state)
+            except Exception as e:
+                print(f"Display probe subscriber failed: {e}")
+        return state
+    
+    def connectors(self):
+        with self._lock:
+            return dict(self.state)
+    
+    def hmd_connector(self):
+        """Connector name the headset panel is on, or None
+        
+        Identified by EDID; when no connected output has a readable EDID
+        (some drivers don't expose it) any connected HDMI/DP output counts.
+        """
+        connected = {name: c for name, c in self.connectors().items() if c["status"] == "connected"}
+        for name, connector in connected.items():
+            if is_cosmos(connector["edid"]):
+                return name
+        if not any(c["edid"] for c in connected.values()):
+            for name in connected:
+                if name.startswith(("HDMI", "DP")):
+                    return name
+        return None
+    
+    def subscribe(self, callback):
+        """Call callback(connectors) when the connector state changes"""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+    
+    def start(self):
+        """Scan once and follow DRM hotplug events"""
+        if self.running:
+            return
+        self.refresh()
+        
+        if self.source is None and NetlinkUeventSource:
+            try:
+                self.source = NetlinkUeventSource()
+            except OSError as e:
+                print(f"DRM hotplug events unavailable ({e}), rescanning instead")
+        
+        self.running = True
+        target = self._listen if self.source else self._rescan
+        self.thread = threading.Thread(target=target, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        if self.source:
+            self.source.close()
+    
+    def handle_uevent(self, event):
+        # Connector plug/unplug is reported as a "change" on the card with HOTPLUG=1
+        if event.get("SUBSYSTEM") == "drm" and event.get("ACTION") == "change":
+            self.refresh()
+    
+    def _listen(self):
+        while self.running:
+            try:
+                event = self.source.receive(timeout=1.0)
+            except OSError as e:
+                print(f"DRM hotplug error: {e}")
+                time.sleep(1.0)
+                continue
+            if event:
+                self.handle_uevent(event)
+    
+    def _rescan(self):
+        while self.running:
+            time.sleep(self.fallback_interval)
+            self.refresh()
+
+# Print the connectors if run directly
+if __name__ == "__main__":
+    probe = DisplayProbe()
+    probe.refresh()
+    for name, connector in probe.connectors().items():
+        edid = connector["edid"]
+        line = f"{name:>12}: {connector['status']}"
+        if edid:
+            line += f"  {edid['manufacturer']} {edid['name'] or hex(edid['product'])}"
+            if edid["preferred"]:
+                mode = edid["preferred"]
+                line += f"  {mode['width']}x{mode['height']}@{mode['refresh']:g}"
+        print(line)
+    print(f"Headset display: {probe.hmd_connector() or 'not found'}")
@@ -8,10 +8,912 @@ import cv2
 import numpy as np
 import threading
 import time
+import os
+from abc import ABC, abstractmethod
 from pathlib import Path
 import json
+from collections import deque
+
+# Gesture events are optional - tracking works without them
+try:
+    from hand_gestures import GestureEngine
+except ImportError:
+    GestureEngine = None
+
+# Quality levels from best to cheapest. The governor walks down this list when
+# a frame blows its time budget and back up once there is headroom again.
+QUALITY_LEVELS = [
+    {"name": "full", "scale": 1.0, "morph_iterations": 2, "detect_every": 1},
+    {"name": "high", "scale": 0.75, "morph_iterations": 2, "detect_every": 1},
+    {"name": "medium", "scale": 0.75, "morph_iterations": 1, "detect_every": 2},
+    {"name": "low", "scale": 0.5, "morph_iterations": 1, "detect_every": 2},
+    {"name": "minimal", "scale": 0.5, "morph_iterations": 1, "detect_every": 3},
+]
+
+# Hand joints in XR_EXT_hand_tracking order (XrHandJointEXT)
+HAND_JOINTS = (
+    "palm", "wrist",
+    "thumb_metacarpal", "thumb_proximal", "thumb_distal", "thumb_tip",
+    "index_metacarpal", "index_proximal", "index_intermediate", "index_distal", "index_tip",
+    "middle_metacarpal", "middle_proximal", "middle_intermediate", "middle_distal", "middle_tip",
+    "ring_metacarpal", "ring_proximal", "ring_intermediate", "ring_distal", "ring_tip",
+    "little_metacarpal", "little_proximal", "little_intermediate", "little_distal", "little_tip",
+)
+HAND_JOINT_COUNT = len(HAND_JOINTS)
+JOINT_PALM = HAND_JOINTS.index("palm")
+FINGERTIP_JOINTS = tuple(HAND_JOINTS.index(f"{finger}_tip")
+                         for finger in ("thumb", "index", "middle", "ring", "little"))
+
+# XrSpaceLocationFlags bits
+LOCATION_ORIENTATION_VALID = 0x1
+LOCATION_POSITION_VALID = 0x2
+LOCATION_ORIENTATION_TRACKED = 0x4
+LOCATION_POSITION_TRACKED = 0x8
+
+# One XrHandJointLocationEXT-like record, 24 bytes with no padding
+HAND_JOINT_DTYPE = np.dtype([
+    ("position", np.float32, (3,)),
+    ("radius", np.float32),
+    ("flags", np.uint64),
+])
+
+# Stage timings kept per history record, in milliseconds (0 = not run)
+HISTORY_STAGES = ("detect", "assign", "flow", "interpolate", "undistort",
+                  "fusion", "gestures", "joints")
+
+# One record per hand per frame; track 0 is the left hand, 1 the right
+HAND_HISTORY_DTYPE = np.dtype([
+    ("timestamp", np.float64),
+    ("track", np.uint8),
+    ("detected", np.bool_),
+    ("fingers", np.uint8),
+    ("position", np.float32, (2,)),
+    ("confidence", np.float32),
+    ("stages_ms", np.float32, (len(HISTORY_STAGES),)),
+])
+
+class HandHistory:
+    """Fixed-capacity ring buffer of hand records
+    
+    Memory is allocated once. Queries return read-only views into the ring;
+    they stay valid until the writer wraps around onto them, so copy them
+    when keeping them longer than the buffer covers.
+    """
+    
+    def __init__(self, capacity=8192):
+        self.capacity = capacity
+        self._records = np.zeros(capacity, dtype=HAND_HISTORY_DTYPE)
+        self._written = 0
+        self._stages = np.zeros(len(HISTORY_STAGES), dtype=np.float32)
+    
+    def __len__(self):
+        return min(self._written, self.capacity)
+    
+    def append_frame(self, timestamp, hands, stage_times):
+        """Record both hands of one frame (stage times in seconds)"""
+        stages = self._stages
+        for i, stage in enumerate(HISTORY_STAGES):
+            stages[i] = stage_times.get(stage, 0.0) * 1000.0
+        
+        for track, side in enumerate(("left", "right")):
+            hand = hands[side]
+            record = self._records[self._written % self.capacity]
+            record["timestamp"] = timestamp
+            record["track"] = track
+            record["detected"] = hand["detected"]
+            record["fingers"] = hand["fingers"]
+            record["position"] = hand["position"]
+            record["confidence"] = hand["confidence"]
+            record["stages_ms"] = stages
+            self._written += 1
+    
+    def segments(self):
+        """Stored records oldest first, as one or two views"""
+        written = self._written
+        if written <= self.capacity:
+            return (self._records[:written],)
+        
+        split = written % self.capacity
+        if split == 0:
+            return (self._records,)
+        return (self._records[split:], self._records[:split])
+    
+    def get_history(self, seconds, now=None):
+        """Records from the last `seconds`, oldest first, as read-only views
+        
+        Returns a tuple of at most two arrays (two when the window crosses
+        the end of the ring). Timestamps are time.perf_counter() values.
+        """
+        if now is None:
+            now = time.perf_counter()
+        
+        views = []
+        for segment in self.segments():
+            start = np.searchsorted(segment["timestamp"], now - seconds)
+            if start < len(segment):
+                view = segment[start:]
+                view.flags.writeable = False
+                views.append(view)
+        return tuple(views)
+    
+    def export(self, path):
+        """Save the whole history to a .npy file, returns the record count"""
+        records = np.concatenate(self.segments())
+        np.save(path, records)
+        return len(records)
+
+class HandJointBuffer:
+    """Preallocated (2, 26) joint array, rows are left and right hand
+    
+    Positions are normalised image coordinates (x, y in 0..1, z = 0 since
+    depth is not observed). Joints the tracker cannot see keep flags = 0.
+    The sequence counter is odd while a write is in progress.
+    """
+    
+    def __init__(self):
+        self._joints = np.zeros((2, HAND_JOINT_COUNT), dtype=HAND_JOINT_DTYPE)
+        self.view = self._joints.view()
+        self.view.flags.writeable = False
+        self.sequence = 0
+    
+    def write(self, hands, frame_width, frame_height):
+        """Fill the array in place from the left/right hand dicts"""
+        self.sequence += 1
+        joints = self._joints
+        joints["flags"] = 0
+        observed = LOCATION_POSITION_VALID | LOCATION_POSITION_TRACKED
+        
+        for row, (side, hand) in enumerate(hands):
+            if not hand["detected"]:
+                continue
+            
+            bbox = hand.get("bbox")
+            palm_radius = min(bbox[2], bbox[3]) / 4.0 / frame_width if bbox else 0.0
+            
+            palm = joints[row, JOINT_PALM]
+            palm["position"] = (hand["position"][0] / frame_width,
+                                hand["position"][1] / frame_height, 0.0)
+            palm["radius"] = palm_radius
+            palm["flags"] = observed
+            
+            # Finger identity is only reliable when all five tips are visible.
+            # Seen from behind, the thumb is the outermost tip towards the body.
+            tips = hand.get("fingertips", [])
+            if len(tips) != 5:
+                continue
+            tips = sorted(tips, key=lambda tip: tip[0], reverse=(side == "left"))
+            for joint, (x, y) in zip(FINGERTIP_JOINTS, tips):
+                tip = joints[row, joint]
+                tip["position"] = (x / frame_width, y / frame_height, 0.0)
+                tip["radius"] = palm_radius * 0.2
+                tip["flags"] = observed
+        
+        self.sequence += 1
+    
+    def read(self, out=None):
+        """Copy a consistent snapshot, returns (sequence, array)"""
+        if out is None:
+            out = np.empty_like(self._joints)
+        
+        while True:
+            sequence = self.sequence
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            np.copyto(out, self._joints)
+            if self.sequence == sequence:
+                return sequence, out
+
+class QualityGovernor:
+    """Adapts tracking quality to a per-frame time budget and system load"""
+    
+    SMOOTHING = 0.1  # EWMA factor for stage times
+    DOWNGRADE_FRAMES = 10  # Consecutive overloaded frames before stepping down
+    UPGRADE_FRAMES = 90  # Consecutive relaxed frames before stepping up
+    HIGH_LOAD = 1.0  # 1-minute load per CPU considered saturated
+    LOW_LOAD = 0.7  # Load per CPU below which we may step back up
+    
+    def __init__(self, budget_ms=15.0, enabled=True):
+        self.budget = budget_ms / 1000.0
+        self.enabled = enabled
+        self.level_index = 0
+        
+        # Measurements
+        self.frame_time = 0.0
+        self.stage_times = {}
+        self.budget_misses = 0
+        self.load = 0.0
+        self.cpu_count = os.cpu_count() or 1
+        
+        self._overloaded_frames = 0
+        self._relaxed_frames = 0
+        self._last_load_check = 0.0
+    
+    @property
+    def level(self):
+        """Current quality level settings"""
+        return QUALITY_LEVELS[self.level_index]
+    
+    def should_detect(self, frame_number):
+        """Whether this frame gets full detection or is interpolated"""
+        return frame_number % self.level["detect_every"] == 0
+    
+    def read_load(self):
+        """Read 1-minute load average from /proc/loadavg, normalised per CPU"""
+        try:
+            with open("/proc/loadavg", "r") as f:
+                return float(f.read().split()[0]) / self.cpu_count
+        except (OSError, ValueError, IndexError):
+            return 0.0
+    
+    def update(self, stage_times):
+        """Record one frame's stage timings (seconds) and adjust quality"""
+        total = sum(stage_times.values())
+        
+        for stage, elapsed in stage_times.items():
+            previous = self.stage_times.get(stage, elapsed)
+            self.stage_times[stage] = previous + self.SMOOTHING * (elapsed - previous)
+        self.frame_time += self.SMOOTHING * (total - self.frame_time)
+        
+        if total > self.budget:
+            self.budget_misses += 1
+        
+        # /proc/loadavg only changes every few seconds, no need to read it per frame
+        now = time.monotonic()
+        if now - self._last_load_check >= 1.0:
+            self.load = self.read_load()
+            self._last_load_check = now
+        
+        if not self.enabled:
+            return
+        
+        overloaded = total > self.budget or self.load > self.HIGH_LOAD
+        relaxed = self.frame_time < self.budget * 0.5 and self.load < self.LOW_LOAD
+        
+        self._overloaded_frames = self._overloaded_frames + 1 if overloaded else 0
+        self._relaxed_frames = self._relaxed_frames + 1 if relaxed else 0
+        
+        if self._overloaded_frames >= self.DOWNGRADE_FRAMES:
+            self._set_level(self.level_index + 1)
+        elif self._relaxed_frames >= self.UPGRADE_FRAMES:
+            self._set_level(self.level_index - 1)
+    
+    def _set_level(self, index):
+        index = max(0, min(len(QUALITY_LEVELS) - 1, index))
+        if index != self.level_index:
+            self.level_index = index
+        self._overloaded_frames = 0
+        self._relaxed_frames = 0
+    
+    def stats(self):
+        """Governor state for get_hand_data"""
+        return {
+            "level": self.level_index,
+            "name": self.level["name"],
+            "budget_ms": self.budget * 1000.0,
+            "frame_ms": self.frame_time * 1000.0,
+            "budget_misses": self.budget_misses,
+            "load": self.load,
+            "stages_ms": {stage: t * 1000.0 for stage, t in self.stage_times.items()}
+        }
+
+class FisheyeUndistorter:
+    """Lens correction for detected keypoints of one camera
+    
+    Intrinsics come from camera_calibration.json, keyed by camera index. A
+    fixed-point table from raw to undistorted pixels is built once per frame
+    size, so correcting a point is one array lookup and frames are never
+    remapped in the tracking loop.
+    """
+    
+    FRACTION_BITS = 3  # 1/8 pixel steps, int16 then covers +-4096 pixels
+    
+    def __init__(self, calibration, mirrored=True):
+        self.calibration = calibration
+        self.mirrored = mirrored
+        self.size = None
+        self.camera_matrix = None
+        self._table = None
+    
+    @classmethod
+    def load(cls, path, camera_index, mirrored=True):
+        """Undistorter for one camera, or None if it is not calibrated"""
+        path = Path(path).expanduser()
+        if not path.exists():
+            return None
+        
+        try:
+            with open(path, 'r') as f:
+                calibration = json.load(f)[str(camera_index)]
+            np.array(calibration["K"], dtype=np.float64).reshape(3, 3)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"No usable calibration for camera {camera_index}: {e}")
+            return None
+        
+        return cls(calibration, mirrored)
+    
+    def build(self, width, height):
+        """Build the lookup table for a frame size"""
+        K = np.array(self.calibration["K"], dtype=np.float64).reshape(3, 3)
+        
+        # Intrinsics scale with the capture resolution
+        cal_width, cal_height = self.calibration.get("image_size", (width, height))
+        K[0] *= width / cal_width
+        K[1] *= height / cal_height
+        
+        balance = self.calibration.get("balance", 0.0)
+        ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+        points = np.stack([xs, ys], axis=-1).reshape(-1, 1, 2)
+        
+        if self.calibration.get("model", "fisheye") == "fisheye":
+            D = np.array(self.calibration.get("D", [0, 0, 0, 0]), dtype=np.float64).reshape(4, 1)
+            new_K = cv2.fisheye.estimateNewCameraMatrixForUndistortRectify(
+                K, D, (width, height), np.eye(3), balance=balance
+            )
+            undistorted = cv2.fisheye.undistortPoints(points, K, D, P=new_K)
+        else:
+            D = np.array(self.calibration.get("D", [0, 0, 0, 0, 0]), dtype=np.float64)
+            new_K, _ = cv2.getOptimalNewCameraMatrix(K, D, (width, height), balance)
+            undistorted = cv2.undistortPoints(points, K, D, P=new_K)
+        
+        table = undistorted.reshape(height, width, 2)
+        if self.mirrored:
+            # The loop flips frames before detection, so index and report
+            # in mirrored coordinates
+            table = table[:, ::-1].copy()
+            table[..., 0] = (width - 1) - table[..., 0]
+        
+        limit = np.iinfo(np.int16).max
+        table = np.round(table * (1 << self.FRACTION_BITS))
+        self._table = np.clip(table, -limit, limit).astype(np.int16)
+        self.camera_matrix = new_K
+        self.size = (width, height)
+    
+    def undistort_points(self, points):
+        """Map a list of (x, y) pixels to undistorted (x, y) pixels"""
+        width, height = self.size
+        points = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+        xs = np.clip(points[:, 0], 0, width - 1)
+        ys = np.clip(points[:, 1], 0, height - 1)
+        corrected = self._table[ys, xs] / float(1 << self.FRACTION_BITS)
+        return [(int(round(x)), int(round(y))) for x, y in corrected]
+    
+    def undistort_hand(self, hand):
+        """Copy of a hand dict with centroid, fingertips and bbox corrected"""
+        if not hand["detected"]:
+            return hand
+        
+        fingertips = hand.get("fingertips", [])
+        points = [hand["position"]] + list(fingertips)
+        bbox = hand.get("bbox")
+        if bbox:
+            bx, by, bw, bh = bbox
+            points += [(bx, by), (bx + bw, by), (bx, by + bh), (bx + bw, by + bh)]
+        
+        corrected = self.undistort_points(points)
+        hand = dict(hand)
+        hand["position"] = corrected[0]
+        hand["fingertips"] = corrected[1:1 + len(fingertips)]
+        if bbox:
+            corners = np.array(corrected[1 + len(fingertips):])
+            x0, y0 = corners.min(axis=0)
+            x1, y1 = corners.max(axis=0)
+            hand["bbox"] = (int(x0), int(y0), int(x1 - x0), int(y1 - y0))
+        return hand
+
+def skin_mask(frame, lower_skin, upper_skin, iterations=2):
+    """Binary skin mask of a BGR frame"""
+    # Convert to HSV
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    
+    # Create mask for skin color
+    mask = cv2.inRange(hsv, lower_skin, upper_skin)
+    
+    # Morphological operations to remove noise
+    kernel = np.ones((3, 3), np.uint8)
+    mask = cv2.erode(mask, kernel, iterations=iterations)
+    mask = cv2.dilate(mask, kernel, iterations=iterations)
+    return cv2.GaussianBlur(mask, (5, 5), 100)
+
+def hands_from_mask(mask, scale, settings, offset=(0, 0), filter_area=True):
+    """Turn skin-mask contours into hand dicts in full-resolution pixels
+    
+    settings provides min_area, max_area and sensitivity. offset is added to
+    all coordinates, for masks computed on a crop of the frame.
+    """
+    hands = []
+    ox, oy = offset
+    area_scale = scale * scale
+    
+    # Find contours
+    contours, _ = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    
+    # Process each contour
+    for contour in contours:
+        # Area in full-resolution pixels
+        area = cv2.contourArea(contour) / area_scale
+        
+        # Filter by area
+        if filter_area and (area < settings.min_area or area > settings.max_area):
+            continue
+        
+        # Get convex hull
+        hull = cv2.convexHull(contour, returnPoints=False)
+        
+        # Get defects
+        if len(hull) > 3 and len(contour) > 3:
+            try:
+                defects = cv2.convexityDefects(contour, hull)
+                
+                if defects is None:
+                    continue
+                
+                # Count fingers
+                finger_count = 0
+                tips = []
+                
+                for i in range(defects.shape[0]):
+                    s, e, f, d = defects[i, 0]
+                    start = tuple(contour[s][0])
+                    end = tuple(contour[e][0])
+                    far = tuple(contour[f][0])
+                    
+                    # Calculate angle between points
+                    a = np.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2)
+                    b = np.sqrt((far[0] - start[0])**2 + (far[1] - start[1])**2)
+                    c = np.sqrt((end[0] - far[0])**2 + (end[1] - far[1])**2)
+                    
+                    # Apply cosine rule
+                    angle = np.arccos((b**2 + c**2 - a**2) / (2*b*c))
+                    
+                    # If angle is less than 90 degrees, it's a finger gap
+                    if angle <= np.pi/2:
+                        finger_count += 1
+                        tips.extend((start, end))
+                
+                # Add one for the thumb
+                finger_count += 1
+                
+                # Clamp to valid range (0-5)
+                finger_count = max(0, min(5, finger_count))
+                
+                # Get hand center
+                M = cv2.moments(contour)
+                if M["m00"] != 0:
+                    cx = int(M["m10"] / M["m00"] / scale) + ox
+                    cy = int(M["m01"] / M["m00"] / scale) + oy
+                else:
+                    cx, cy = 0, 0
+                
+                # Calculate confidence based on area
+                confidence = min(1.0, area / settings.max_area)
+                
+                # Fingertips are the hull points either side of each gap;
+                # neighbouring gaps share a tip, so merge close points
+                fingertips = []
+                for tx, ty in tips:
+                    tip = (int(tx / scale) + ox, int(ty / scale) + oy)
+                    if all(abs(tip[0] - fx) + abs(tip[1] - fy) > 20 for fx, fy in fingertips):
+                        fingertips.append(tip)
+                
+                bx, by, bw, bh = cv2.boundingRect(contour)
+                
+                # Store hand data
+                hand_data = {
+                    "detected": True,
+                    "fingers": finger_count,
+                    "position": (cx, cy),
+                    "confidence": confidence * settings.sensitivity,
+                    "fingertips": fingertips[:5],
+                    "bbox": (int(bx / scale) + ox, int(by / scale) + oy,
+                             int(bw / scale), int(bh / scale))
+                }
+                
+                hands.append(hand_data)
+            
+            except Exception as e:
+                # Skip this contour if processing fails
+                continue
+    
+    return hands
+
+def no_hand():
+    return {"detected": False, "fingers": 0, "position": (0, 0), "confidence": 0.0}
+
+def split_hands(hands, frame_width):
+    """Assign up to two detected hands to (left, right) by image position"""
+    if len(hands) == 0:
+        return no_hand(), no_hand()
+    
+    if len(hands) == 1:
+        # Single hand - determine if left or right based on position
+        hand = hands[0]
+        if hand["position"][0] < frame_width // 2:
+            return hand, no_hand()
+        return no_hand(), hand
+    
+    # Two hands - left is the one on the left side
+    if hands[0]["position"][0] < hands[1]["position"][0]:
+        return hands[0], hands[1]
+    return hands[1], hands[0]
+
+class HandDetector(ABC):
+    """Base class for hand detection backends
+    
+    Backends get the tracker for their settings and return a list of hand
+    dicts (detected, fingers, position, confidence, fingertips, bbox). A
+    backend without detect() fails when it is created, not on every frame.
+    """
+    
+    name = "base"
+    
+    def __init__(self, tracker):
+        self.tracker = tracker
+    
+    @classmethod
+    def available(cls):
+        """Whether the backend's dependencies are installed"""
+        return True
+    
+    @abstractmethod
+    def detect(self, frame, level):
+        """Detect hands in a BGR frame at the given quality level"""
+    
+    def close(self):
+        """Release backend resources"""
+        pass
+
+class SkinColorDetector(HandDetector):
+    """HSV skin thresholding with convexity-defect finger counting"""
+    
+    name = "skin"
+    
+    def detect(self, frame, level):
+        scale = level["scale"]
+        
+        # Work on a downscaled copy at reduced quality levels
+        if scale != 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
+        mask = skin_mask(frame, self.tracker.lower_skin, self.tracker.upper_skin,
+                         level["morph_iterations"])
+        return hands_from_mask(mask, scale, self.tracker)
+
+class OnnxHandDetector(HandDetector):
+    """Learned hand detector run on the CPU through onnxruntime
+    
+    The model is loaded from a local file (detector_model). It must take one
+    float32 NCHW RGB input in 0..1 and return boxes as (N, 5) or (1, N, 5)
+    rows of normalised x1, y1, x2, y2, score. Int8-quantised models work
+    unchanged. Fingers are counted by skin segmentation inside each box.
+    """
+    
+    name = "onnx"
+    
+    def __init__(self, tracker):
+        super().__init__(tracker)
+        import onnxruntime
+        
+        model = Path(tracker.detector_model).expanduser()
+        if not model.exists():
+            raise FileNotFoundError(f"model not found: {model}")
+        
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = tracker.detector_threads
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            str(model), options, providers=["CPUExecutionProvider"]
+        )
+        
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        height, width = model_input.shape[2:4]
+        
+        # Dynamic axes show up as strings, fall back to a common detector size
+        self.input_size = (
+            width if isinstance(width, int) else 192,
+            height if isinstance(height, int) else 192
+        )
+        self._blob = np.empty((1, 3, self.input_size[1], self.input_size[0]), dtype=np.float32)
+    
+    @classmethod
+    def available(cls):
+        import importlib.util
+        return importlib.util.find_spec("onnxruntime") is not None
+    
+    def detect(self, frame, level):
+        h, w = frame.shape[:2]
+        settings = self.tracker
+        
+        resized = cv2.resize(frame, self.input_size, interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+        np.multiply(rgb.transpose(2, 0, 1), 1.0 / 255.0, out=self._blob[0], casting="unsafe")
+        
+        output = np.asarray(self.session.run(None, {self.input_name: self._blob})[0], dtype=np.float32)
+        boxes = output.reshape(-1, output.shape[-1])
+        boxes = boxes[boxes[:, 4] >= settings.detector_threshold]
+        if len(boxes) == 0:
+            return []
+        
+        rects = [[float(x1 * w), float(y1 * h), float((x2 - x1) * w), float((y2 - y1) * h)]
+                 for x1, y1, x2, y2 in boxes[:, :4]]
+        scores = [float(score) for score in boxes[:, 4]]
+        keep = cv2.dnn.NMSBoxes(rects, scores, settings.detector_threshold, 0.4)
+        
+        hands = []
+        for i in np.array(keep).reshape(-1)[:2]:
+            x, y, bw, bh = (int(v) for v in rects[i])
+            x, y = max(0, x), max(0, y)
+            bw, bh = min(w - x, bw), min(h - y, bh)
+            if bw <= 0 or bh <= 0:
+                continue
+            
+            # Count fingers on the largest skin blob inside the box
+            mask = skin_mask(frame[y:y + bh, x:x + bw], settings.lower_skin,
+                             settings.upper_skin, level["morph_iterations"])
+            found = hands_from_mask(mask, 1.0, settings, offset=(x, y), filter_area=False)
+            if found:
+                hand = max(found, key=lambda candidate: candidate["confidence"])
+            else:
+                hand = {
+                    "detected": True,
+                    "fingers": 0,
+                    "position": (x + bw // 2, y + bh // 2),
+                    "fingertips": []
+                }
+            
+            hand["confidence"] = scores[i] * settings.sensitivity
+            hand["bbox"] = (x, y, bw, bh)
+            hands.append(hand)
+        
+        return hands
+    
+    def close(self):
+        self.session = None
+
+# Detector backends selectable with the "detector" config key
+DETECTOR_BACKENDS = {
+    "skin": SkinColorDetector,
+    "onnx": OnnxHandDetector,
+}
+
+def create_detector(name, tracker):
+    """Create a detector backend, falling back to skin detection"""
+    backend = DETECTOR_BACKENDS.get(name)
+    if backend is None:
+        print(f"Unknown detector '{name}', using skin detector")
+        return SkinColorDetector(tracker)
+    
+    try:
+        return backend(tracker)
+    except Exception as e:
+        print(f"Detector '{name}' unavailable ({e}), using skin detector")
+        return SkinColorDetector(tracker)
+
+class HandFusion:
+    """Confidence-weighted merge of hand observations from several cameras
+    
+    Each camera keeps only its latest observation per hand, so fusing costs
+    the same every frame however far apart the cameras run. Capture times are
+    moved onto the host clock with a per-camera offset. Observations fade
+    with age, so a slow camera loses weight instead of holding up output.
+    Only observations in primary camera pixels (the primary itself, or a
+    camera with a "to_primary" homography) are averaged into the position;
+    uncalibrated cameras add confidence but no position.
+    """
+    
+    OFFSET_WINDOW = 120  # Frames used to estimate each camera's clock offset
+    
+    def __init__(self, max_age=0.1, half_life=0.033):
+        self.max_age = max_age
+        self.half_life = half_life
+        self._slots = {}
+        self._offsets = {}
+        self._lock = threading.Lock()
+    
+    def align(self, camera, device_time, host_time):
+        """Capture time of a frame on the host perf_counter clock"""
+        if not device_time:
+            # Driver gives no buffer timestamps, arrival time is all we have
+            return host_time
+        
+        offsets = self._offsets.get(camera)
+        if offsets is None:
+            offsets = self._offsets[camera] = deque(maxlen=self.OFFSET_WINDOW)
+        offsets.append(host_time - device_time)
+        
+        # Delivery delay only ever adds to the offset, so the smallest one
+        # seen recently is closest to the true capture time
+        return device_time + min(offsets)
+    
+    def observe(self, camera, side, hand, timestamp):
+        """Store the latest observation of one hand from one camera"""
+        with self._lock:
+            self._slots[(camera, side)] = (timestamp, hand)
+    
+    def forget(self, camera):
+        """Drop a camera that stopped delivering frames"""
+        with self._lock:
+            for side in ("left", "right"):
+                self._slots.pop((camera, side), None)
+            self._offsets.pop(camera, None)
+    
+    def fuse(self, now):
+        """One hand dict per side from the fresh observations"""
+        with self._lock:
+            slots = list(self._slots.items())
+        
+        fused = {}
+        for side in ("left", "right"):
+            total = x = y = 0.0
+            missed = 1.0
+            cameras = 0
+            best, best_weight = None, 0.0
+            best_mapped, best_mapped_weight = None, 0.0
+            
+            for (camera, slot_side), (timestamp, hand) in slots:
+                if slot_side != side or not hand["detected"]:
+                    continue
+                age = max(0.0, now - timestamp)
+                if age > self.max_age:
+                    continue
+                
+                weight = hand["confidence"] * 0.5 ** (age / self.half_life)
+                if weight <= 0:
+                    continue
+                
+                missed *= 1.0 - min(hand["confidence"], 1.0)
+                cameras += 1
+                if weight > best_weight:
+                    best, best_weight = hand, weight
+                if not hand.get("mapped", True):
+                    continue
+                total += weight
+                x += weight * hand["position"][0]
+                y += weight * hand["position"][1]
+                if weight > best_mapped_weight:
+                    best_mapped, best_mapped_weight = hand, weight
+            
+            if best is None:
+                fused[side] = no_hand()
+                continue
+            
+            # Finger count and keypoints come from the most trusted view
+            # that shares the primary's coordinates
+            if best_mapped is not None:
+                hand = dict(best_mapped)
+                hand["position"] = (int(x / total), int(y / total))
+            else:
+                hand = dict(best)
+            hand.pop("mapped", None)
+            hand["confidence"] = 1.0 - missed
+            hand["cameras"] = cameras
+            fused[side] = hand
+        
+        return fused
+
+class CameraObserver:
+    """Reads an additional camera on its own thread and feeds HandFusion
+    
+    Detections are undistorted with the camera's calibration and mapped into
+    the primary camera's image with the optional "to_primary" homography;
+    without one they only contribute confidence to the fused hand.
+    """
+    
+    def __init__(self, tracker, camera_index, fusion):
+        self.tracker = tracker
+        self.camera_index = camera_index
+        self.fusion = fusion
+        self.camera = None
+        self.running = False
+        self.thread = None
+        self.fps = 0
+        self.undistorter = None
+        self.homography = None
+    
+    def start(self):
+        """Open the camera and start observing, returns False if it fails"""
+        self.camera = cv2.VideoCapture(self.camera_index)
+        if not self.camera.isOpened():
+            print(f"Failed to open camera {self.camera_index}")
+            self.camera = None
+            return False
+        
+        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        self.camera.set(cv2.CAP_PROP_FPS, self.tracker.camera_fps)
+        
+        tracker = self.tracker
+        if tracker.undistort:
+            self.undistorter = FisheyeUndistorter.load(tracker.calibration_file, self.camera_index)
+        if self.undistorter and "to_primary" in self.undistorter.calibration:
+            self.homography = np.array(self.undistorter.calibration["to_primary"],
+                                       dtype=np.float64).reshape(3, 3)
+        
+        # Backends may keep per-call buffers, so every camera gets its own
+        self.detector = create_detector(tracker.detector_name, tracker)
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return True
+    
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        if self.camera:
+            self.camera.release()
+            self.camera = None
+        self.detector.close()
+        self.fusion.forget(self.camera_index)
+    
+    def _to_primary(self, hand, frame_width, frame_height, primary_size):
+        """Map a hand's keypoints into primary camera pixels"""
+        points = [hand["position"]] + list(hand.get("fingertips", []))
+        points = np.array(points, dtype=np.float64).reshape(-1, 1, 2)
+        
+        if self.homography is not None:
+            points = cv2.perspectiveTransform(points, self.homography)
+        else:
+            # Without a homography the view is unknown: scale only, so the
+            # left/right split works, and keep it out of the fused position
+            points[..., 0] *= primary_size[0] / frame_width
+            points[..., 1] *= primary_size[1] / frame_height
+        
+        points = [(int(x), int(y)) for x, y in points.reshape(-1, 2)]
+        hand = dict(hand)
+        hand["mapped"] = self.homography is not None
+        hand["position"] = points[0]
+        hand["fingertips"] = points[1:]
+        hand.pop("bbox", None)
+        return hand
+    
+    def _loop(self):
+        frame_count = 0
+        last_fps_time = time.time()
+        
+        while self.running:
+            try:
+                ret, frame = self.camera.read()
+                if not ret:
+                    time.sleep(0.1)
+                    continue
+                received = time.perf_counter()
+                device_time = self.camera.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                timestamp = self.fusion.align(self.camera_index, device_time, received)
+                
+                frame = cv2.flip(frame, 1)
+                h, w = frame.shape[:2]
+                hands = self.detector.detect(frame, self.tracker.governor.level)
+                
+                undistorter = self.undistorter
+                if undistorter:
+                    if undistorter.size != (w, h):
+                        undistorter.build(w, h)
+                    hands = [undistorter.undistort_hand(hand) for hand in hands]
+                
+                primary_size = self.tracker.frame_size or (w, h)
+                hands = [self._to_primary(hand, w, h, primary_size) for hand in hands]
+                left, right = split_hands(hands, primary_size[0])
+                self.fusion.observe(self.camera_index, "left", left, timestamp)
+                self.fusion.observe(self.camera_index, "right", right, timestamp)
+                
+                frame_count += 1
+                if time.time() - last_fps_time >= 1.0:
+                    self.fps = frame_count
+                    frame_count = 0
+                    last_fps_time = time.time()
+            
+            except Exception as e:
+                print(f"Camera {self.camera_index} error: {e}")
+                time.sleep(0.1)
 
 class FingerTracker:
+    CONFIG_POLL_INTERVAL = 0.5  # Seconds between finger_tracking.json mtime checks
+    
+    # Largest share of the tracking thread that preview rendering may take
+    PREVIEW_SHARE = 0.05
+    
     def __init__(self):
         self.enabled = False
         self.running = False
@@ -25,6 +927,47 @@ class FingerTracker:
         # Camera
         self.camera = None
         self.camera_index = 0
+        self.camera_fps = 30
+        self.frame_size = None
+        
+        # Additional cameras fused into the primary camera's hand state
+        self.extra_cameras = []
+        self.fusion_max_age = 0.1  # Observations older than this are ignored
+        self.fusion = None
+        self.observers = []
+        
+        # Adaptive quality
+        self.frame_budget_ms = 15.0
+        self.adaptive_quality = True
+        
+        # Detector backend
+        self.detector_name = "skin"
+        self.detector_model = str(Path.home() / ".local" / "share" / "hachi" / "models" / "hand_detector.onnx")
+        self.detector_threshold = 0.5
+        self.detector_threads = 2
+        
+        # Lens correction of detected keypoints
+        self.undistort = True
+        self.calibration_file = str(Path.home() / ".local" / "share" / "hachi" / "camera_calibration.json")
+        self.undistorter = None
+        
+        # Downsampled preview frames for the control center
+        self.preview_enabled = False
+        self.preview_width = 320
+        self.preview_fps = 15
+        self.preview_cost = 0.0  # Smoothed render time per preview (seconds)
+        self.previews_rendered = 0
+        self._preview = (0, None)
+        self._last_preview = 0.0
+        
+        # Hand history ring buffer (records, two per frame)
+        self.history_size = 8192
+        
+        # Optical flow between full detections
+        self.optical_flow = True
+        self.flow_interval = 4  # Full detection at least every K frames
+        self.flow_max_error = 20.0  # Mean LK error that forces re-detection
+        self.flow_min_tracked = 0.6  # Fraction of points that must survive
         
         # Hand tracking data
         self.left_hand = {
@@ -47,7 +990,32 @@ class FingerTracker:
         # Config
         self.config_dir = Path.home() / ".local" / "share" / "hachi"
         self.config_file = self.config_dir / "finger_tracking.json"
+        self._config_stamp = None
+        self._last_config_check = 0.0
         self.load_config()
+        self.governor = QualityGovernor(self.frame_budget_ms, self.adaptive_quality)
+        self.gestures = GestureEngine() if GestureEngine else None
+        self.joints = HandJointBuffer()
+        self.history = HandHistory(self.history_size)
+        self.detector = create_detector(self.detector_name, self)
+        
+        # Hands as published to gestures, joints and readers. Internal
+        # state (flow, motion) stays in raw pixels; only this is undistorted.
+        self.output_hands = {"left": self.left_hand, "right": self.right_hand}
+        
+        # Last detected position and velocity per hand, for interpolation
+        self._motion = {"left": None, "right": None}
+        
+        # Per-hand optical flow state (points, ROI and previous grey ROI)
+        self._flow = {"left": None, "right": None}
+        self._frames_since_detection = 0
+        self._force_detect = True
+        self.flow_redetects = 0
+        self._lk_params = dict(
+            winSize=(15, 15),
+            maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
         
         # Performance tracking
         self.fps = 0
@@ -58,33 +1026,156 @@ class FingerTracker:
         """Load tracking configuration"""
         if self.config_file.exists():
             try:
+                self._config_stamp = self._stat_config()
                 with open(self.config_file, 'r') as f:
                     config = json.load(f)
-                    self.sensitivity = config.get("sensitivity", 0.7)
-                    self.camera_index = config.get("camera_index", 0)
-                    
-                    # Load custom skin color range if calibrated
-                    if "lower_skin" in config:
-                        self.lower_skin = np.array(config["lower_skin"], dtype=np.uint8)
-                    if "upper_skin" in config:
-                        self.upper_skin = np.array(config["upper_skin"], dtype=np.uint8)
+                self._apply_config(config)
             except Exception as e:
                 print(f"Failed to load config: {e}")
     
+    def _apply_config(self, config):
+        """Set tracking parameters from a config dict"""
+        self.sensitivity = config.get("sensitivity", 0.7)
+        self.camera_index = config.get("camera_index", 0)
+        self.extra_cameras = config.get("extra_cameras", [])
+        self.fusion_max_age = config.get("fusion_max_age", 0.1)
+        self.frame_budget_ms = config.get("frame_budget_ms", 15.0)
+        self.adaptive_quality = config.get("adaptive_quality", True)
+        self.detector_name = config.get("detector", "skin")
+        self.detector_model = config.get("detector_model", self.detector_model)
+        self.detector_threshold = config.get("detector_threshold", 0.5)
+        self.detector_threads = config.get("detector_threads", 2)
+        self.undistort = config.get("undistort", True)
+        self.calibration_file = config.get("calibration_file", self.calibration_file)
+        self.history_size = config.get("history_size", 8192)
+        self.optical_flow = config.get("optical_flow", True)
+        self.flow_interval = config.get("flow_interval", 4)
+        self.flow_max_error = config.get("flow_max_error", 20.0)
+        self.flow_min_tracked = config.get("flow_min_tracked", 0.6)
+        
+        # Load custom skin color range if calibrated
+        if "lower_skin" in config:
+            self.lower_skin = np.array(config["lower_skin"], dtype=np.uint8)
+        if "upper_skin" in config:
+            self.upper_skin = np.array(config["upper_skin"], dtype=np.uint8)
+    
+    def _stat_config(self):
+        """Modification stamp of the config file, None if it is missing"""
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _check_config(self, now):
+        """Pick up edits to finger_tracking.json, polled from the tracking loop"""
+        if now - self._last_config_check < self.CONFIG_POLL_INTERVAL:
+            return
+        self._last_config_check = now
+        
+        stamp = self._stat_config()
+        if stamp is None or stamp == self._config_stamp:
+            return
+        self._config_stamp = stamp
+        
+        try:
+            with open(self.config_file, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            # Half-written by an editor; the finished write changes the stamp again
+            print(f"Ignoring unreadable config: {e}")
+            return
+        
+        self.reload_config(config)
+    
+    def reload_config(self, config):
+        """Apply a new config between frames, rebuilding only what changed
+        
+        Call from the tracking thread (or while it is stopped). Returns the
+        set of changed keys. Camera selection only changes on restart.
+        """
+        before = self._config_dict()
+        self._apply_config(config)
+        after = self._config_dict()
+        changed = {key for key in after if after[key] != before[key]}
+        if not changed:
+            return changed
+        
+        if changed & {"detector", "detector_model", "detector_threads"}:
+            old = self.detector
+            self.detector = create_detector(self.detector_name, self)
+            old.close()
+            for observer in self.observers:
+                # Observers may be mid-detect; the old one is left to the GC
+                observer.detector = create_detector(self.detector_name, self)
+            self._force_detect = True
+        
+        if changed & {"frame_budget_ms", "adaptive_quality"}:
+            self.governor.budget = self.frame_budget_ms / 1000.0
+            self.governor.enabled = self.adaptive_quality
+        
+        if changed & {"undistort", "calibration_file"} and self.running:
+            self._load_undistorter(*(self.frame_size or (640, 480)))
+            for observer in self.observers:
+                observer.undistorter = None
+                if self.undistort:
+                    observer.undistorter = FisheyeUndistorter.load(self.calibration_file,
+                                                                   observer.camera_index)
+        
+        if "fusion_max_age" in changed and self.fusion:
+            self.fusion.max_age = self.fusion_max_age
+        
+        if "history_size" in changed:
+            self.history = HandHistory(self.history_size)
+        
+        if "optical_flow" in changed:
+            self._flow = {"left": None, "right": None}
+            self._force_detect = True
+        
+        if changed & {"camera_index", "extra_cameras"} and self.running:
+            print("Camera changes take effect when tracking is restarted")
+        
+        print(f"Reloaded finger tracking config: {', '.join(sorted(changed))}")
+        return changed
+    
     def save_config(self):
         """Save tracking configuration"""
         self.config_dir.mkdir(parents=True, exist_ok=True)
-        config = {
+        
+        # Write a temporary file and rename it, so the tracking loop never
+        # sees a half-written config
+        tmp_file = self.config_file.with_suffix(".json.tmp")
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(self._config_dict(), f, indent=2)
+            os.replace(tmp_file, self.config_file)
+            self._config_stamp = self._stat_config()
+        except Exception as e:
+            print(f"Failed to save config: {e}")
+    
+    def _config_dict(self):
+        """Current tracking parameters as saved in finger_tracking.json"""
+        return {
             "sensitivity": self.sensitivity,
             "camera_index": self.camera_index,
+            "extra_cameras": self.extra_cameras,
+            "fusion_max_age": self.fusion_max_age,
+            "frame_budget_ms": self.frame_budget_ms,
+            "adaptive_quality": self.adaptive_quality,
+            "detector": self.detector_name,
+            "detector_model": self.detector_model,
+            "detector_threshold": self.detector_threshold,
+            "detector_threads": self.detector_threads,
+            "undistort": self.undistort,
+            "calibration_file": self.calibration_file,
+            "history_size": self.history_size,
+            "optical_flow": self.optical_flow,
+            "flow_interval": self.flow_interval,
+            "flow_max_error": self.flow_max_error,
+            "flow_min_tracked": self.flow_min_tracked,
             "lower_skin": self.lower_skin.tolist(),
             "upper_skin": self.upper_skin.tolist()
         }
-        try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
-        except Exception as e:
-            print(f"Failed to save config: {e}")
     
     def start(self):
         """Start finger tracking"""
@@ -100,17 +1191,44 @@ class FingerTracker:
         # Set camera properties for better performance
         self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        self.camera.set(cv2.CAP_PROP_FPS, 30)
+        self.camera.set(cv2.CAP_PROP_FPS, self.camera_fps)
+        
+        # Build the undistortion table now rather than on the first frame
+        self._load_undistorter(
+            int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH)) or 640,
+            int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 480
+        )
         
         self.running = True
         self.enabled = True
         
+        # Other cameras run on their own threads, a slow one never stalls this loop
+        self.fusion = None
+        self.observers = []
+        if self.extra_cameras:
+            self.fusion = HandFusion(self.fusion_max_age, half_life=1.0 / self.camera_fps)
+            for index in self.extra_cameras:
+                observer = CameraObserver(self, index, self.fusion)
+                if observer.start():
+                    self.observers.append(observer)
+            if not self.observers:
+                self.fusion = None
+        
         # Start tracking thread
         self.thread = threading.Thread(target=self._tracking_loop, daemon=True)
         self.thread.start()
         
         return True
     
+    def _load_undistorter(self, width, height):
+        """(Re)load the primary camera's calibration and build its table"""
+        undistorter = None
+        if self.undistort:
+            undistorter = FisheyeUndistorter.load(self.calibration_file, self.camera_index)
+        if undistorter:
+            undistorter.build(width, height)
+        self.undistorter = undistorter
+    
     def stop(self):
         """Stop finger tracking"""
         self.running = False
@@ -119,47 +1237,108 @@ class FingerTracker:
         if self.thread:
             self.thread.join(timeout=2.0)
         
+        for observer in self.observers:
+            observer.stop()
+        self.observers = []
+        self.fusion = None
+        
+        # Let gesture listeners see both hands go away
+        self.left_hand["detected"] = False
+        self.right_hand["detected"] = False
+        self.output_hands = {"left": self.left_hand, "right": self.right_hand}
+        if self.gestures:
+            self.gestures.update(
+                {"left": self.left_hand, "right": self.right_hand},
+                time.perf_counter() + self.gestures.lost_timeout
+            )
+        
         if self.camera:
             self.camera.release()
             self.camera = None
     
     def _tracking_loop(self):
         """Main tracking loop"""
+        frame_number = 0
+        frame_period = 1.0 / self.camera_fps
+        
         while self.running:
             try:
                 # Read frame
+                frame_start = time.perf_counter()
+                self._check_config(frame_start)
                 ret, frame = self.camera.read()
                 if not ret:
                     time.sleep(0.1)
                     continue
+                capture_done = time.perf_counter()
+                self.frame_size = (frame.shape[1], frame.shape[0])
                 
                 # Mirror the frame for more intuitive interaction
                 frame = cv2.flip(frame, 1)
                 
-                # Detect hands
-                hands = self._detect_hands(frame)
-                
-                # Update hand data
-                if len(hands) == 0:
-                    self.left_hand["detected"] = False
-                    self.right_hand["detected"] = False
-                elif len(hands) == 1:
-                    # Single hand - determine if left or right based on position
-                    hand = hands[0]
-                    if hand["position"][0] < frame.shape[1] // 2:
-                        self.left_hand = hand
-                        self.right_hand["detected"] = False
-                    else:
-                        self.right_hand = hand
-                        self.left_hand["detected"] = False
+                # Full detection, or propagate/interpolate in between
+                stage_times = {}
+                if self._should_detect(frame_number):
+                    hands = self._detect_hands(frame)
+                    detect_done = time.perf_counter()
+                    self._assign_hands(hands, frame.shape[1], detect_done)
+                    # Cleared first: a hand at the edge asks for detection again
+                    self._force_detect = False
+                    if self.optical_flow:
+                        self._reset_flow(frame)
+                    self._frames_since_detection = 0
+                    stage_times["detect"] = detect_done - capture_done
+                    stage_times["assign"] = time.perf_counter() - detect_done
+                elif self.optical_flow:
+                    self._propagate_hands(frame)
+                    self._frames_since_detection += 1
+                    stage_times["flow"] = time.perf_counter() - capture_done
                 else:
-                    # Two hands - left is the one on the left side
-                    if hands[0]["position"][0] < hands[1]["position"][0]:
-                        self.left_hand = hands[0]
-                        self.right_hand = hands[1]
-                    else:
-                        self.left_hand = hands[1]
-                        self.right_hand = hands[0]
+                    self._interpolate_hands(capture_done)
+                    self._frames_since_detection += 1
+                    stage_times["interpolate"] = time.perf_counter() - capture_done
+                
+                undistort_start = time.perf_counter()
+                output = self._output_hands(frame.shape)
+                self.output_hands = output
+                if self.undistorter:
+                    stage_times["undistort"] = time.perf_counter() - undistort_start
+                
+                fusion = self.fusion
+                if fusion:
+                    fusion_start = time.perf_counter()
+                    device_time = self.camera.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                    timestamp = fusion.align(self.camera_index, device_time, capture_done)
+                    for side, hand in output.items():
+                        fusion.observe(self.camera_index, side, hand, timestamp)
+                    output = fusion.fuse(time.perf_counter())
+                    self.output_hands = output
+                    stage_times["fusion"] = time.perf_counter() - fusion_start
+                
+                if self.gestures:
+                    gesture_start = time.perf_counter()
+                    self.gestures.update(output, capture_done)
+                    stage_times["gestures"] = time.perf_counter() - gesture_start
+                
+                publish_start = time.perf_counter()
+                self.joints.write(
+                    (("left", output["left"]), ("right", output["right"])),
+                    frame.shape[1], frame.shape[0]
+                )
+                stage_times["joints"] = time.perf_counter() - publish_start
+                
+                frame_number += 1
+                self.governor.update(stage_times)
+                self.history.append_frame(capture_done, output, stage_times)
+                
+                # Previews stay outside the governor's budget; their rate is
+                # bounded by their own measured cost instead
+                if self.preview_enabled and self._preview_due(capture_done):
+                    preview_start = time.perf_counter()
+                    self._preview = (self._preview[0] + 1, self._render_preview(frame))
+                    elapsed = time.perf_counter() - preview_start
+                    self.preview_cost += 0.1 * (elapsed - self.preview_cost)
+                    self.previews_rendered += 1
                 
                 # Update FPS
                 self.frame_count += 1
@@ -169,114 +1348,282 @@ class FingerTracker:
                     self.frame_count = 0
                     self.last_fps_time = current_time
                 
-                # Small delay to prevent CPU overload
-                time.sleep(0.01)
+                # camera.read() normally paces the loop; only sleep if the
+                # driver hands frames back faster than the configured rate
+                remaining = frame_period - (time.perf_counter() - frame_start)
+                if remaining > 0:
+                    time.sleep(remaining)
                 
             except Exception as e:
                 print(f"Tracking error: {e}")
                 time.sleep(0.1)
     
-    def _detect_hands(self, frame):
-        """Detect hands and count fingers"""
-        hands = []
+    def _should_detect(self, frame_number):
+        """Decide whether this frame needs full segmentation"""
+        if not self.optical_flow:
+            return self.governor.should_detect(frame_number)
         
-        # Convert to HSV
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        # Nothing to propagate - keep searching every frame the governor allows
+        if self._force_detect or not any(self._flow.values()):
+            return self.governor.should_detect(frame_number)
         
-        # Create mask for skin color
-        mask = cv2.inRange(hsv, self.lower_skin, self.upper_skin)
+        interval = max(self.flow_interval, self.governor.level["detect_every"])
+        return self._frames_since_detection + 1 >= interval
+    
+    def _flow_roi(self, points, frame_shape, margin=40):
+        """ROI around the tracked points, padded for motion between frames
         
-        # Morphological operations to remove noise
-        kernel = np.ones((3, 3), np.uint8)
-        mask = cv2.erode(mask, kernel, iterations=2)
-        mask = cv2.dilate(mask, kernel, iterations=2)
-        mask = cv2.GaussianBlur(mask, (5, 5), 100)
+        Returns None once the points have drifted so far off the frame that
+        the ROI is smaller than the Lucas-Kanade window.
+        """
+        h, w = frame_shape[:2]
+        x0, y0 = points.reshape(-1, 2).min(axis=0) - margin
+        x1, y1 = points.reshape(-1, 2).max(axis=0) + margin
+        x0 = min(max(0, int(x0)), w - 1)
+        y0 = min(max(0, int(y0)), h - 1)
+        x1 = max(x0, min(w, int(x1)))
+        y1 = max(y0, min(h, int(y1)))
         
-        # Find contours
-        contours, _ = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        window_w, window_h = self._lk_params["winSize"]
+        if x1 - x0 < window_w or y1 - y0 < window_h:
+            return None
+        return (x0, y0, x1, y1)
+    
+    def _roi_gray(self, frame, roi):
+        x0, y0, x1, y1 = roi
+        return cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+    
+    def _reset_flow(self, frame):
+        """Seed flow tracks from the hands found by full detection"""
+        for side, hand in (("left", self.left_hand), ("right", self.right_hand)):
+            if not hand["detected"]:
+                self._flow[side] = None
+                continue
+            
+            # Centroid first, then fingertips
+            points = [hand["position"]] + list(hand.get("fingertips", []))
+            points = np.array(points, dtype=np.float32).reshape(-1, 1, 2)
+            roi = self._flow_roi(points, frame.shape)
+            if roi is None:
+                self._lose_flow(side)
+                continue
+            self._flow[side] = {
+                "points": points,
+                "roi": roi,
+                "gray": self._roi_gray(frame, roi)
+            }
+    
+    def _propagate_hands(self, frame):
+        """Move centroid and fingertips with pyramidal Lucas-Kanade flow"""
+        for side, hand in (("left", self.left_hand), ("right", self.right_hand)):
+            track = self._flow[side]
+            if track is None or not hand["detected"]:
+                continue
+            
+            # Same ROI in the current frame, so both crops share an origin
+            x0, y0, x1, y1 = track["roi"]
+            gray = self._roi_gray(frame, track["roi"])
+            origin = np.array([x0, y0], dtype=np.float32)
+            local = track["points"] - origin
+            
+            new_local, status, error = cv2.calcOpticalFlowPyrLK(
+                track["gray"], gray, local, None, **self._lk_params
+            )
+            if new_local is None:
+                self._lose_flow(side)
+                continue
+            
+            good = status.reshape(-1) == 1
+            tracked = good.mean()
+            mean_error = error.reshape(-1)[good].mean() if good.any() else float("inf")
+            if tracked < self.flow_min_tracked or mean_error > self.flow_max_error:
+                self._lose_flow(side)
+                continue
+            
+            # Lost points follow the median motion of the ones that survived
+            new_points = new_local + origin
+            motion = np.median((new_points - track["points"])[good], axis=0)
+            new_points[~good] = track["points"][~good] + motion
+            
+            cx, cy = new_points[0, 0]
+            hand["position"] = (int(cx), int(cy))
+            hand["fingertips"] = [(int(x), int(y)) for x, y in new_points[1:, 0]]
+            if "bbox" in hand:
+                bx, by, bw, bh = hand["bbox"]
+                dx, dy = motion[0]
+                hand["bbox"] = (int(bx + dx), int(by + dy), bw, bh)
+            
+            roi = self._flow_roi(new_points, frame.shape)
+            if roi is None:
+                self._lose_flow(side)
+                continue
+            track["points"] = new_points
+            track["roi"] = roi
+            track["gray"] = self._roi_gray(frame, roi)
+    
+    def _lose_flow(self, side):
+        """Drop a flow track and ask for full detection on the next frame"""
+        self._flow[side] = None
+        self._force_detect = True
+        self.flow_redetects += 1
+    
+    def _assign_hands(self, hands, frame_width, timestamp):
+        """Assign detected hands to left/right and update motion state"""
+        self.left_hand, self.right_hand = split_hands(hands, frame_width)
         
-        # Process each contour
-        for contour in contours:
-            area = cv2.contourArea(contour)
+        for side, hand in (("left", self.left_hand), ("right", self.right_hand)):
+            previous = self._motion[side]
+            if not hand["detected"]:
+                self._motion[side] = None
+                continue
             
-            # Filter by area
-            if area < self.min_area or area > self.max_area:
+            position = np.array(hand["position"], dtype=np.float32)
+            velocity = np.zeros(2, dtype=np.float32)
+            if previous is not None:
+                dt = timestamp - previous["time"]
+                if dt > 0:
+                    velocity = (position - previous["position"]) / dt
+            self._motion[side] = {"position": position, "velocity": velocity, "time": timestamp}
+    
+    def _interpolate_hands(self, timestamp):
+        """Extrapolate hand positions from the last detections"""
+        # Never coast further than the detection interval
+        max_dt = self.governor.level["detect_every"] / self.camera_fps
+        
+        for side, hand in (("left", self.left_hand), ("right", self.right_hand)):
+            motion = self._motion[side]
+            if motion is None or not hand["detected"]:
                 continue
             
-            # Get convex hull
-            hull = cv2.convexHull(contour, returnPoints=False)
+            dt = min(timestamp - motion["time"], max_dt)
+            x, y = motion["position"] + motion["velocity"] * dt
+            hand["position"] = (int(x), int(y))
+    
+    def _preview_due(self, now):
+        """Whether a preview frame should be rendered at this time"""
+        interval = max(1.0 / self.preview_fps, self.preview_cost / self.PREVIEW_SHARE)
+        if now - self._last_preview < interval:
+            return False
+        self._last_preview = now
+        return True
+    
+    def _render_preview(self, frame):
+        """Downsampled frame with hand overlays, as binary PPM bytes"""
+        h, w = frame.shape[:2]
+        width = min(self.preview_width, w)
+        height = h * width // w
+        small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_NEAREST)
+        sx, sy = width / w, height / h
+        
+        # Overlays use the raw tracking state since they are drawn on the raw frame
+        for name, hand in (("L", self.left_hand), ("R", self.right_hand)):
+            if not hand["detected"]:
+                continue
+            if "bbox" in hand:
+                bx, by, bw, bh = hand["bbox"]
+                cv2.rectangle(small, (int(bx * sx), int(by * sy)),
+                              (int((bx + bw) * sx), int((by + bh) * sy)), (0, 200, 0), 1)
+            for tx, ty in hand.get("fingertips", []):
+                cv2.circle(small, (int(tx * sx), int(ty * sy)), 3, (0, 0, 255), -1)
             
-            # Get defects
-            if len(hull) > 3 and len(contour) > 3:
-                try:
-                    defects = cv2.convexityDefects(contour, hull)
-                    
-                    if defects is None:
-                        continue
-                    
-                    # Count fingers
-                    finger_count = 0
-                    
-                    for i in range(defects.shape[0]):
-                        s, e, f, d = defects[i, 0]
-                        start = tuple(contour[s][0])
-                        end = tuple(contour[e][0])
-                        far = tuple(contour[f][0])
-                        
-                        # Calculate angle between points
-                        a = np.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2)
-                        b = np.sqrt((far[0] - start[0])**2 + (far[1] - start[1])**2)
-                        c = np.sqrt((end[0] - far[0])**2 + (end[1] - far[1])**2)
-                        
-                        # Apply cosine rule
-                        angle = np.arccos((b**2 + c**2 - a**2) / (2*b*c))
-                        
-                        # If angle is less than 90 degrees, it's a finger gap
-                        if angle <= np.pi/2:
-                            finger_count += 1
-                    
-                    # Add one for the thumb
-                    finger_count += 1
-                    
-                    # Clamp to valid range (0-5)
-                    finger_count = max(0, min(5, finger_count))
-                    
-                    # Get hand center
-                    M = cv2.moments(contour)
-                    if M["m00"] != 0:
-                        cx = int(M["m10"] / M["m00"])
-                        cy = int(M["m01"] / M["m00"])
-                    else:
-                        cx, cy = 0, 0
-                    
-                    # Calculate confidence based on area
-                    confidence = min(1.0, area / self.max_area)
-                    
-                    # Store hand data
-                    hand_data = {
-                        "detected": True,
-                        "fingers": finger_count,
-                        "position": (cx, cy),
-                        "confidence": confidence * self.sensitivity
-                    }
-                    
-                    hands.append(hand_data)
-                    
-                except Exception as e:
-                    # Skip this contour if processing fails
-                    continue
+            x, y = int(hand["position"][0] * sx), int(hand["position"][1] * sy)
+            cv2.circle(small, (x, y), 5, (0, 255, 0), -1)
+            cv2.putText(small, f"{name} {hand['fingers']}", (x - 15, y - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
         
-        return hands
+        rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        return b"P6 %d %d 255\n" % (width, height) + rgb.tobytes()
+    
+    def set_preview(self, enabled, width=None, max_fps=None):
+        """Turn preview rendering on or off, optionally resizing or re-rating it"""
+        if width:
+            self.preview_width = width
+        if max_fps:
+            self.preview_fps = max_fps
+        self.preview_enabled = enabled
+    
+    def get_preview(self):
+        """Latest preview as (sequence, PPM bytes); bytes are None until one exists"""
+        return self._preview
+    
+    def _output_hands(self, frame_shape):
+        """Hands with keypoints corrected for lens distortion, if calibrated"""
+        undistorter = self.undistorter
+        if undistorter is None:
+            return {"left": self.left_hand, "right": self.right_hand}
+        
+        h, w = frame_shape[:2]
+        if undistorter.size != (w, h):
+            undistorter.build(w, h)
+        return {
+            "left": undistorter.undistort_hand(self.left_hand),
+            "right": undistorter.undistort_hand(self.right_hand)
+        }
+    
+    def _detect_hands(self, frame):
+        """Detect hands and count fingers with the configured backend"""
+        return self.detector.detect(frame, self.governor.level)
     
     def get_hand_data(self):
         """Get current hand tracking data"""
+        output = self.output_hands
         return {
-            "left": self.left_hand.copy(),
-            "right": self.right_hand.copy(),
+            "left": output["left"].copy(),
+            "right": output["right"].copy(),
             "enabled": self.enabled,
-            "fps": self.fps
+            "fps": self.fps,
+            "detector": self.detector.name,
+            "undistorted": self.undistorter is not None,
+            "preview": {
+                "enabled": self.preview_enabled,
+                "cost_ms": self.preview_cost * 1000.0,
+                "rendered": self.previews_rendered
+            },
+            "cameras": {
+                observer.camera_index: observer.fps for observer in self.observers
+            },
+            "quality": self.governor.stats(),
+            "flow": {
+                "enabled": self.optical_flow,
+                "interval": self.flow_interval,
+                "redetects": self.flow_redetects
+            }
         }
     
+    def get_history(self, seconds):
+        """Hand records from the last `seconds` as read-only views
+        
+        See HandHistory.get_history; track 0 is left and 1 is right.
+        """
+        return self.history.get_history(seconds)
+    
+    def export_history(self, path):
+        """Save the hand history ring buffer to a .npy file"""
+        return self.history.export(path)
+    
+    def get_joint_array(self):
+        """Read-only (2, 26) joint array and its sequence counter
+        
+        The view is updated in place; use copy_joint_array() for a
+        snapshot that is guaranteed not to be torn by a concurrent write.
+        """
+        return self.joints.sequence, self.joints.view
+    
+    def copy_joint_array(self, out=None):
+        """Consistent copy of the joint array, returns (sequence, array)"""
+        return self.joints.read(out)
+    
+    def subscribe_gestures(self, maxsize=64):
+        """Get a queue of gesture events, or None if gestures are unavailable"""
+        if self.gestures is None:
+            return None
+        return self.gestures.subscribe(maxsize)
+    
+    def unsubscribe_gestures(self, events):
+        """Stop delivering gesture events to a queue"""
+        if self.gestures is not None:
+            self.gestures.unsubscribe(events)
+    
     def calibrate(self, duration=5):
         """Calibrate hand tracking by sampling skin colors"""
         if not self.camera or not self.camera.isOpened():
@@ -376,8 +1723,81 @@ def get_tracker():
         _tracker = FingerTracker()
     return _tracker
 
+def load_replay(source, max_frames=300):
+    """Load a recording (video file or .npy frame stack) into memory"""
+    if str(source).endswith(".npy"):
+        frames = list(np.load(source)[:max_frames])
+    else:
+        frames = []
+        capture = cv2.VideoCapture(str(source))
+        while len(frames) < max_frames:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            frames.append(frame)
+        capture.release()
+    
+    # Mirror like the live loop does
+    return [cv2.flip(frame, 1) for frame in frames]
+
+def benchmark_replay(source, backends=None, max_frames=300):
+    """Replay a recording through each detector backend and report throughput"""
+    frames = load_replay(source, max_frames)
+    if not frames:
+        raise ValueError(f"No frames could be read from {source}")
+    
+    tracker = FingerTracker()
+    level = QUALITY_LEVELS[0]
+    results = {}
+    
+    for name in backends or DETECTOR_BACKENDS:
+        try:
+            detector = DETECTOR_BACKENDS[name](tracker)
+        except Exception as e:
+            results[name] = {"error": str(e)}
+            continue
+        
+        # Warm up caches and lazy allocations before timing
+        detector.detect(frames[0], level)
+        
+        hands = 0
+        start = time.perf_counter()
+        for frame in frames:
+            hands += len(detector.detect(frame, level))
+        elapsed = time.perf_counter() - start
+        detector.close()
+        
+        results[name] = {
+            "frames": len(frames),
+            "fps": len(frames) / elapsed,
+            "ms_per_frame": elapsed * 1000.0 / len(frames),
+            "hands_per_frame": hands / len(frames)
+        }
+    
+    return results
+
 # Test if run directly
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="HACHI finger tracking")
+    parser.add_argument("--benchmark", metavar="FILE",
+                        help="replay a recording (video or .npy) through the detector backends")
+    parser.add_argument("--backends", help="comma separated backends to benchmark (default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="maximum frames to replay")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        backends = args.backends.split(",") if args.backends else None
+        results = benchmark_replay(args.benchmark, backends, args.frames)
+        for name, result in results.items():
+            if "error" in result:
+                print(f"{name:>8}: unavailable ({result['error']})")
+            else:
+                print(f"{name:>8}: {result['fps']:7.1f} fps  {result['ms_per_frame']:6.2f} ms/frame  "
+                      f"{result['hands_per_frame']:.2f} hands/frame  ({result['frames']} frames)")
+        raise SystemExit(0)
+    
     print("Testing finger tracking...")
     tracker = get_tracker()
     
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+HACHI Frame Timing
+Compositor frame times tailed from the VR logs, with rolling percentiles and missed-vsync rates
+"""
+
+import json
+import math
+import os
+import re
+import select
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+# inotify wakeups are optional - falls back to polling the logs
+try:
+    from log_viewer import LogWatcher
+except ImportError:
+    LogWatcher = None
+
+LOG_DIR = Path.home() / ".local" / "share" / "vr-logs"
+STEAM_LOGS = Path.home() / ".local" / "share" / "Steam" / "logs"
+TIMING_LOGS = (LOG_DIR / "monado.log", LOG_DIR / "steamvr.log", STEAM_LOGS / "vrcompositor.txt")
+
+# Installed driver settings first, then the copy shipped next to this file
+SETTINGS_FILES = (
+    Path.home() / ".local" / "share" / "Steam" / "steamapps" / "common" / "SteamVR"
+    / "drivers" / "vive_cosmos" / "resources.vrsettings",
+    Path(__file__).resolve().parent / "resources.vrsettings",
+)
+DEFAULT_FREQUENCY = 90.0
+
+# About 45 s of frames at 90 Hz
+HISTORY = 4096
+WINDOW = 10.0
+
+# Timer jitter allowed before a frame counts as having missed vsync
+VSYNC_SLACK_MS = 0.2
+
+POLL_INTERVAL = 0.25
+PUBLISH_INTERVAL = 1.0
+
+# Upper bucket edges as multiples of the vsync interval
+HISTOGRAM_EDGES = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0, math.inf)
+
+# Runtimes word their timing output differently between versions; these
+# cover "frame_time=11.2ms", "frametime: 11.2 ms", "total_render_gpu_ms 9.8"
+# and "reprojected=1"/"dropped frames: 12". A count on a line without a
+# frame time is a running total from a summary line.
+FRAME_TIME = re.compile(r"(?:frame[ _-]?time|frame[ _-]?ms|total[ _-]?render[ _-]?gpu(?:[ _-]?ms)?)\D{0,12}?(\d+(?:\.\d+)?)", re.I)
+REPROJECTED = re.compile(r"reproject(?:ed|ions?)?(?:[ _-]?frames?)?\D{0,8}?(\d+)", re.I)
+DROPPED = re.compile(r"(?:dropped|missed)(?:[ _-]?(?:frames?|presents?))?\D{0,8}?(\d+)", re.I)
+KEYWORDS = ("frame", "render", "reproj", "dropped", "missed")
+
+def display_frequency(paths=SETTINGS_FILES):
+    """display_frequency from resources.vrsettings, or 90 Hz"""
+    for path in paths:
+        try:
+            settings = json.loads(Path(path).read_text())
+        except (OSError, ValueError):
+            continue
+        for section in settings.values():
+            if isinstance(section, dict) and "display_frequency" in section:
+                try:
+                    return float(section["display_frequency"])
+                except (TypeError, ValueError):
+                    pass
+    return DEFAULT_FREQUENCY
+
+def percentile(values, p):
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return None
+    return values[max(0, min(len(values) - 1, math.ceil(p / 100 * len(values)) - 1))]
+
+def parse_line(line):
+    """(frame ms or None, reprojected count or None, dropped count or None)"""
+    lowered = line.lower()
+    if not any(word in lowered for word in KEYWORDS):
+        return None, None, None
+    
+    values = []
+    for pattern in (FRAME_TIME, REPROJECTED, DROPPED):
+        match = pattern.search(line)
+        values.append(float(match.group(1)) if match else None)
+    frame_ms, reprojected, dropped = values
+    return (
+        frame_ms,
+        int(reprojected) if reprojected is not None else None,
+        int(dropped) if dropped is not None else None
+    )
+
+class TailedFile:
+    """Lines appended to a log since the last read, surviving rotation"""
+    
+    def __init__(self, path, from_start=False):
+        self.path = Path(path)
+        self.inode = None
+        self.offset = 0
+        self.partial = b""
+        self.from_start = from_start
+    
+    def read_lines(self, max_bytes=4 * 1024 * 1024):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return []
+        
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # New, rotated or truncated log; a live tail skips what was already there
+            skip = self.inode is None and not self.from_start
+            self.inode = stat.st_ino
+            self.offset = stat.st_size if skip else 0
+            self.partial = b""
+        if stat.st_size == self.offset:
+            return []
+        
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(max_bytes)
+        except OSError:
+            return []
+        self.offset += len(data)
+        
+        data = self.partial + data
+        lines = data.split(b"\n")
+        self.partial = lines.pop()
+        return [line.decode("utf-8", errors="replace") for line in lines]
+
+class FrameTimingCollector:
+    """Ring buffer of compositor frame times fed by tailing the VR logs
+    
+    Subscribers get stats() about once a second on the collector thread
+    while frames are arriving, and once more when they stop.
+    """
+    
+    def __init__(self, paths=TIMING_LOGS, frequency=None, history=HISTORY, from_start=False):
+        self.paths = [Path(p) for p in paths]
+        self.frequency = frequency or display_frequency()
+        self.vsync_ms = 1000.0 / self.frequency
+        self.files = [TailedFile(p, from_start) for p in self.paths]
+        
+        # (monotonic time, frame ms, reprojected, dropped) per frame, and
+        # (monotonic time, reprojected, dropped) for summary counters
+        self.frames = deque(maxlen=history)
+        self.counts = deque(maxlen=history)
+        self.totals = {}
+        self.lines_read = 0
+        self.cpu_time = 0.0
+        
+        self.running = False
+        self.thread = None
+        self._lock = threading.Lock()
+        self._subscribers = []
+    
+    def subscribe(self, callback):
+        """Call callback(stats) as new frames come in"""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+    
+    def poll(self):
+        """Read whatever the logs gained since the last poll; returns frames added"""
+        cost = time.thread_time()
+        now = time.monotonic()
+        frames = []
+        counts = []
+        for tailed in self.files:
+            for line in tailed.read_lines():
+                self.lines_read += 1
+                frame_ms, reprojected, dropped = parse_line(line)
+                if frame_ms is not None:
+                    frames.append((now, frame_ms, bool(reprojected), bool(dropped)))
+                elif reprojected is not None or dropped is not None:
+                    counts.append((
+                        now,
+                        self._delta(tailed, "reprojected", reprojected),
+                        self._delta(tailed, "dropped", dropped)
+                    ))
+        
+        if frames or counts:
+            with self._lock:
+                self.frames.extend(frames)
+                self.counts.extend(counts)
+        self.cpu_time += time.thread_time() - cost
+        return len(frames)
+    
+    def _delta(self, tailed, name, total):
+        # Summary counters are running totals; a smaller one means a restart.
+        # A live tail joins mid-session, so its first total is only a baseline.
+        if total is None:
+            return 0
+        key = (tailed.path, name)
+        previous = self.totals.get(key, 0 if tailed.from_start else None)
+        self.totals[key] = total
+        if previous is None:
+            return 0
+        return total if total < previous else total - previous
+    
+    def stats(self, window=WINDOW):
+        """Percentiles and rates over the last window seconds (None = everything buffered)"""
+        with self._lock:
+            frames = list(self.frames)
+            counts = list(self.counts)
+        if window is not None:
+            since = time.monotonic() - window
+            frames = [f for f in frames if f[0] >= since]
+            counts = [c for c in counts if c[0] >= since]
+        
+        times = sorted(f[1] for f in frames)
+        total = len(times)
+        missed = sum(1 for f in frames if f[1] > self.vsync_ms + VSYNC_SLACK_MS or f[3])
+        reprojected = sum(f[2] for f in frames) + sum(c[1] for c in counts)
+        dropped = sum(f[3] for f in frames) + sum(c[2] for c in counts)
+        return {
+            "frames": total,
+            "frequency": self.frequency,
+            "vsync_ms": self.vsync_ms,
+            "p50": percentile(times, 50),
+            "p95": percentile(times, 95),
+            "p99": percentile(times, 99),
+            "max": times[-1] if times else None,
+            "missed": missed,
+            "missed_rate": missed / total if total else 0.0,
+            "reprojected": reprojected,
+            "reprojected_rate": reprojected / total if total else 0.0,
+            "dropped": dropped
+        }
+    
+    def histogram(self, window=WINDOW):
+        """Frame counts per HISTOGRAM_EDGES bucket"""
+        with self._lock:
+            frames = list(self.frames)
+        since = time.monotonic() - window if window is not None else None
+        buckets = [0] * len(HISTOGRAM_EDGES)
+        for stamp, frame_ms, _, _ in frames:
+            if since is not None and stamp < since:
+                continue
+            ratio = frame_ms / self.vsync_ms
+            buckets[next(i for i, edge in enumerate(HISTOGRAM_EDGES) if ratio <= edge)] += 1
+        return buckets
+    
+    @property
+    def overhead(self):
+        """Fraction of one core spent reading and parsing logs"""
+        elapsed = time.monotonic() - self.started if self.running else 0
+        return self.cpu_time / elapsed if elapsed > 0 else 0.0
+    
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.started = time.monotonic()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+    
+    def _run(self):
+        watcher = LogWatcher(self.paths) if LogWatcher else None
+        fd = watcher.fileno() if watcher else None
+        last_publish = 0.0
+        active = False
+        published_frames = 0
+        
+        # Start at the end of each log so old sessions don't count
+        self.poll()
+        while self.running:
+            if fd is not None:
+                ready, _, _ = select.select([fd], [], [], PUBLISH_INTERVAL)
+                if ready:
+                    watcher.changes()
+            else:
+                time.sleep(POLL_INTERVAL)
+            
+            if self.poll():
+                active = True
+            if time.monotonic() - last_publish >= PUBLISH_INTERVAL:
+                stats = self.stats()
+                # Keep publishing while frames remain in the window, then once at zero
+                if active or stats["frames"] or published_frames:
+                    self._publish(stats)
+                    last_publish = time.monotonic()
+                    published_frames = stats["frames"]
+                active = False
+            
+            # Batch up frames instead of waking for every log write
+            if fd is not None:
+                time.sleep(POLL_INTERVAL)
+        
+        if watcher:
+            watcher.close()
+    
+    def _publish(self, stats):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(stats)
+            except Exception as e:
+                print(f"Frame timing subscriber failed: {e}")
+
+def format_stats(stats):
+    """One-line summary for status bars and the dashboard"""
+    if not stats["frames"]:
+        return f"No compositor frames yet ({stats['frequency']:.0f} Hz target)"
+    return (
+        f"p50 {stats['p50']:.1f} ms  p95 {stats['p95']:.1f} ms  p99 {stats['p99']:.1f} ms  •  "
+        f"missed vsync {stats['missed_rate'] * 100:.1f}%  •  "
+        f"reprojected {stats['reprojected_rate'] * 100:.1f}%  •  dropped {stats['dropped']}"
+    )
+
+def format_histogram(buckets, vsync_ms, width=30):
+    """Text bars per bucket, labelled in milliseconds"""
+    lines = []
+    largest = max(buckets) or 1
+    total = sum(buckets) or 1
+    lower = 0.0
+    for edge, count in zip(HISTOGRAM_EDGES, buckets):
+        if edge == math.inf:
+            label = f"> {lower * vsync_ms:5.1f} ms"
+        else:
+            label = f"≤ {edge * vsync_ms:5.1f} ms"
+        bar = "█" * round(count / largest * width)
+        lines.append(f"{label}  {bar:<{width}} {count / total * 100:5.1f}%")
+        lower = edge
+    return "\n".join(lines)
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Compositor frame-timing statistics")
+    parser.add_argument("logs", nargs="*", help="logs to analyse whole (default: follow the VR logs)")
+    parser.add_argument("--window", type=float, default=WINDOW, help="seconds of frames in the live statistics")
+    parser.add_argument("--frequency", type=float, help="display refresh rate (default: resources.vrsettings)")
+    args = parser.parse_args()
+    
+    if args.logs:
+        collector = FrameTimingCollector(args.logs, args.frequency, history=None, from_start=True)
+        offsets = None
+        while offsets != [t.offset for t in collector.files]:
+            offsets = [t.offset for t in collector.files]
+            collector.poll()
+        stats = collector.stats(window=None)
+        print(f"{stats['frames']} frames at {stats['frequency']:.0f} Hz ({stats['vsync_ms']:.2f} ms vsync)")
+        print(format_stats(stats))
+        if stats["frames"]:
+            print()
+            print(format_histogram(collector.histogram(window=None), stats["vsync_ms"]))
+        return
+    
+    collector = FrameTimingCollector(frequency=args.frequency)
+    collector.subscribe(lambda stats: print(format_stats(collector.stats(args.window)), flush=True))
+    print(f"Following {', '.join(str(p) for p in collector.paths)}")
+    collector.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        collector.stop()
+
+if __name__ == "__main__":
+    main()
@@ -13,47 +13,222 @@ from pathlib import Path
 import json
 import os
 import sys
+import importlib
+import importlib.util
 
-# Import finger tracking
+# Time to first paint is measured from here
+STARTUP_TIME = time.perf_counter()
+
+# --profile-startup prints where the startup time goes
+PROFILE_STARTUP = '--profile-startup' in sys.argv
+startup_timings = []
+startup_profile_printed = False
+
+def record_timing(label, started):
+    """Note how long a startup step took (printed with --profile-startup)"""
+    now = time.perf_counter()
+    startup_timings.append((label, (now - started) * 1000, (now - STARTUP_TIME) * 1000))
+    if PROFILE_STARTUP and startup_profile_printed:
+        # Lazy imports and tabs after the first paint print as they happen
+        print_timing(*startup_timings[-1])
+
+def print_timing(label, step_ms, total_ms):
+    print(f"  {label:<36} {step_ms:8.1f} {total_ms:8.1f}")
+
+def print_startup_profile():
+    global startup_profile_printed
+    print(f"  {'startup (ms)':<36} {'step':>8} {'total':>8}")
+    for timing in startup_timings:
+        print_timing(*timing)
+    startup_profile_printed = True
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            started = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            record_timing(f"import {self._name}", started)
+        return getattr(self._module, attr)
+
+# Finger tracking pulls in OpenCV and NumPy, which dominates startup;
+# only check that it is installed and import it when first used
+sys.path.insert(0, str(Path.home() / ".local" / "share" / "hachi"))
+finger_tracking = LazyModule('finger_tracking')
+FINGER_TRACKING_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None for name in ('finger_tracking', 'cv2', 'numpy')
+)
+if not FINGER_TRACKING_AVAILABLE:
+    print("Warning: Finger tracking module not found")
+
+# USB hotplug events are optional - falls back to polling lsusb
 try:
-    sys.path.insert(0, str(Path.home() / ".local" / "share" / "hachi"))
-    from finger_tracking import get_tracker
-    FINGER_TRACKING_AVAILABLE = True
+    from hotplug import UsbHotplugMonitor
 except ImportError:
-    FINGER_TRACKING_AVAILABLE = False
-    print("Warning: Finger tracking module not found")
+    UsbHotplugMonitor = None
+
+# /proc process watching is optional - falls back to pgrep
+try:
+    from process_watcher import ProcessWatcher
+except ImportError:
+    ProcessWatcher = None
+
+# Shared status probes are optional - falls back to a local monitor thread
+try:
+    from hachi_status import get_status_service, usb_connected, process_running
+except ImportError:
+    get_status_service = None
+
+# Adaptive probe intervals are optional - falls back to checking every 2 s
+try:
+    from probe_scheduler import ProbeScheduler, watch_window
+except ImportError:
+    ProbeScheduler = None
+
+# Queued widget updates are optional - falls back to after() from worker threads
+try:
+    from ui_dispatch import UiDispatcher
+except ImportError:
+    UiDispatcher = None
+
+# The hachid daemon is optional - falls back to running probes and tracker in this process
+try:
+    from hachid import connect_status, remote_tracker
+except ImportError:
+    connect_status = None
+
+# PCI sysfs GPU detection is optional - falls back to lspci
+try:
+    from hardware_profile import cached_profile, load_profile_async, retheme
+except ImportError:
+    load_profile_async = None
+
+# Log viewer is optional - falls back to reading the whole log into a text box
+try:
+    from log_viewer import LogViewer, LOG_DIR, VR_LOGS
+except ImportError:
+    LogViewer = None
+
+record_timing('import support modules', STARTUP_TIME)
 
 class HachiControl(tk.Tk):
     def __init__(self):
+        started = time.perf_counter()
         super().__init__()
         
         self.title("HACHI VR Control Center")
         self.geometry("900x700")
         self.configure(bg='#0a0a0a')
+        record_timing('create window', started)
         
         # Detect GPU for theme
+        started = time.perf_counter()
+        self.gpu_detection = None
         self.gpu_vendor = self.detect_gpu()
         self.accent_color = self.get_accent_color()
+        record_timing('GPU detection', started)
         
-        # Initialize finger tracker
-        self.finger_tracker = None
-        if FINGER_TRACKING_AVAILABLE:
-            self.finger_tracker = get_tracker()
+        # Worker threads hand their results to the Tk thread through this
+        self.ui = UiDispatcher(self) if UiDispatcher else None
+        
+        # The finger tracker is created when first used (see finger_tracker)
+        self._finger_tracker = None
+        self._finger_tracker_failed = False
+        self._finger_tracker_loading = False
+        self._tracking_display_started = False
         
         # VR state
         self.headset_connected = False
         self.driver_installed = False
         self.steamvr_running = False
         
+        # The dashboard is built before monitoring starts and reads these
+        self.usb_monitor = None
+        self.process_watcher = None
+        self.daemon = None
+        
         # Setup UI
         self.setup_ui()
         
-        # Start monitoring
-        self.monitor_thread = threading.Thread(target=self.monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        # One status service runs the probes for every window in the process
+        started = time.perf_counter()
+        self.status_service = None
+        self.probe_scheduler = None
+        
+        # With hachid running, probes, tracker and VR processes live there and
+        # every window shares them; this window only draws what it pushes.
+        # Without one this window runs its own probes; no daemon is started
+        # that it would not use
+        self.daemon = None
+        if connect_status and get_status_service:
+            self.daemon, self.status_service = connect_status()
+        if self.status_service is None and get_status_service:
+            self.status_service = get_status_service()
+            if FINGER_TRACKING_AVAILABLE:
+                self.status_service.set_probe('tracker', self.tracker_status)
+        
+        if self.status_service:
+            self.usb_monitor = self.status_service.usb_monitor
+            self.process_watcher = self.status_service.process_watcher
+            self.status_service.subscribe(self.on_status)
+            if ProbeScheduler:
+                watch_window(self, self.status_service)
+            self.on_status(self.status_service.snapshot)
+        else:
+            # Headset plug/unplug updates the indicators right away
+            self.usb_monitor = None
+            if UsbHotplugMonitor:
+                self.usb_monitor = UsbHotplugMonitor()
+                self.usb_monitor.subscribe(self.on_usb_event)
+                self.usb_monitor.start()
+            
+            # SteamVR start/exit updates the indicators without forking pgrep
+            self.process_watcher = None
+            if ProcessWatcher:
+                self.process_watcher = ProcessWatcher()
+                self.process_watcher.subscribe(self.on_process_event)
+                self.process_watcher.start()
+            
+            # Checks back off while nothing changes and stop while iconified
+            if ProbeScheduler:
+                self.probe_scheduler = ProbeScheduler()
+                self.probe_scheduler.add(
+                    'status', self.probe_status, 2.0,
+                    30.0 if self.usb_monitor and self.process_watcher else 10.0
+                )
+                self.probe_scheduler.start()
+                watch_window(self, self.probe_scheduler)
+            else:
+                self.monitor_thread = threading.Thread(target=self.monitor_loop, daemon=True)
+                self.monitor_thread.start()
+        
+        # Show watcher data in place of the lsusb listing from before they started
+        if self.usb_monitor or self.process_watcher:
+            self.after_idle(self.update_system_info)
+        
+        record_timing('start status monitoring', started)
         
+        # Finish GPU detection in the background and note time to first paint
+        if self.gpu_detection:
+            self.after(10, self.finish_gpu_detection)
+        self._paint_binding = self.bind('<Expose>', self.report_first_paint, '+')
+    
     def detect_gpu(self):
         """Detect GPU vendor"""
+        if load_profile_async:
+            # Cached for this boot it's instant; otherwise paint with the
+            # default theme and switch accents when the PCI scan is done
+            profile = cached_profile()
+            if profile:
+                return profile['gpu_vendor']
+            self.gpu_detection = load_profile_async()
+            return 'unknown'
+        
         try:
             result = subprocess.run(['lspci'], capture_output=True, text=True)
             output = result.stdout.lower()
@@ -69,6 +244,69 @@ class HachiControl(tk.Tk):
         
         return 'unknown'
     
+    def finish_gpu_detection(self):
+        """Move the already drawn window to the detected GPU's accent"""
+        if not self.gpu_detection.done():
+            self.after(10, self.finish_gpu_detection)
+            return
+        try:
+            vendor = self.gpu_detection.result()['gpu_vendor']
+        except Exception:
+            vendor = 'unknown'
+        self.gpu_detection = None
+        if vendor == self.gpu_vendor:
+            return
+        
+        old_accent, old_badge = self.accent_color, f"  {self.gpu_vendor.upper()}"
+        self.gpu_vendor = vendor
+        self.accent_color = self.get_accent_color()
+        ttk.Style().map('TNotebook.Tab', foreground=[('selected', self.accent_color)])
+        retheme(self, {old_accent: self.accent_color}, {old_badge: f"  {vendor.upper()}"})
+    
+    def report_first_paint(self, event=None):
+        self.unbind('<Expose>', self._paint_binding)
+        self.first_paint_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        if os.environ.get('HACHI_STARTUP_TIMING'):
+            print(f"Time to first paint: {self.first_paint_ms:.0f} ms")
+        if PROFILE_STARTUP:
+            record_timing('first paint', STARTUP_TIME)
+            print_startup_profile()
+    
+    @property
+    def finger_tracker(self):
+        """The shared FingerTracker, created (and OpenCV imported) on first use
+        
+        hachid's tracker can take seconds to answer, so it is looked up on a
+        worker thread; this is None until it is ready (see tracker_ready).
+        """
+        if self._finger_tracker is None and FINGER_TRACKING_AVAILABLE and not self._finger_tracker_failed:
+            if self.daemon:
+                if not self._finger_tracker_loading:
+                    self._finger_tracker_loading = True
+                    threading.Thread(target=self.load_remote_tracker, daemon=True).start()
+                return None
+            try:
+                self._finger_tracker = finger_tracking.get_tracker()
+            except ImportError as e:
+                self._finger_tracker_failed = True
+                print(f"Warning: Finger tracking unavailable: {e}")
+        return self._finger_tracker
+    
+    def load_remote_tracker(self):
+        """Look up hachid's tracker (worker thread)"""
+        tracker = remote_tracker(self.daemon)
+        self._finger_tracker_failed = tracker is None
+        self._finger_tracker = tracker
+        if tracker:
+            self.run_on_tk(self.tracker_ready)
+    
+    def run_on_tk(self, func, *args):
+        """Run func(*args) on the Tk thread; may be called from any thread"""
+        if self.ui:
+            self.ui.call(func, *args)
+        else:
+            self.after(0, func, *args)
+    
     def get_accent_color(self):
         """Get accent color based on GPU"""
         colors = {
@@ -81,6 +319,7 @@ class HachiControl(tk.Tk):
     
     def setup_ui(self):
         """Create the UI"""
+        started = time.perf_counter()
         
         # Header
         header = tk.Frame(self, bg='#1a1a1a', height=80)
@@ -129,12 +368,36 @@ class HachiControl(tk.Tk):
         style.configure('TNotebook.Tab', background='#1a1a1a', foreground='#888888', padding=[20, 10])
         style.map('TNotebook.Tab', background=[('selected', '#2a2a2a')], foreground=[('selected', self.accent_color)])
         
-        # Create tabs
+        record_timing('build header', started)
+        
+        # Create tabs; only the dashboard is built now, the rest on first view
+        started = time.perf_counter()
         self.create_dashboard_tab()
-        self.create_finger_tracking_tab()
-        self.create_settings_tab()
-        self.create_developer_tab()
+        record_timing('build tab Dashboard', started)
         
+        self.lazy_tabs = {}
+        self.tracking_tab = self.add_lazy_tab('Finger Tracking', self.create_finger_tracking_tab)
+        self.add_lazy_tab('Settings', self.create_settings_tab)
+        self.add_lazy_tab('Developer', self.create_developer_tab)
+        self.notebook.bind('<<NotebookTabChanged>>', self.build_selected_tab, add='+')
+    
+    def add_lazy_tab(self, text, builder):
+        """Add an empty tab whose widgets builder(frame) creates on first view"""
+        frame = tk.Frame(self.notebook, bg='#0a0a0a')
+        self.notebook.add(frame, text=text)
+        self.lazy_tabs[str(frame)] = (text, builder)
+        return frame
+    
+    def build_selected_tab(self, event=None):
+        """Build the selected tab if this is the first time it is shown"""
+        selected = self.notebook.select()
+        entry = self.lazy_tabs.pop(selected, None)
+        if entry:
+            text, builder = entry
+            started = time.perf_counter()
+            builder(self.nametowidget(selected))
+            record_timing(f'build tab {text}', started)
+    
     def create_dashboard_tab(self):
         """Create main dashboard tab"""
         dashboard = tk.Frame(self.notebook, bg='#0a0a0a')
@@ -225,11 +488,8 @@ class HachiControl(tk.Tk):
         
         self.update_system_info()
         
-    def create_finger_tracking_tab(self):
+    def create_finger_tracking_tab(self, tracking):
         """Create finger tracking tab"""
-        tracking = tk.Frame(self.notebook, bg='#0a0a0a')
-        self.notebook.add(tracking, text='Finger Tracking')
-        
         if not FINGER_TRACKING_AVAILABLE:
             tk.Label(
                 tracking,
@@ -278,16 +538,17 @@ class HachiControl(tk.Tk):
             height=2
         ).grid(row=0, column=1, padx=10, pady=10)
         
-        tk.Button(
+        self.preview_btn = tk.Button(
             button_frame,
-            text="Test Detection",
+            text="Show Preview",
             font=('Arial', 12),
             bg='#2a2a2a',
             fg='#cccccc',
             command=self.test_tracking,
             width=15,
             height=2
-        ).grid(row=0, column=2, padx=10, pady=10)
+        )
+        self.preview_btn.grid(row=0, column=2, padx=10, pady=10)
         
         # Status section
         status_frame = tk.LabelFrame(
@@ -375,14 +636,56 @@ class HachiControl(tk.Tk):
         )
         self.fps_label.pack(pady=10)
         
-        # Start update loop
-        self.update_tracking_display()
+        self.gesture_label = tk.Label(
+            status_frame,
+            text="Gesture: -",
+            font=('Arial', 12),
+            bg='#1a1a1a',
+            fg='#888888'
+        )
+        self.gesture_label.pack()
+        
+        # Camera preview, filled from the tracker's PPM frames
+        self.preview_active = False
+        self.preview_sequence = 0
+        self.preview_photo = tk.PhotoImage(width=320, height=240)
+        self.preview_label = tk.Label(status_frame, image=self.preview_photo, bg='#0a0a0a')
+        self.preview_stats_label = tk.Label(
+            status_frame,
+            text="",
+            font=('Arial', 9),
+            bg='#1a1a1a',
+            fg='#666666'
+        )
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.update_preview_state(), add='+')
+        
+        # Hooked up to the tracker now, or once it has loaded (tracker_ready)
+        self.gesture_events = None
+        self.preview_wanted = False
+        self.preview_fetched = 0
+        if self.finger_tracker:
+            self.start_tracking_display()
+    
+    def tracker_ready(self):
+        """hachid's tracker has been looked up (Tk thread)"""
+        if hasattr(self, 'preview_label'):
+            self.start_tracking_display()
+    
+    def start_tracking_display(self):
+        """Follow the tracker in the tracking tab"""
+        if self._tracking_display_started:
+            return
+        self._tracking_display_started = True
         
-    def create_settings_tab(self):
-        """Create settings tab"""
-        settings = tk.Frame(self.notebook, bg='#0a0a0a')
-        self.notebook.add(settings, text='Settings')
+        # Hand labels follow gesture events; only the FPS counter needs a timer
+        self.gesture_events = self._finger_tracker.subscribe_gestures()
+        if self.gesture_events is not None:
+            threading.Thread(target=self.gesture_listener, daemon=True).start()
+            self.update_fps_display()
+        threading.Thread(target=self.poll_tracker, daemon=True).start()
         
+    def create_settings_tab(self, settings):
+        """Create settings tab"""
         # Driver settings
         driver_frame = tk.LabelFrame(
             settings,
@@ -496,11 +799,8 @@ Detected GPU: {}
             justify=tk.LEFT
         ).pack(anchor=tk.W)
         
-    def create_developer_tab(self):
+    def create_developer_tab(self, developer):
         """Create developer tools tab"""
-        developer = tk.Frame(self.notebook, bg='#0a0a0a')
-        self.notebook.add(developer, text='Developer')
-        
         # Header
         tk.Label(
             developer,
@@ -603,6 +903,19 @@ Detected GPU: {}
                 
                 files_to_copy = [
                     ("finger_tracking.py", hachi_dir / "finger_tracking.py"),
+                    ("hand_gestures.py", hachi_dir / "hand_gestures.py"),
+                    ("hotplug.py", hachi_dir / "hotplug.py"),
+                    ("process_watcher.py", hachi_dir / "process_watcher.py"),
+                    ("hachi_status.py", hachi_dir / "hachi_status.py"),
+                    ("display_probe.py", hachi_dir / "display_probe.py"),
+                    ("hardware_profile.py", hachi_dir / "hardware_profile.py"),
+                    ("log_viewer.py", hachi_dir / "log_viewer.py"),
+                    ("log_index.py", hachi_dir / "log_index.py"),
+                    ("perf_monitor.py", hachi_dir / "perf_monitor.py"),
+                    ("frame_timing.py", hachi_dir / "frame_timing.py"),
+                    ("probe_scheduler.py", hachi_dir / "probe_scheduler.py"),
+                    ("ui_dispatch.py", hachi_dir / "ui_dispatch.py"),
+                    ("hachid.py", hachi_dir / "hachid.py"),
                     ("hachi_control.py", Path.home() / ".local/bin/hachi"),
                 ]
                 
@@ -741,6 +1054,18 @@ echo "Run: hachi"
                 log("")
                 log("The package includes:")
                 log("  ✓ finger_tracking.py")
+                log("  ✓ hand_gestures.py")
+                log("  ✓ hotplug.py")
+                log("  ✓ process_watcher.py")
+                log("  ✓ hachi_status.py")
+                log("  ✓ display_probe.py")
+                log("  ✓ hardware_profile.py")
+                log("  ✓ log_viewer.py")
+                log("  ✓ log_index.py")
+                log("  ✓ perf_monitor.py")
+                log("  ✓ frame_timing.py")
+                log("  ✓ probe_scheduler.py")
+                log("  ✓ hachid.py")
                 log("  ✓ hachi_control.py")
                 log("  ✓ VR driver files")
                 log("  ✓ C++ source files")
@@ -813,26 +1138,54 @@ echo "Run: hachi"
     def monitor_loop(self):
         """Monitor VR system status"""
         while True:
-            try:
-                # Check headset connection
-                self.headset_connected = self.check_headset_connected()
-                
-                # Check driver
-                self.driver_installed = self.check_driver_installed()
-                
-                # Check SteamVR
-                self.steamvr_running = self.check_steamvr_running()
-                
-                # Update UI
-                self.after(0, self.update_status_indicators)
-                
-            except Exception as e:
-                print(f"Monitor error: {e}")
-            
+            self.probe_status()
             time.sleep(2)
     
+    def probe_status(self):
+        """Check the headset, driver and SteamVR once; returns what was found"""
+        try:
+            # Check headset connection
+            self.headset_connected = self.check_headset_connected()
+            
+            # Check driver
+            self.driver_installed = self.check_driver_installed()
+            
+            # Check SteamVR
+            self.steamvr_running = self.check_steamvr_running()
+            
+            # Update UI
+            self.after(0, self.update_status_indicators)
+        
+        except Exception as e:
+            print(f"Monitor error: {e}")
+        return (self.headset_connected, self.driver_installed, self.steamvr_running)
+    
+    def on_status(self, snapshot):
+        """New status snapshot (called on the status service thread)"""
+        self.headset_connected = usb_connected(snapshot, 0x0bb4, 0x0abb) or usb_connected(snapshot, 0x28de)
+        self.steamvr_running = process_running(snapshot, 'vrserver')
+        self.driver_installed = self.check_driver_installed()
+        self.after(0, self.update_status_indicators)
+    
+    def tracker_status(self):
+        """Tracker section of the status snapshot"""
+        if self._finger_tracker is None:
+            # Not opened yet; don't import OpenCV just to report that
+            return {"enabled": False, "loaded": False}
+        data = self._finger_tracker.get_hand_data()
+        return {
+            "enabled": data["enabled"],
+            "fps": data["fps"],
+            "detector": data["detector"],
+            "left": data["left"].get("detected", False),
+            "right": data["right"].get("detected", False)
+        }
+    
     def check_headset_connected(self):
         """Check if VR headset is connected"""
+        if self.usb_monitor:
+            return self.usb_monitor.is_connected(0x0bb4, 0x0abb) or self.usb_monitor.is_connected(0x28de)
+        
         try:
             result = subprocess.run(['lsusb'], capture_output=True, text=True)
             # HTC Vive Cosmos vendor:product IDs
@@ -840,6 +1193,11 @@ echo "Run: hachi"
         except:
             return False
     
+    def on_usb_event(self, event):
+        """Headset plugged or unplugged (called on the hotplug thread)"""
+        self.headset_connected = self.check_headset_connected()
+        self.after(0, self.update_status_indicators)
+    
     def check_driver_installed(self):
         """Check if driver is installed"""
         driver_path = Path.home() / ".local/share/Steam/steamapps/common/SteamVR/drivers/vive_cosmos"
@@ -847,12 +1205,21 @@ echo "Run: hachi"
     
     def check_steamvr_running(self):
         """Check if SteamVR is running"""
+        if self.process_watcher:
+            return self.process_watcher.is_running('vrserver')
+        
         try:
             result = subprocess.run(['pgrep', '-f', 'vrserver'], capture_output=True)
             return result.returncode == 0
         except:
             return False
     
+    def on_process_event(self, event):
+        """VR process started or exited (called on the watcher thread)"""
+        if event['name'] == 'vrserver':
+            self.steamvr_running = self.check_steamvr_running()
+            self.after(0, self.update_status_indicators)
+    
     def update_status_indicators(self):
         """Update all status indicators"""
         self.update_status_indicator(self.headset_status, self.headset_connected)
@@ -873,14 +1240,28 @@ echo "Run: hachi"
         else:
             info.append(f"\nFinger Tracking: Not Available")
         
+        if self.process_watcher:
+            info.append(f"\n=== VR PROCESSES ===")
+            running = [(name, proc) for name, processes in self.process_watcher.stats().items()
+                       for proc in processes]
+            for name, proc in running:
+                info.append(f"{name} ({proc['pid']}): {proc['cpu_percent']:.1f}% CPU, "
+                            f"{proc['rss_mb']:.0f} MB")
+            if not running:
+                info.append("None running")
+        
         info.append(f"\n=== USB DEVICES ===")
-        try:
-            result = subprocess.run(['lsusb'], capture_output=True, text=True)
-            for line in result.stdout.split('\n'):
-                if any(x in line.lower() for x in ['htc', 'vive', 'valve']):
-                    info.append(line)
-        except:
-            info.append("Could not read USB devices")
+        if self.usb_monitor:
+            for name, vendor, product in self.usb_monitor.connected_devices():
+                info.append(f"{vendor:04x}:{product:04x} {name}")
+        else:
+            try:
+                result = subprocess.run(['lsusb'], capture_output=True, text=True)
+                for line in result.stdout.split('\n'):
+                    if any(x in line.lower() for x in ['htc', 'vive', 'valve']):
+                        info.append(line)
+            except:
+                info.append("Could not read USB devices")
         
         self.info_text.delete('1.0', tk.END)
         self.info_text.insert('1.0', '\n'.join(info))
@@ -888,7 +1269,11 @@ echo "Run: hachi"
     def launch_steamvr(self):
         """Launch SteamVR"""
         try:
-            subprocess.Popen(['steam', 'steam://rungameid/250820'])
+            if self.daemon:
+                # Started by the daemon, so it outlives this window
+                self.daemon.call('session.start', name='steamvr')
+            else:
+                subprocess.Popen(['steam', 'steam://rungameid/250820'])
             messagebox.showinfo("SteamVR", "Launching SteamVR...")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to launch SteamVR:\n{e}")
@@ -911,6 +1296,17 @@ echo "Run: hachi"
         log_window.geometry("800x600")
         log_window.configure(bg='#0a0a0a')
         
+        log_path = Path.home() / ".local/share/hachi/driver.log"
+        if LogViewer:
+            # Memory-mapped and drawn a screenful at a time, so big logs open
+            # instantly; the VR session logs are one click away
+            LogViewer(
+                log_window,
+                [log_path] + [LOG_DIR / name for name in VR_LOGS],
+                empty_text="No logs found yet.\nLogs will appear here after running SteamVR."
+            )
+            return
+        
         text = scrolledtext.ScrolledText(
             log_window,
             bg='#1a1a1a',
@@ -921,7 +1317,6 @@ echo "Run: hachi"
         text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Try to read log file
-        log_path = Path.home() / ".local/share/hachi/driver.log"
         if log_path.exists():
             text.insert('1.0', log_path.read_text())
         else:
@@ -976,32 +1371,95 @@ echo "Run: hachi"
             messagebox.showerror("Error", "Calibration failed")
     
     def test_tracking(self):
-        """Test finger tracking with visualization"""
+        """Show or hide the live detection preview in the tracking tab"""
         if not self.finger_tracker:
             return
         
+        if self.preview_active:
+            self.preview_active = False
+            self.preview_wanted = False
+            self.finger_tracker.set_preview(False)
+            self.preview_label.pack_forget()
+            self.preview_stats_label.pack_forget()
+            self.preview_btn.config(text="Show Preview")
+            return
+        
         if not self.finger_tracker.running:
             if not self.finger_tracker.start():
                 messagebox.showerror("Error", "Failed to start tracking")
                 return
         
-        messagebox.showinfo(
-            "Test Mode",
-            "Opening test window...\n\n"
-            "A window will show the camera feed with hand detection.\n"
-            "Press any key in that window to close it."
-        )
+        self.preview_active = True
+        self.preview_label.pack(pady=5)
+        self.preview_stats_label.pack()
+        self.preview_btn.config(text="Hide Preview")
+        self.update_preview_state()
+        self.update_preview()
+    
+    def preview_visible(self):
+        """Preview is only worth rendering while its tab is on screen"""
+        return (self.preview_active
+                and self.state() != 'iconic'
+                and self.notebook.select() == str(self.tracking_tab))
+    
+    def update_preview_state(self):
+        """Pause tracker-side preview rendering while nobody can see it"""
+        if hasattr(self, 'preview_label') and self.finger_tracker:
+            self.finger_tracker.set_preview(self.preview_visible())
+    
+    def update_preview(self):
+        """Have poll_tracker fetch preview frames while the preview is on screen"""
+        if not self.preview_active:
+            self.preview_wanted = False
+            return
         
-        # Run test in separate thread
-        def test_thread():
-            import cv2
-            while True:
-                data = self.finger_tracker.test_detection(show_window=True)
-                if cv2.waitKey(1) != -1:
-                    break
-            cv2.destroyAllWindows()
+        visible = self.preview_visible()
+        if visible != self.finger_tracker.preview_enabled:
+            self.finger_tracker.set_preview(visible)
+        self.preview_wanted = visible
         
-        threading.Thread(target=test_thread, daemon=True).start()
+        # Catches iconify/deiconify; tab switches call update_preview_state
+        self.after(500, self.update_preview)
+    
+    def poll_tracker(self):
+        """Fetch hand data and preview frames off the Tk thread
+        
+        With hachid each fetch is a round trip to the daemon, which must
+        never stall the window. Results go to the Tk thread through
+        run_on_tk. Hand data is only polled when gestures don't push it.
+        """
+        tracker = self._finger_tracker
+        next_hands = 0.0
+        while True:
+            try:
+                now = time.monotonic()
+                if self.gesture_events is None and now >= next_hands:
+                    next_hands = now + 0.1
+                    if tracker.running:
+                        self.run_on_tk(self.show_hand_data, tracker.get_hand_data())
+                
+                if self.preview_wanted:
+                    sequence, data = tracker.get_preview()
+                    if data is not None and sequence != self.preview_fetched:
+                        self.preview_fetched = sequence
+                        self.run_on_tk(self.show_preview, sequence, data, tracker.preview_cost)
+            except Exception as e:
+                print(f"Tracker poll error: {e}")
+            
+            # The tracker's preview rate while the preview shows, else the hand rate
+            time.sleep(1.0 / tracker.preview_fps if self.preview_wanted else 0.1)
+    
+    def show_preview(self, sequence, data, cost):
+        """Copy a fetched preview frame into the PhotoImage (Tk thread)"""
+        if not self.preview_active or sequence == self.preview_sequence:
+            return
+        start = time.perf_counter()
+        self.preview_photo.configure(data=data, format='PPM')
+        tk_ms = (time.perf_counter() - start) * 1000.0
+        self.preview_sequence = sequence
+        self.preview_stats_label.config(
+            text=f"Preview: render {cost * 1000.0:.1f} ms, display {tk_ms:.1f} ms"
+        )
     
     def save_tracking_settings(self):
         """Save tracking settings"""
@@ -1012,38 +1470,64 @@ echo "Run: hachi"
         self.finger_tracker.save_config()
         messagebox.showinfo("Settings", "Tracking settings saved!")
     
-    def update_tracking_display(self):
-        """Update finger tracking display"""
+    def gesture_listener(self):
+        """Forward gesture events to the Tk thread as they arrive"""
+        while True:
+            event = self.gesture_events.get()
+            self.after(0, self.on_gesture_event, event)
+    
+    def on_gesture_event(self, event):
+        """Update the hand display from a gesture event"""
+        if event['hand'] == 'left':
+            hand_label, fingers_label = self.left_hand_label, self.left_fingers_label
+        else:
+            hand_label, fingers_label = self.right_hand_label, self.right_fingers_label
+        
+        if event['type'] == 'hand_lost':
+            hand_label.config(text="Not Detected", fg='#666666')
+            fingers_label.config(text="0 fingers", fg='#888888')
+            return
+        
+        hand_label.config(text="✋", fg=self.accent_color)
+        fingers_label.config(text=f"{event['fingers']} fingers", fg='#cccccc')
+        
+        if event['type'] not in ('hand_found', 'count_changed'):
+            gesture = event['type'].replace('_', ' ')
+            self.gesture_label.config(text=f"Gesture: {event['hand']} {gesture}", fg=self.accent_color)
+    
+    def update_fps_display(self):
+        """Update the FPS counter once a second"""
         if self.finger_tracker and self.finger_tracker.running:
-            data = self.finger_tracker.get_hand_data()
-            
-            # Update left hand
-            if data['left']['detected']:
-                self.left_hand_label.config(text="✋", fg=self.accent_color)
-                self.left_fingers_label.config(
-                    text=f"{data['left']['fingers']} fingers",
-                    fg='#cccccc'
-                )
-            else:
-                self.left_hand_label.config(text="Not Detected", fg='#666666')
-                self.left_fingers_label.config(text="0 fingers", fg='#888888')
-            
-            # Update right hand
-            if data['right']['detected']:
-                self.right_hand_label.config(text="✋", fg=self.accent_color)
-                self.right_fingers_label.config(
-                    text=f"{data['right']['fingers']} fingers",
-                    fg='#cccccc'
-                )
-            else:
-                self.right_hand_label.config(text="Not Detected", fg='#666666')
-                self.right_fingers_label.config(text="0 fingers", fg='#888888')
-            
-            # Update FPS
-            self.fps_label.config(text=f"FPS: {data['fps']}")
+            self.fps_label.config(text=f"FPS: {self.finger_tracker.fps}")
+        
+        self.after(1000, self.update_fps_display)
+    
+    def show_hand_data(self, data):
+        """Update finger tracking display from polled hand data (Tk thread)"""
+        # Update left hand
+        if data['left']['detected']:
+            self.left_hand_label.config(text="✋", fg=self.accent_color)
+            self.left_fingers_label.config(
+                text=f"{data['left']['fingers']} fingers",
+                fg='#cccccc'
+            )
+        else:
+            self.left_hand_label.config(text="Not Detected", fg='#666666')
+            self.left_fingers_label.config(text="0 fingers", fg='#888888')
+        
+        # Update right hand
+        if data['right']['detected']:
+            self.right_hand_label.config(text="✋", fg=self.accent_color)
+            self.right_fingers_label.config(
+                text=f"{data['right']['fingers']} fingers",
+                fg='#cccccc'
+            )
+        else:
+            self.right_hand_label.config(text="Not Detected", fg='#666666')
+            self.right_fingers_label.config(text="0 fingers", fg='#888888')
         
-        # Schedule next update
-        self.after(100, self.update_tracking_display)
+        # Update FPS
+        self.fps_label.config(text=f"FPS: {data['fps']}")
 
 def main():
     app = HachiControl()
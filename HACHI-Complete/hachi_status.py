@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+HACHI Status Service
+Runs the USB, display, process, Bluetooth and tracker checks once for every GUI
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+# USB and process events are optional - the probes poll without them
+try:
+    from hotplug import UsbHotplugMonitor, VR_USB_DEVICES
+except ImportError:
+    UsbHotplugMonitor = None
+    VR_USB_DEVICES = {}
+
+try:
+    from process_watcher import ProcessWatcher, VR_PROCESSES
+except ImportError:
+    ProcessWatcher = None
+    VR_PROCESSES = ("monado-service", "vrserver", "vrcompositor", "cosmos_bridge")
+
+try:
+    from display_probe import DisplayProbe
+except ImportError:
+    DisplayProbe = None
+
+# Adaptive intervals are optional - probes keep their fixed schedule without them
+try:
+    from probe_scheduler import AdaptiveInterval, Visibility, child_cpu_time, INTERACTION_INTERVAL
+except ImportError:
+    AdaptiveInterval = None
+
+SECTIONS = ("usb", "display", "processes", "bluetooth", "tracker")
+
+# Seconds between runs of each probe
+DEFAULT_SCHEDULE = {
+    "usb": 2.0,
+    "display": 5.0,
+    "processes": 2.0,
+    "bluetooth": 10.0,
+    "tracker": 2.0,
+}
+
+# Longest a probe backs off to while its result stays the same. Probes
+# woken by hotplug, pidfd or DRM events only poll as a safety net; the
+# others are capped at POLLED_BACKOFF so a change is still seen soon.
+MAX_SCHEDULE = {
+    "usb": 60.0,
+    "display": 60.0,
+    "processes": 60.0,
+    "bluetooth": 120.0,
+    "tracker": 30.0,
+}
+POLLED_BACKOFF = 10.0
+
+# A probe that takes longer than this keeps its previous result
+DEFAULT_TIMEOUTS = {
+    "usb": 2.0,
+    "display": 2.0,
+    "processes": 2.0,
+    "bluetooth": 5.0,
+    "tracker": 1.0,
+}
+
+HEADSET_IDS = {(0x0bb4, 0x0313), (0x0bb4, 0x0abb)}
+
+# CPU seconds of the commands probes ran (lsusb, pgrep, bluetoothctl).
+# RUSAGE_CHILDREN covers every child of the process, so concurrent commands
+# share one measurement from the first starting to the last finishing.
+command_cpu_time = 0.0
+_commands_running = 0
+_commands_started = 0.0
+_command_lock = threading.Lock()
+
+def _command_started():
+    global _commands_running, _commands_started
+    with _command_lock:
+        if not _commands_running:
+            _commands_started = child_cpu_time()
+        _commands_running += 1
+
+def _command_finished():
+    global _commands_running, command_cpu_time
+    with _command_lock:
+        _commands_running -= 1
+        if not _commands_running:
+            command_cpu_time += child_cpu_time() - _commands_started
+
+DRM_CONNECTORS = Path("/sys/class/drm")
+TRACKING_CONFIG = Path.home() / ".config" / "cosmos-tracking" / "tracking_config.json"
+
+# One published state of everything; sections are plain dicts, changed
+# names the sections that differ from the previous snapshot
+StatusSnapshot = namedtuple(
+    "StatusSnapshot",
+    ("seq", "time", "usb", "display", "processes", "bluetooth", "tracker", "errors", "changed")
+)
+
+def usb_connected(snapshot, vendor, product=None):
+    """Whether a snapshot lists a USB device with these IDs (product None = any)"""
+    return any(
+        device["vendor"] == vendor and (product is None or device["product"] == product)
+        for device in snapshot.usb.get("devices", [])
+    )
+
+def process_running(snapshot, name):
+    return snapshot.processes.get("running", {}).get(name, False)
+
+async def run_command(*args):
+    """Run a command without blocking the loop, returns (returncode, stdout)"""
+    if AdaptiveInterval:
+        _command_started()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            stdout, _ = await proc.communicate()
+        except asyncio.CancelledError:
+            # Timed out: don't leave the child behind
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            raise
+    finally:
+        if AdaptiveInterval:
+            _command_finished()
+    return proc.returncode, stdout.decode(errors="replace")
+
+class StatusService:
+    """Concurrent status probes on an asyncio loop, published as snapshots
+    
+    Every probe runs as its own task on its own interval, bounded by its
+    timeout, so a hanging bluetoothctl never delays the USB state. When a
+    probe result differs from the last one a new StatusSnapshot goes to the
+    subscribers (on the service thread). Hotplug and process events wake
+    the matching probe immediately instead of waiting for its interval.
+    
+    While a probe's result stays the same its interval backs off towards
+    MAX_SCHEDULE; a change, interact() or an event brings it back. Probes
+    stop altogether while every window that called set_visible() is hidden.
+    """
+    
+    def __init__(self, schedule=None, timeouts=None, usb_monitor=None, process_watcher=None,
+                 display_probe=None):
+        self.schedule = dict(DEFAULT_SCHEDULE, **(schedule or {}))
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.usb_monitor = usb_monitor
+        self.process_watcher = process_watcher
+        self.display_probe = display_probe
+        
+        self.probes = {
+            "usb": self.probe_usb,
+            "display": self.probe_display,
+            "processes": self.probe_processes,
+            "bluetooth": self.probe_bluetooth,
+            "tracker": self.probe_tracker,
+        }
+        
+        self.snapshot = StatusSnapshot(0, 0.0, {}, {}, {}, {}, {}, {}, ())
+        self.probe_runs = {name: 0 for name in SECTIONS}
+        self.probe_changes = {name: 0 for name in SECTIONS}
+        self.intervals = {}
+        self.visibility = Visibility() if AdaptiveInterval else None
+        self.last_interaction = 0.0
+        self.worker_cpu_time = 0.0
+        self.running = False
+        self.thread = None
+        self.loop = None
+        self._wakeups = {}
+        self._tasks = []
+        self._subscribers = []
+        self._lock = threading.Lock()
+    
+    # Probes: coroutines returning one section dict
+    
+    async def probe_usb(self):
+        if self.usb_monitor:
+            found = self.usb_monitor.connected_devices()
+        else:
+            returncode, output = await run_command("lsusb")
+            found = []
+            for line in output.splitlines():
+                # "Bus 001 Device 004: ID 0bb4:0313 HTC (High Tech Computer Corp.)"
+                fields = line.split()
+                if "ID" not in fields or fields.index("ID") + 1 >= len(fields):
+                    continue
+                try:
+                    vendor, product = (int(x, 16) for x in fields[fields.index("ID") + 1].split(":"))
+                except ValueError:
+                    continue
+                name = VR_USB_DEVICES.get((vendor, product)) or VR_USB_DEVICES.get((vendor, None))
+                if name or vendor in (0x0bb4, 0x28de):
+                    found.append((name or "VR device", vendor, product))
+        
+        devices = [{"name": name, "vendor": vendor, "product": product}
+                   for name, vendor, product in sorted(found, key=lambda d: (d[1], d[2]))]
+        return {
+            "devices": devices,
+            "headset": any((d["vendor"], d["product"]) in HEADSET_IDS for d in devices)
+        }
+    
+    async def probe_display(self):
+        if self.display_probe:
+            # The probe follows DRM hotplug events; only read its state
+            state = self.display_probe.connectors()
+            connectors = {name: c["status"] for name, c in state.items()}
+            panels = {name: c["edid"]["name"] or c["edid"]["manufacturer"]
+                      for name, c in state.items() if c["edid"]}
+            hmd = self.display_probe.hmd_connector()
+        else:
+            def read_connectors():
+                connectors = {}
+                for status in sorted(DRM_CONNECTORS.glob("card*-*/status")):
+                    try:
+                        connectors[status.parent.name.split("-", 1)[1]] = status.read_text().strip()
+                    except OSError:
+                        pass
+                return connectors
+            
+            connectors = await self.in_thread(read_connectors)
+            panels = {}
+            hmd = None
+        
+        return {
+            "connectors": connectors,
+            "panels": panels,
+            "hmd": hmd,
+            "hdmi": any("HDMI" in name and state == "connected" for name, state in connectors.items())
+        }
+    
+    async def probe_processes(self):
+        # Only which processes run goes in the snapshot; CPU and memory move
+        # on every sample and are read on demand through process_stats()
+        if self.process_watcher:
+            # The watcher keeps itself current; only read its state
+            pids = {name: self.process_watcher.pids(name) for name in VR_PROCESSES}
+        else:
+            results = await asyncio.gather(*(run_command("pgrep", "-x", name) for name in VR_PROCESSES))
+            pids = {name: sorted(int(pid) for pid in output.split())
+                    for name, (_, output) in zip(VR_PROCESSES, results)}
+        return {
+            "running": {name: bool(pids[name]) for name in VR_PROCESSES},
+            "pids": pids
+        }
+    
+    def process_stats(self):
+        """CPU and memory of the running VR processes, by name ({} without the watcher)"""
+        return self.process_watcher.stats() if self.process_watcher else {}
+    
+    async def probe_bluetooth(self):
+        returncode, output = await run_command("bluetoothctl", "devices", "Connected")
+        devices = []
+        for line in output.splitlines():
+            # "Device AA:BB:CC:DD:EE:FF Name"
+            parts = line.split(" ", 2)
+            if len(parts) >= 2 and parts[0] == "Device":
+                devices.append({"mac": parts[1], "name": parts[2] if len(parts) > 2 else ""})
+        return {
+            "devices": devices,
+            "controllers": sum("controller" in d["name"].lower() for d in devices)
+        }
+    
+    async def probe_tracker(self):
+        def read_config():
+            try:
+                with open(TRACKING_CONFIG, "r") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        
+        config = await self.in_thread(read_config)
+        return {
+            "mode": config.get("tracking_mode", "unknown"),
+            "cameras": len(config.get("camera_ids") or [])
+        }
+    
+    async def in_thread(self, function):
+        """Run a blocking probe step in a worker thread, counting its CPU time"""
+        def run():
+            cost = time.thread_time()
+            try:
+                return function()
+            finally:
+                self.worker_cpu_time += time.thread_time() - cost
+        return await asyncio.to_thread(run)
+    
+    def set_probe(self, name, probe):
+        """Replace the probe for a section; probe is a coroutine function or a plain function"""
+        if name not in SECTIONS:
+            raise ValueError(f"Unknown status section: {name}")
+        if not asyncio.iscoroutinefunction(probe):
+            function = probe
+            async def probe():
+                return await self.in_thread(function)
+        self.probes[name] = probe
+    
+    def set_interval(self, name, seconds):
+        self.schedule[name] = seconds
+        if name in self.intervals:
+            self.intervals[name].set_base(seconds)
+        self.poke(name)
+    
+    # Adaptive scheduling
+    
+    def interact(self):
+        """The user did something: probes go back to their base intervals (any thread)"""
+        now = time.monotonic()
+        if not self.intervals or now - self.last_interaction < INTERACTION_INTERVAL:
+            return
+        self.last_interaction = now
+        self._call_soon(self._speed_up)
+    
+    def set_visible(self, owner, visible):
+        """A window was mapped (True), iconified (False) or destroyed (None)"""
+        if self.visibility is None:
+            return
+        self._call_soon(lambda: self._set_visible(owner, visible))
+    
+    @property
+    def paused(self):
+        return self.visibility is not None and self.visibility.paused
+    
+    def _set_visible(self, owner, visible):
+        was_paused = self.visibility.paused
+        self.visibility.set(owner, visible)
+        if self.visibility.paused:
+            self._active.clear()
+        elif was_paused:
+            # Everything may have changed while hidden
+            self._active.set()
+            self._speed_up(everything=True)
+    
+    def _speed_up(self, everything=False):
+        now = time.monotonic()
+        for name, interval in self.intervals.items():
+            stale = now - self._last_run.get(name, 0.0) >= interval.base
+            interval.reset()
+            if everything or stale:
+                self._wakeups[name].set()
+    
+    def stats(self):
+        """Runs, changes and current interval per probe, and the CPU seconds spent probing"""
+        try:
+            # The loop thread runs the probes (and the subscribers they notify)
+            service_cpu = time.clock_gettime(time.pthread_getcpuclockid(self.thread.ident))
+        except (AttributeError, OSError):
+            service_cpu = 0.0
+        return {
+            "paused": self.paused,
+            "cpu_time": service_cpu + self.worker_cpu_time + command_cpu_time,
+            "probes": {
+                name: {
+                    "runs": self.probe_runs[name],
+                    "changes": self.probe_changes[name],
+                    "interval": self.intervals[name].interval if name in self.intervals else self.schedule[name]
+                }
+                for name in SECTIONS
+            }
+        }
+    
+    # Subscriptions
+    
+    def subscribe(self, callback):
+        """Call callback(snapshot) whenever a section changes"""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+    
+    def poke(self, name):
+        """Run a probe now instead of at its next interval (any thread)"""
+        if name in self._wakeups:
+            self._call_soon(self._wakeups[name].set)
+    
+    def refresh(self):
+        for name in SECTIONS:
+            self.poke(name)
+    
+    def _publish(self, name, result, error):
+        with self._lock:
+            previous = self.snapshot
+            errors = dict(previous.errors)
+            if error:
+                errors[name] = error
+            else:
+                errors.pop(name, None)
+            
+            sections = previous._asdict()
+            if result is not None:
+                sections[name] = result
+            if sections[name] == getattr(previous, name) and errors == previous.errors:
+                return False
+            
+            sections.update(seq=previous.seq + 1, time=time.time(), errors=errors, changed=(name,))
+            snapshot = self.snapshot = StatusSnapshot(**sections)
+            subscribers = list(self._subscribers)
+        
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Status subscriber failed: {e}")
+        return True
+    
+    # Service loop
+    
+    def start(self):
+        if self.running:
+            return
+        
+        if self.usb_monitor is None and UsbHotplugMonitor:
+            self.usb_monitor = UsbHotplugMonitor()
+            self.usb_monitor.start()
+        if self.usb_monitor:
+            self.usb_monitor.subscribe(lambda event: self.poke("usb"))
+        
+        if self.process_watcher is None and ProcessWatcher:
+            self.process_watcher = ProcessWatcher()
+            self.process_watcher.start()
+        if self.process_watcher:
+            self.process_watcher.subscribe(lambda event: self.poke("processes"))
+        
+        if self.display_probe is None and DisplayProbe:
+            self.display_probe = DisplayProbe()
+            self.display_probe.start()
+        if self.display_probe:
+            self.display_probe.subscribe(lambda connectors: self.poke("display"))
+        
+        if AdaptiveInterval:
+            event_driven = {
+                "usb": self.usb_monitor is not None,
+                "display": self.display_probe is not None,
+                "processes": self.process_watcher is not None
+            }
+            self.intervals = {
+                name: AdaptiveInterval(
+                    self.schedule[name],
+                    MAX_SCHEDULE[name] if event_driven.get(name) else min(MAX_SCHEDULE[name], POLLED_BACKOFF)
+                )
+                for name in SECTIONS
+            }
+        
+        self.running = True
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(ready,), daemon=True)
+        self.thread.start()
+        ready.wait(timeout=2.0)
+    
+    def stop(self):
+        self.running = False
+        # Cancel probes mid-run so a hung command doesn't hold up shutdown
+        self._call_soon(lambda: [task.cancel() for task in self._tasks])
+        if self.thread:
+            self.thread.join(timeout=2.0)
+    
+    def _call_soon(self, callback):
+        try:
+            self.loop.call_soon_threadsafe(callback)
+        except (AttributeError, RuntimeError):
+            pass  # Loop not started yet or already closed
+    
+    def _run(self, ready):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._main(ready))
+        finally:
+            self.loop.close()
+    
+    async def _main(self, ready):
+        self._wakeups = {name: asyncio.Event() for name in SECTIONS}
+        self._last_run = {}
+        # Cleared while every window is hidden
+        self._active = asyncio.Event()
+        self._active.set()
+        self._tasks = [asyncio.ensure_future(self._probe_loop(name)) for name in SECTIONS]
+        ready.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    async def _probe_loop(self, name):
+        wakeup = self._wakeups[name]
+        while self.running:
+            await self._active.wait()
+            wakeup.clear()
+            result, error = None, None
+            try:
+                result = await asyncio.wait_for(self.probes[name](), self.timeouts[name])
+            except asyncio.TimeoutError:
+                error = "timeout"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            self.probe_runs[name] += 1
+            self._last_run[name] = time.monotonic()
+            changed = self._publish(name, result, error)
+            self.probe_changes[name] += changed
+            
+            if name in self.intervals:
+                delay = self.intervals[name].record(changed)
+            else:
+                delay = self.schedule[name]
+            try:
+                await asyncio.wait_for(wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_status_service():
+    """The process-wide status service, started on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = StatusService()
+            _service.start()
+    return _service
+
+def idle_check(seconds, settle=5.0):
+    """Run the probes on a steady system and report any whose result keeps changing
+    
+    A probe that counts every run as a change never backs off, so idle
+    overhead stays at its base rate. Start the VR processes first: the
+    processes section has to stay flat while they keep running.
+    """
+    service = StatusService()
+    service.start()
+    time.sleep(settle)
+    before = dict(service.probe_changes)
+    time.sleep(seconds)
+    stats = service.stats()
+    service.stop()
+    
+    running = [name for name, up in service.snapshot.processes.get("running", {}).items() if up]
+    print(f"VR processes running: {', '.join(running) or 'none'}")
+    noisy = []
+    for name, probe in stats["probes"].items():
+        changes = service.probe_changes[name] - before[name]
+        if changes:
+            noisy.append(name)
+        print(f"  {name}: {changes} changes in {seconds:.0f} s, every {probe['interval']:.0f} s")
+    if noisy:
+        print(f"Changing while nothing happened: {', '.join(noisy)}")
+    return not noisy
+
+# Print snapshots if run directly
+if __name__ == "__main__":
+    import argparse
+    import sys
+    
+    parser = argparse.ArgumentParser(description="Print status snapshots as sections change")
+    parser.add_argument("--idle-check", type=float, metavar="SECONDS",
+                        help="fail if any probe reports changes for SECONDS while nothing is plugged, started or stopped")
+    args = parser.parse_args()
+    if args.idle_check:
+        sys.exit(0 if idle_check(args.idle_check) else 1)
+    
+    service = StatusService()
+    service.subscribe(lambda snapshot: print(
+        f"#{snapshot.seq} {', '.join(snapshot.changed)}: "
+        f"{getattr(snapshot, snapshot.changed[0])} {snapshot.errors or ''}"
+    ))
+    service.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stats = service.stats()
+        service.stop()
+        print(f"\nProbe CPU time: {stats['cpu_time'] * 1000:.1f} ms")
+        for name, probe in stats["probes"].items():
+            print(f"  {name}: {probe['runs']} runs, {probe['changes']} changes, every {probe['interval']:.0f} s")
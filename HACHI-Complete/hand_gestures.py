@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+HACHI Gesture Recognition
+Turns the FingerTracker hand stream into debounced gesture events
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+# Event types published by the engine
+EVENT_TYPES = (
+    "hand_found",
+    "hand_lost",
+    "count_changed",
+    "fist",
+    "open_palm",
+    "pinch",
+    "swipe_left",
+    "swipe_right",
+    "swipe_up",
+    "swipe_down",
+)
+
+class HandGestureState:
+    """Small state machine for one tracked hand"""
+    
+    def __init__(self, side, engine):
+        self.side = side
+        self.engine = engine
+        
+        # Committed state
+        self.present = False
+        self.fingers = 0
+        self.pose = None
+        
+        # Candidates waiting out the debounce time
+        self._candidate_fingers = None
+        self._fingers_since = 0.0
+        self._candidate_pose = None
+        self._pose_since = 0.0
+        self._last_seen = 0.0
+        
+        # Recent centroid positions for swipe detection
+        self._trail = deque()
+        self._last_swipe = 0.0
+    
+    def update(self, hand, now):
+        """Feed one frame of hand data, returns a list of events"""
+        events = []
+        
+        if not hand.get("detected"):
+            # Short dropouts are common, only report loss after a timeout
+            if self.present and now - self._last_seen >= self.engine.lost_timeout:
+                self.present = False
+                self.pose = None
+                self._candidate_pose = None
+                self._candidate_fingers = None
+                self._trail.clear()
+                events.append(self._event("hand_lost", now))
+            return events
+        
+        self._last_seen = now
+        if not self.present:
+            self.present = True
+            self.fingers = hand.get("fingers", 0)
+            self._candidate_fingers = self.fingers
+            self._fingers_since = now
+            events.append(self._event("hand_found", now, hand))
+        
+        events.extend(self._update_count(hand, now))
+        events.extend(self._update_pose(hand, now))
+        events.extend(self._update_swipe(hand, now))
+        return events
+    
+    def _update_count(self, hand, now):
+        fingers = hand.get("fingers", 0)
+        if fingers != self._candidate_fingers:
+            self._candidate_fingers = fingers
+            self._fingers_since = now
+            return []
+        
+        if fingers != self.fingers and now - self._fingers_since >= self.engine.debounce:
+            previous = self.fingers
+            self.fingers = fingers
+            return [self._event("count_changed", now, hand, previous=previous)]
+        return []
+    
+    def _update_pose(self, hand, now):
+        pose = self.engine.classify_pose(hand)
+        if pose != self._candidate_pose:
+            self._candidate_pose = pose
+            self._pose_since = now
+            return []
+        
+        if pose != self.pose and now - self._pose_since >= self.engine.debounce:
+            self.pose = pose
+            if pose is not None:
+                return [self._event(pose, now, hand)]
+        return []
+    
+    def _update_swipe(self, hand, now):
+        x, y = hand.get("position", (0, 0))
+        self._trail.append((now, x, y))
+        while self._trail and now - self._trail[0][0] > self.engine.swipe_window:
+            self._trail.popleft()
+        
+        if now - self._last_swipe < self.engine.swipe_cooldown or len(self._trail) < 3:
+            return []
+        
+        _, x0, y0 = self._trail[0]
+        dx, dy = x - x0, y - y0
+        if max(abs(dx), abs(dy)) < self.engine.swipe_distance:
+            return []
+        
+        if abs(dx) >= abs(dy):
+            kind = "swipe_right" if dx > 0 else "swipe_left"
+        else:
+            kind = "swipe_down" if dy > 0 else "swipe_up"
+        
+        self._last_swipe = now
+        self._trail.clear()
+        return [self._event(kind, now, hand, delta=(dx, dy))]
+    
+    def _event(self, kind, now, hand=None, **extra):
+        event = {"type": kind, "hand": self.side, "time": now, "fingers": self.fingers}
+        if hand is not None:
+            event["position"] = hand.get("position", (0, 0))
+        event.update(extra)
+        return event
+
+class GestureEngine:
+    """Debounced gesture events for both hands, delivered through queues"""
+    
+    def __init__(self, debounce=0.15, lost_timeout=0.25, swipe_distance=120,
+                 swipe_window=0.35, swipe_cooldown=0.6, pinch_ratio=0.25):
+        self.debounce = debounce
+        self.lost_timeout = lost_timeout
+        self.swipe_distance = swipe_distance
+        self.swipe_window = swipe_window
+        self.swipe_cooldown = swipe_cooldown
+        self.pinch_ratio = pinch_ratio
+        
+        self.tracks = {
+            "left": HandGestureState("left", self),
+            "right": HandGestureState("right", self)
+        }
+        
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self.dropped_events = 0
+    
+    def classify_pose(self, hand):
+        """Map a hand snapshot to fist / open_palm / pinch / None"""
+        fingers = hand.get("fingers", 0)
+        tips = hand.get("fingertips", [])
+        
+        if len(tips) >= 2 and "bbox" in hand:
+            size = max(hand["bbox"][2], hand["bbox"][3], 1)
+            closest = min(
+                abs(ax - bx) + abs(ay - by)
+                for i, (ax, ay) in enumerate(tips)
+                for bx, by in tips[i + 1:]
+            )
+            if fingers <= 2 and closest < size * self.pinch_ratio:
+                return "pinch"
+        
+        if fingers <= 1:
+            return "fist"
+        if fingers >= 5:
+            return "open_palm"
+        return None
+    
+    def update(self, hands, now=None):
+        """Feed one frame ({"left": hand, "right": hand}) and publish events"""
+        if now is None:
+            now = time.monotonic()
+        
+        for side, track in self.tracks.items():
+            hand = hands.get(side)
+            if hand is None:
+                continue
+            for event in track.update(hand, now):
+                self._publish(event)
+    
+    def subscribe(self, maxsize=64):
+        """Return a queue that receives every future event"""
+        q = queue.Queue(maxsize=maxsize)
+        with self._lock:
+            self._subscribers.append(q)
+        return q
+    
+    def unsubscribe(self, q):
+        """Stop delivering events to a queue"""
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+    
+    def _publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        
+        # Never block the tracking thread: a slow listener loses its oldest events
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+                self.dropped_events += 1
+                try:
+                    q.put_nowait(event)
+                except queue.Full:
+                    pass
+
+# Test if run directly
+if __name__ == "__main__":
+    from finger_tracking import get_tracker
+    
+    tracker = get_tracker()
+    if not tracker.start():
+        print("Failed to start tracking!")
+    else:
+        events = tracker.subscribe_gestures()
+        print("Listening for gestures. Press Ctrl+C to stop.")
+        try:
+            while True:
+                event = events.get()
+                print(f"{event['hand']:>5}: {event['type']} ({event['fingers']} fingers)")
+        except KeyboardInterrupt:
+            print("\nStopping...")
+        finally:
+            tracker.stop()
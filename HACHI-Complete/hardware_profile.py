@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+HACHI Hardware Profile
+GPU detection from PCI sysfs, cached per boot, instead of running lspci
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+SYSFS_PCI_DEVICES = Path("/sys/bus/pci/devices")
+BOOT_ID_FILE = Path("/proc/sys/kernel/random/boot_id")
+CACHE_FILE = Path.home() / ".local" / "share" / "hachi" / "hardware_profile.json"
+
+GPU_VENDORS = {
+    0x10de: "nvidia",
+    0x1002: "amd",
+    0x8086: "intel",
+}
+
+# With several GPUs the discrete one drives the headset
+VENDOR_PREFERENCE = ("nvidia", "amd", "intel")
+
+# PCI base class 0x03 = display controller (VGA, 3D, other)
+PCI_CLASS_DISPLAY = 0x03
+
+# Widget options retheme() looks at
+COLOR_OPTIONS = ("bg", "fg", "activebackground", "activeforeground",
+                 "highlightbackground", "highlightcolor", "selectcolor", "troughcolor")
+
+def read_boot_id(path=BOOT_ID_FILE):
+    try:
+        return Path(path).read_text().strip()
+    except OSError:
+        return ""
+
+def scan_gpus(root=SYSFS_PCI_DEVICES):
+    """Display controllers on the PCI bus"""
+    gpus = []
+    try:
+        devices = sorted(Path(root).iterdir())
+    except OSError:
+        return gpus
+    
+    for device in devices:
+        try:
+            pci_class = int((device / "class").read_text(), 16)
+            if pci_class >> 16 != PCI_CLASS_DISPLAY:
+                continue
+            vendor_id = int((device / "vendor").read_text(), 16)
+            device_id = int((device / "device").read_text(), 16)
+        except (OSError, ValueError):
+            continue
+        
+        # boot_vga marks the GPU the firmware initialised (absent on some)
+        try:
+            boot_vga = (device / "boot_vga").read_text().strip() == "1"
+        except OSError:
+            boot_vga = False
+        
+        gpus.append({
+            "slot": device.name,
+            "vendor": GPU_VENDORS.get(vendor_id, "unknown"),
+            "vendor_id": vendor_id,
+            "device_id": device_id,
+            "boot_vga": boot_vga
+        })
+    return gpus
+
+def detect_profile(root=SYSFS_PCI_DEVICES):
+    """Fresh hardware profile, without touching the cache"""
+    gpus = scan_gpus(root)
+    vendors = {gpu["vendor"] for gpu in gpus}
+    gpu_vendor = next((v for v in VENDOR_PREFERENCE if v in vendors), "unknown")
+    return {
+        "boot_id": read_boot_id(),
+        "gpu_vendor": gpu_vendor,
+        "gpus": gpus,
+        "detected": time.time()
+    }
+
+def cached_profile(cache_file=CACHE_FILE):
+    """The cached profile if it was made during this boot, else None
+    
+    Hardware only changes across reboots, so the boot ID is the cache key.
+    """
+    try:
+        with open(cache_file, "r") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not profile.get("boot_id") or profile["boot_id"] != read_boot_id():
+        return None
+    return profile
+
+def load_profile(cache_file=CACHE_FILE, refresh=False):
+    """Cached profile for this boot, detecting and saving it if needed"""
+    profile = None if refresh else cached_profile(cache_file)
+    if profile:
+        return profile
+    
+    profile = detect_profile()
+    try:
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = Path(cache_file).with_suffix(".json.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(profile, f, indent=2)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Could not cache hardware profile: {e}")
+    return profile
+
+def load_profile_async(cache_file=CACHE_FILE):
+    """Future for load_profile(), so a GUI can paint before detection ends"""
+    future = Future()
+    
+    def run():
+        try:
+            future.set_result(load_profile(cache_file))
+        except Exception as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+def retheme(widget, colors, texts=None):
+    """Swap colors (and text fragments) in an existing widget tree
+    
+    colors and texts map old values to new ones; used to move a window
+    drawn with the default theme over to the detected GPU's accents.
+    """
+    updates = {}
+    for option in COLOR_OPTIONS:
+        try:
+            value = str(widget.cget(option))
+        except Exception:
+            continue
+        if value in colors:
+            updates[option] = colors[value]
+    
+    if texts:
+        try:
+            text = str(widget.cget("text"))
+        except Exception:
+            text = ""
+        for old, new in texts.items():
+            if old and old in text:
+                updates["text"] = text = text.replace(old, new)
+    
+    if updates:
+        widget.config(**updates)
+    for child in widget.winfo_children():
+        retheme(child, colors, texts)
+
+# Compare detection costs if run directly
+if __name__ == "__main__":
+    import subprocess
+    
+    start = time.perf_counter()
+    try:
+        subprocess.run(["lspci"], capture_output=True, text=True)
+        print(f"lspci:          {(time.perf_counter() - start) * 1000:7.2f} ms")
+    except OSError:
+        print("lspci:          not installed")
+    
+    start = time.perf_counter()
+    profile = detect_profile()
+    print(f"PCI sysfs scan: {(time.perf_counter() - start) * 1000:7.2f} ms")
+    
+    load_profile()
+    start = time.perf_counter()
+    cached_profile()
+    print(f"Cached profile: {(time.perf_counter() - start) * 1000:7.2f} ms")
+    
+    print(f"\nGPU vendor: {profile['gpu_vendor']}")
+    for gpu in profile["gpus"]:
+        print(f"  {gpu['slot']}: {gpu['vendor']} {gpu['vendor_id']:04x}:{gpu['device_id']:04x}"
+              f"{' (boot VGA)' if gpu['boot_vga'] else ''}")
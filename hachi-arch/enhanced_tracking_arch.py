@@ -11,6 +11,12 @@ import json
 import time
 from pathlib import Path
 
+# /proc process lookup is optional - falls back to pgrep
+try:
+    from process_watcher import ProcessWatcher
+except ImportError:
+    ProcessWatcher = None
+
 class CosmosTrackingManager:
     def __init__(self):
         self.config_dir = Path.home() / ".config" / "cosmos-tracking"
@@ -272,10 +278,23 @@ SUBSYSTEM=="video4linux", ATTRS{idVendor}=="0bb4", MODE="0666", GROUP="video"
         
         # Test Monado
         print("\n  Testing Monado service...")
-        result = subprocess.run(['pgrep', '-x', 'monado-service'], 
-                              capture_output=True)
-        if result.returncode == 0:
+        if ProcessWatcher:
+            # Two samples half a second apart give a CPU reading
+            watcher = ProcessWatcher(("monado-service",))
+            watcher.scan()
+            time.sleep(0.5)
+            watcher.scan()
+            monado = watcher.stats()["monado-service"]
+            watcher.stop()
+        else:
+            result = subprocess.run(['pgrep', '-x', 'monado-service'],
+                                  capture_output=True)
+            monado = [None] if result.returncode == 0 else []
+        
+        if monado:
             print("    ✓ Monado is running")
+            for proc in filter(None, monado):
+                print(f"      pid {proc['pid']}: {proc['cpu_percent']:.1f}% CPU, {proc['rss_mb']:.0f} MB")
         else:
             print("    ⚠ Monado is not running")
             print("      Start with: monado-service &")
@@ -21,6 +21,69 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Time to first paint is measured from here
+STARTUP_TIME = time.perf_counter()
+
+# PCI sysfs GPU detection is optional - falls back to lspci
+try:
+    from hardware_profile import cached_profile, load_profile_async, retheme
+except ImportError:
+    load_profile_async = None
+
+# USB hotplug events are optional - falls back to polling lsusb
+try:
+    from hotplug import UsbHotplugMonitor
+except ImportError:
+    UsbHotplugMonitor = None
+
+# /proc process lookup is optional - falls back to pgrep
+try:
+    from process_watcher import find_processes
+except ImportError:
+    find_processes = None
+
+# Shared status probes are optional - falls back to a local monitor thread
+try:
+    from hachi_status import get_status_service, usb_connected, process_running
+except ImportError:
+    get_status_service = None
+
+# Adaptive probe intervals are optional - falls back to checking every 2 s
+try:
+    from probe_scheduler import ProbeScheduler, watch_window
+except ImportError:
+    ProbeScheduler = None
+
+# Queued widget updates are optional - falls back to configuring directly
+try:
+    from ui_dispatch import UiDispatcher
+except ImportError:
+    UiDispatcher = None
+
+# DRM/EDID display detection is optional - falls back to xrandr
+try:
+    from display_probe import DisplayProbe
+except ImportError:
+    DisplayProbe = None
+
+# In-process performance sampler is optional - falls back to vr-perf-monitor.sh
+try:
+    from perf_monitor import PerfMonitor, open_window as open_perf_window
+except ImportError:
+    PerfMonitor = None
+
+# Compositor frame timing is optional - the dashboard just leaves it out
+try:
+    from frame_timing import FrameTimingCollector, format_stats, format_histogram
+except ImportError:
+    FrameTimingCollector = None
+
+# The hachid daemon is optional - falls back to running probes and processes in this window
+try:
+    from hachid import connect_status, HachidError
+except ImportError:
+    connect_status = None
+
 class HachiControlCenter:
     def __init__(self, root):
         self.root = root
@@ -52,8 +115,14 @@ class HachiControlCenter:
         self.create_sidebar()
         self.create_main_area()
         self.create_status_bar()
+        # Monitor threads hand widget updates to the Tk thread through this
+        self.ui = UiDispatcher(self.root) if UiDispatcher else None
         self.start_monitoring()
         self.show_dashboard()
+        # Finish GPU detection in the background and note time to first paint
+        if self.gpu_detection:
+            self.root.after(10, self.finish_gpu_detection)
+        self._paint_binding = self.root.bind('<Expose>', self.report_first_paint, '+')
 
     # -------- Persistent Config --------
     def load_config(self):
@@ -75,6 +144,17 @@ class HachiControlCenter:
 
     # -------- Theme / GPU detection --------
     def detect_gpu(self):
+        self.gpu_detection = None
+        if load_profile_async:
+            # Cached for this boot it's instant; otherwise paint with the
+            # default theme and switch accents when the PCI scan is done
+            profile = cached_profile()
+            if profile:
+                self.gpu_vendor = profile['gpu_vendor']
+            else:
+                self.gpu_vendor = 'unknown'
+                self.gpu_detection = load_profile_async()
+            return
         gpu_file = self.config_dir / "gpu_vendor.txt"
         if gpu_file.exists():
             with open(gpu_file, 'r') as f:
@@ -94,6 +174,29 @@ class HachiControlCenter:
                 self.gpu_vendor = 'unknown'
             with open(gpu_file, 'w') as f:
                 f.write(self.gpu_vendor)
+    def finish_gpu_detection(self):
+        """Move the already drawn window to the detected GPU's accents"""
+        if not self.gpu_detection.done():
+            self.root.after(10, self.finish_gpu_detection)
+            return
+        try:
+            vendor = self.gpu_detection.result()['gpu_vendor']
+        except Exception:
+            vendor = 'unknown'
+        self.gpu_detection = None
+        if vendor == self.gpu_vendor:
+            return
+        old_colors, old_name = dict(self.colors), self.gpu_name
+        self.gpu_vendor = vendor
+        self.setup_theme()
+        changed = {old_colors[key]: value for key, value in self.colors.items() if old_colors.get(key) != value}
+        retheme(self.root, changed, {old_name: self.gpu_name})
+
+    def report_first_paint(self, event=None):
+        self.root.unbind('<Expose>', self._paint_binding)
+        self.first_paint_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        if os.environ.get('HACHI_STARTUP_TIMING'):
+            print(f"Time to first paint: {self.first_paint_ms:.0f} ms")
     def setup_theme(self):
         self.colors = {
             'bg_dark': '#0a0a0a',
@@ -176,6 +279,10 @@ class HachiControlCenter:
         help_menu = tk.Menu(menubar, tearoff=0, bg=self.colors['bg_light'], fg=self.colors['text'])
         help_menu.add_command(label="About HACHI", command=self.show_about)
         menubar.add_cascade(label="Help", menu=help_menu)
+        debug_menu = tk.Menu(menubar, tearoff=0, bg=self.colors['bg_light'], fg=self.colors['text'])
+        debug_menu.add_command(label="View Statistics", command=self.show_view_stats)
+        debug_menu.add_command(label="Rebuild Views", command=self.rebuild_views)
+        menubar.add_cascade(label="Debug", menu=debug_menu)
     def create_header(self):
         header = tk.Frame(self.root, bg=self.colors['bg_light'], height=100)
         header.pack(fill=tk.X, padx=0, pady=0)
@@ -231,6 +338,7 @@ class HachiControlCenter:
             ("Launch VR", self.launch_vr, "🚀"),
         ]
         self.nav_buttons = {}
+        self.nav_commands = {text: command for text, command, icon in nav_buttons}
         for text, command, icon in nav_buttons:
             btn_frame = tk.Frame(sidebar, bg=self.colors['bg_medium'])
             btn_frame.pack(fill=tk.X, padx=10, pady=2)
@@ -254,6 +362,11 @@ class HachiControlCenter:
     def create_main_area(self):
         self.main_area = tk.Frame(self.root, bg=self.colors['bg_dark'])
         self.main_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Views are stacked in one grid cell and raised when selected
+        self.main_area.grid_rowconfigure(0, weight=1)
+        self.main_area.grid_columnconfigure(0, weight=1)
+        self.views = {}
+        self.current_view = None
     def create_status_bar(self):
         status_bar = tk.Frame(self.root, bg=self.colors['bg_light'], height=30)
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
@@ -273,11 +386,128 @@ class HachiControlCenter:
             self.root.after(1000, update_time)
         update_time()
     def clear_main_area(self):
+        # Drops the cached views; they are rebuilt when next shown
         for widget in self.main_area.winfo_children():
             widget.destroy()
+        self.views = {}
+
+    # ========== VIEW REGISTRY =========
+    def show_view(self, name, build, refresh=None):
+        """Raise a view, building it the first time it is shown
+
+        Views stay alive in self.views once built; switching only raises
+        the frame and runs the view's refresh hook, which updates just the
+        fields that change.
+        """
+        started = time.perf_counter()
+        self.highlight_nav_button(name)
+        view = self.views.get(name)
+        if view is None:
+            frame = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+            frame.grid(row=0, column=0, sticky='nsew')
+            build(frame)
+            view = self.views[name] = {
+                "frame": frame,
+                "refresh": refresh,
+                "build_ms": (time.perf_counter() - started) * 1000,
+                "switches": 0,
+                "switch_ms": 0.0,
+                "total_switch_ms": 0.0
+            }
+        self.current_view = name
+        view["frame"].tkraise()
+        if refresh:
+            refresh()
+            if self.ui:
+                self.ui.flush()
+        # The switch is done once Tk has redrawn, which happens when it goes idle
+        self.root.after_idle(self.record_view_switch, view, started)
+    def record_view_switch(self, view, started):
+        view["switch_ms"] = (time.perf_counter() - started) * 1000
+        view["total_switch_ms"] += view["switch_ms"]
+        view["switches"] += 1
+    def refresh_view(self):
+        """Run the current view's refresh hook (any thread)"""
+        view = self.views.get(self.current_view)
+        if view and view["refresh"]:
+            view["refresh"]()
+    def rebuild_views(self):
+        """Throw away the cached views and rebuild the current one (Debug menu)"""
+        current = self.current_view
+        self.clear_main_area()
+        if current:
+            self.nav_commands[current]()
+    def count_widgets(self, widget):
+        return 1 + sum(self.count_widgets(child) for child in widget.winfo_children())
+    def show_view_stats(self):
+        lines = []
+        for name, view in self.views.items():
+            average = view["total_switch_ms"] / view["switches"] if view["switches"] else 0.0
+            lines.append(
+                f"{name}: built in {view['build_ms']:.1f} ms, {self.count_widgets(view['frame'])} widgets\n"
+                f"    last switch {view['switch_ms']:.1f} ms, average {average:.1f} ms over {view['switches']}"
+            )
+        lines.append(f"\nWidgets in window: {self.count_widgets(self.root)}")
+        if self.ui:
+            stats = self.ui.stats
+            lines.append(f"Queued updates: {stats['queued']} ({stats['applied']} applied, {stats['skipped']} unchanged)")
+        probes = self.status_service or self.probe_scheduler
+        if probes and hasattr(probes, 'stats'):
+            stats = probes.stats()
+            intervals = ", ".join(f"{name} {probe['interval']:.0f} s" for name, probe in stats['probes'].items())
+            lines.append(f"Status probes: {stats['cpu_time'] * 1000:.0f} ms CPU{' (paused)' if stats['paused'] else ''}")
+            lines.append(f"    intervals: {intervals}")
+        messagebox.showinfo("View Statistics", "\n".join(lines))
 
     # ========== DEVICE STATUS MONITORING =========
     def start_monitoring(self):
+        # Compositor frame times are tailed from the VR logs
+        self.frame_timing = None
+        if FrameTimingCollector:
+            self.frame_timing = FrameTimingCollector()
+            self.frame_timing.subscribe(self.refresh_frame_timing)
+            self.frame_timing.start()
+        # One status service runs the probes for every window in the process
+        self.status_service = None
+        self.probe_scheduler = None
+        # With hachid running the probes and VR processes live there and are
+        # shared with every other window; this one only draws what it pushes.
+        # Without one this window runs its own probes; no daemon is started
+        # that it would not use
+        self.daemon = None
+        if connect_status and get_status_service:
+            self.daemon, self.status_service = connect_status()
+        if self.status_service is None and get_status_service:
+            self.status_service = get_status_service()
+        if self.status_service:
+            self.usb_monitor = self.status_service.usb_monitor
+            self.display_probe = self.status_service.display_probe
+            self.status_service.subscribe(lambda snapshot: self.check_device_status())
+            if ProbeScheduler:
+                watch_window(self.root, self.status_service)
+            self.check_device_status()
+            return
+        # Headset plug/unplug is pushed by the kernel; no lsusb polling needed
+        self.usb_monitor = None
+        if UsbHotplugMonitor:
+            self.usb_monitor = UsbHotplugMonitor()
+            self.usb_monitor.subscribe(lambda event: self.check_device_status())
+            self.usb_monitor.start()
+        # Display connector changes come from DRM uevents; no xrandr polling needed
+        self.display_probe = None
+        if DisplayProbe:
+            self.display_probe = DisplayProbe()
+            self.display_probe.subscribe(lambda connectors: self.check_device_status())
+            self.display_probe.start()
+        # The check backs off while nothing changes and stops while iconified
+        if ProbeScheduler:
+            self.probe_scheduler = ProbeScheduler()
+            self.probe_scheduler.add('device', self.check_device_status, 2.0,
+                                     30.0 if self.usb_monitor and self.display_probe else 10.0,
+                                     state=lambda: (self.device_connected, self.display_connected))
+            self.probe_scheduler.start()
+            watch_window(self.root, self.probe_scheduler)
+            return
         def monitor():
             while True:
                 self.check_device_status()
@@ -286,19 +516,22 @@ class HachiControlCenter:
         thread.start()
     def check_device_status(self):
         try:
-            lsusb_out = subprocess.run(['lsusb'], capture_output=True, text=True).stdout
-            self.device_connected = "0bb4:0313" in lsusb_out or "0BB4:0313" in lsusb_out
+            if self.status_service:
+                self.device_connected = usb_connected(self.status_service.snapshot, 0x0bb4, 0x0313)
+            elif self.usb_monitor:
+                self.device_connected = self.usb_monitor.is_connected(0x0bb4, 0x0313)
+            else:
+                lsusb_out = subprocess.run(['lsusb'], capture_output=True, text=True).stdout
+                self.device_connected = "0bb4:0313" in lsusb_out or "0BB4:0313" in lsusb_out
         except Exception:
             self.device_connected = False
 
         display_found = False
         try:
-            xrandr_out = subprocess.run(["xrandr", "--verbose"], capture_output=True, text=True).stdout
-            hmd_patterns = [r"HTC", r"Vive", r"COSMOS", r"2880x1700", r"2160x2160", r"DisplayPort-\d", r"HDMI-\d"]
-            for pat in hmd_patterns:
-                if re.search(pat, xrandr_out, re.IGNORECASE):
-                    display_found = True
-                    break
+            if self.display_probe:
+                display_found = self.display_probe.hmd_connector() is not None
+            else:
+                display_found = self.xrandr_hmd_found()
         except Exception:
             pass
 
@@ -306,13 +539,15 @@ class HachiControlCenter:
 
         if self.device_connected:
             if display_found:
-                self.status_label.config(
+                self.update_widget(
+                    self.status_label,
                     text="● Headset Connected",
                     fg=self.colors['status_good']
                 )
                 self._prompted_hdmi_missing = False
             else:
-                self.status_label.config(
+                self.update_widget(
+                    self.status_label,
                     text="● USB Detected: No Display/HDMI!",
                     fg=self.colors['status_warning']
                 )
@@ -329,13 +564,31 @@ class HachiControlCenter:
                             "  - Then RESTART your PC.\n\n"
                             "The VR display must be detected before VR will work properly."
                         )
-                    self.root.after(20, prompt)
+                    if self.ui:
+                        self.ui.call(prompt)
+                    else:
+                        self.root.after(20, prompt)
         else:
-            self.status_label.config(
+            self.update_widget(
+                self.status_label,
                 text="● Headset Disconnected",
                 fg=self.colors['status_error']
             )
             self._prompted_hdmi_missing = False
+        # Only the visible view is kept current; others refresh when shown
+        self.refresh_view()
+
+    def xrandr_hmd_found(self):
+        xrandr_out = subprocess.run(["xrandr", "--verbose"], capture_output=True, text=True).stdout
+        hmd_patterns = [r"HTC", r"Vive", r"COSMOS", r"2880x1700", r"2160x2160", r"DisplayPort-\d", r"HDMI-\d"]
+        return any(re.search(pat, xrandr_out, re.IGNORECASE) for pat in hmd_patterns)
+
+    def update_widget(self, widget, **options):
+        """Configure a widget from any thread"""
+        if self.ui:
+            self.ui.config(widget, **options)
+        else:
+            widget.config(**options)
 
     def highlight_nav_button(self, button_name): 
         for name, btn in self.nav_buttons.items():
@@ -348,12 +601,29 @@ class HachiControlCenter:
 
     # --------- TABS IMPLEMENTATION (all have real content) ----------
     def show_dashboard(self):
-        self.clear_main_area()
-        self.highlight_nav_button("Dashboard")
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Dashboard", self.build_dashboard, self.refresh_dashboard)
+    def build_dashboard(self, view):
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
         tk.Label(container, text="📊 HACHI DASHBOARD", font=('Arial', 26, 'bold'),
                  bg=self.colors['bg_dark'], fg=self.colors['accent']).pack(anchor=tk.W, pady=(0,22))
+        # Filled in by refresh_dashboard
+        self.dashboard_status = tk.Label(container, text="", font=('Consolas', 13),
+                 bg=self.colors['bg_dark'], fg=self.colors['text'])
+        self.dashboard_status.pack(anchor=tk.W, pady=(0, 30))
+        # Frame timing from the compositor logs, filled in by refresh_frame_timing
+        if self.frame_timing:
+            tk.Label(container, text=f"FRAME TIMING ({self.frame_timing.frequency:.0f} Hz)", font=('Arial', 14, 'bold'),
+                     bg=self.colors['bg_dark'], fg=self.colors['accent']).pack(anchor=tk.W)
+            self.frame_timing_label = tk.Label(container, text="No compositor frames yet", font=('Consolas', 12),
+                     bg=self.colors['bg_dark'], fg=self.colors['text_dim'])
+            self.frame_timing_label.pack(anchor=tk.W, pady=(6, 4))
+            self.frame_histogram_label = tk.Label(container, text="", font=('Consolas', 10), justify=tk.LEFT,
+                     bg=self.colors['bg_dark'], fg=self.colors['text_dim'])
+            self.frame_histogram_label.pack(anchor=tk.W, pady=(0, 30))
+        self.create_styled_button(container, "Check All Devices", self.check_device_status, width=25).pack(anchor=tk.W, pady=8)
+        self.create_styled_button(container, "Quick-Start VR", self.launch_vr, width=25).pack(anchor=tk.W, pady=8)
+    def refresh_dashboard(self):
         status = (
             f"Headset USB Detected: {'YES' if self.device_connected else 'NO'}\n"
             f"Display/HDMI Detected: {'YES' if self.display_connected else 'NO'}\n"
@@ -362,31 +632,47 @@ class HachiControlCenter:
             f"Finger Tracking: {'Enabled' if self.finger_tracking_enabled else 'Disabled'}\n"
             f"Monado Running: {'YES' if self.monado_running else 'NO'}\n"
         )
-        tk.Label(container, text=status, font=('Consolas', 13),
-                 bg=self.colors['bg_dark'], fg=self.colors['text']).pack(anchor=tk.W, pady=(0, 30))
-        self.create_styled_button(container, "Check All Devices", self.check_device_status, width=25).pack(anchor=tk.W, pady=8)
-        self.create_styled_button(container, "Quick-Start VR", self.launch_vr, width=25).pack(anchor=tk.W, pady=8)
+        self.update_widget(self.dashboard_status, text=status)
+        if self.frame_timing:
+            self.refresh_frame_timing(self.frame_timing.stats())
+    def refresh_frame_timing(self, stats):
+        if self.current_view != "Dashboard":
+            return
+        if not stats["frames"]:
+            color = self.colors['text_dim']
+        elif stats["missed_rate"] < 0.01:
+            color = self.colors['status_good']
+        elif stats["missed_rate"] < 0.05:
+            color = self.colors['status_warning']
+        else:
+            color = self.colors['status_error']
+        self.update_widget(self.frame_timing_label, text=format_stats(stats), fg=color)
+        histogram = format_histogram(self.frame_timing.histogram(), stats["vsync_ms"]) if stats["frames"] else ""
+        self.update_widget(self.frame_histogram_label, text=histogram)
 
     def show_tracking(self):
-        self.clear_main_area()
-        self.highlight_nav_button("Tracking")
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Tracking", self.build_tracking, self.refresh_tracking)
+    def build_tracking(self, view):
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
         tk.Label(container, text="🎯 TRACKING", font=('Arial', 24, 'bold'),
                  bg=self.colors['bg_dark'], fg=self.colors['accent']).pack(anchor=tk.W, pady=(0,14))
+        self.tracking_mode_label = tk.Label(container, text="", font=('Consolas', 12),
+                 bg=self.colors['bg_dark'], fg=self.colors['text'])
+        self.tracking_mode_label.pack(anchor=tk.W, pady=(0,18))
+        self.create_styled_button(container, "Auto-Configure Tracking", lambda: messagebox.showinfo("Not implemented","Coming soon!"), width=26).pack(anchor=tk.W,pady=8)
+        self.create_styled_button(container, "Test Tracking", lambda: messagebox.showinfo("Not implemented","Coming soon!"), width=26).pack(anchor=tk.W,pady=8)
+    def refresh_tracking(self):
         msg = (
             "• Configure and test Cosmos tracking system for 6DOF/3DOF.\n"
             f"• Current Mode: {self.config.get('tracking_mode','auto').upper()}"
         )
-        tk.Label(container, text=msg, font=('Consolas', 12),
-                 bg=self.colors['bg_dark'], fg=self.colors['text']).pack(anchor=tk.W, pady=(0,18))
-        self.create_styled_button(container, "Auto-Configure Tracking", lambda: messagebox.showinfo("Not implemented","Coming soon!"), width=26).pack(anchor=tk.W,pady=8)
-        self.create_styled_button(container, "Test Tracking", lambda: messagebox.showinfo("Not implemented","Coming soon!"), width=26).pack(anchor=tk.W,pady=8)
+        self.update_widget(self.tracking_mode_label, text=msg)
 
     def show_finger_tracking(self):
-        self.clear_main_area()
-        self.highlight_nav_button("Finger Tracking")
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Finger Tracking", self.build_finger_tracking)
+    def build_finger_tracking(self, view):
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
         tk.Label(container, text="✋ FINGER TRACKING (EXPERIMENTAL)", font=('Arial', 24, 'bold'),
                  bg=self.colors['bg_dark'], fg=self.colors['accent']).pack(anchor=tk.W, pady=(0,14))
@@ -399,9 +685,9 @@ class HachiControlCenter:
         tk.Label(container, text="• Requires working Cosmos cameras and OpenCV", font=('Arial',10), bg=self.colors['bg_dark'], fg=self.colors['text_dim']).pack(anchor=tk.W, pady=(16,0))
 
     def show_controllers(self):
-        self.clear_main_area()
-        self.highlight_nav_button("Controllers")
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Controllers", self.build_controllers)
+    def build_controllers(self, view):
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
         tk.Label(container, text="🎮 CONTROLLER MANAGEMENT", font=('Arial', 24, 'bold'),
                  bg=self.colors['bg_dark'], fg=self.colors['accent']).pack(anchor=tk.W, pady=(0,14))
@@ -413,9 +699,9 @@ class HachiControlCenter:
         self.create_styled_button(container, "Test Signals", lambda: messagebox.showinfo("Not implemented","Coming soon!"), width=28).pack(anchor=tk.W,pady=8)
 
     def show_display(self):
-        self.clear_main_area()
-        self.highlight_nav_button("Display")
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Display", self.build_display)
+    def build_display(self, view):
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
         tk.Label(container, text="🖥️ PERFORMANCE & DISPLAY", font=('Arial', 24, 'bold'),
                  bg=self.colors['bg_dark'], fg=self.colors['accent']).pack(anchor=tk.W, pady=(0,14))
@@ -426,9 +712,9 @@ class HachiControlCenter:
         self.create_styled_button(container, "Performance Monitor", lambda: messagebox.showinfo("Not implemented","Coming soon!"), width=19).pack(anchor=tk.W,pady=8)
 
     def show_firmware(self):
-        self.clear_main_area()
-        self.highlight_nav_button("Firmware")
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Firmware", self.build_firmware)
+    def build_firmware(self, view):
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
         tk.Label(container, text="⚙️ FIRMWARE", font=('Arial', 24, 'bold'),
                  bg=self.colors['bg_dark'], fg=self.colors['accent']).pack(anchor=tk.W, pady=(0,14))
@@ -437,9 +723,9 @@ class HachiControlCenter:
 
     # --------- DEVELOPER TAB ---------
     def show_developer_tab(self):
-        self.clear_main_area()
-        self.highlight_nav_button("Developer")
-        frame = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Developer", self.build_developer)
+    def build_developer(self, view):
+        frame = tk.Frame(view, bg=self.colors['bg_dark'])
         frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
         tk.Label(frame, text="🛠 Developer Kit", font=("Arial",21,"bold"), bg=self.colors['bg_dark'], fg=self.colors['accent']).pack(anchor='w', pady=(5,20))
 
@@ -514,7 +800,13 @@ Categories=Utility;System;"""
 
     def calibrate_finger_tracking(self): pass
     def launch_monitor(self): pass
-    def launch_perf_monitor(self): pass
+    def launch_perf_monitor(self):
+        if PerfMonitor:
+            monitor = PerfMonitor()
+            monitor.start()
+            open_perf_window(monitor, self.root)
+        else:
+            subprocess.Popen(['bash', '-c', 'vr-perf-monitor.sh'])
     def show_logs(self): pass
     def show_preferences(self): messagebox.showinfo("Prefs","Preferences coming soon.")
     def show_about(self): messagebox.showinfo("About HACHI", f"HACHI - Cosmos Control Center\nTheme: {self.gpu_name}")
@@ -536,16 +828,31 @@ Categories=Utility;System;"""
         def launch_thread():
             os.environ["XR_RUNTIME_JSON"] = xr_runtime_json
             # Launch Monado if not running
-            monado_status = subprocess.run(["pgrep", "-x", "monado-service"], stdout=subprocess.PIPE)
-            if not monado_status.stdout:
+            if find_processes:
+                monado_running = bool(find_processes("monado-service"))
+            else:
+                monado_running = bool(subprocess.run(["pgrep", "-x", "monado-service"], stdout=subprocess.PIPE).stdout)
+            # The daemon starts them when it runs, so they outlive this window;
+            # it knows their commands and runtime itself
+            if not monado_running:
                 self.status_bar_label.config(text="Starting Monado service...")
-                subprocess.Popen([monado_bin])
+                if self.daemon:
+                    try:
+                        self.daemon.call("session.start", name="monado")
+                    except HachidError as e:
+                        self.update_widget(self.status_bar_label, text=f"Failed to start Monado: {e}")
+                        return
+                else:
+                    subprocess.Popen([monado_bin])
                 time.sleep(2)
             else:
                 self.status_bar_label.config(text="Monado already running.")
             self.status_bar_label.config(text="Launching SteamVR...")
             try:
-                subprocess.Popen([steam_exe, "-applaunch", steamvr_appid])
+                if self.daemon:
+                    self.daemon.call("session.start", name="steamvr")
+                else:
+                    subprocess.Popen([steam_exe, "-applaunch", steamvr_appid])
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to launch SteamVR:\n{e}")
                 return
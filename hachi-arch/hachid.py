@@ -0,0 +1,1029 @@
+#!/usr/bin/env python3
+"""
+HACHI Daemon
+Owns device monitoring, the finger tracker and VR session processes; GUIs and scripts are clients on a Unix socket
+"""
+
+import asyncio
+import base64
+import fcntl
+import json
+import os
+import queue
+import shutil
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from hachi_status import StatusSnapshot, get_status_service, usb_connected, process_running
+
+# Must belong to the user alone (see private_dir): whoever can write here can
+# put a socket of their own in place of the daemon's
+if os.environ.get("XDG_RUNTIME_DIR"):
+    RUNTIME_DIR = Path(os.environ["XDG_RUNTIME_DIR"]) / "hachi"
+else:
+    RUNTIME_DIR = Path(f"/tmp/hachi-{os.getuid()}")
+SOCKET_PATH = RUNTIME_DIR / "hachid.sock"
+DAEMON_LOG = Path.home() / ".local" / "share" / "hachi" / "hachid.log"
+LOG_DIR = Path.home() / ".local" / "share" / "vr-logs"
+HACHID_SCRIPT = Path(__file__).resolve()
+
+# Seconds a client waits for a daemon it started to come up
+STARTUP_TIMEOUT = 3.0
+
+# The daemon exits after this many seconds without clients, running sessions
+# or a running tracker (0 keeps it running); checked every IDLE_CHECK seconds
+IDLE_EXIT = 300.0
+IDLE_CHECK = 5.0
+
+# Hand data pushed to "tracker" subscribers this often (Hz)
+TRACKER_RATE = 10
+
+# A client that stops reading is dropped once this much is queued for it
+MAX_CLIENT_BUFFER = 1024 * 1024
+
+# The only processes session.start runs; clients name one, never pass a command
+SESSION_COMMANDS = {
+    "monado": [shutil.which("monado-service") or "/usr/local/bin/monado-service"],
+    "steamvr": ["steam", "-applaunch", "250820"],
+    # The menu's quick start, without the menu (which would wait on stdin)
+    "vr_manager": ["bash", "-c", "vr_manager.sh full"],
+    # Written by the control center (hachi-safe) next to its config
+    "finger_tracking": ["python3", str(Path.home() / ".local" / "share" / "hachi" / "finger_tracking.py")],
+}
+
+# Environment added for a session, on top of the daemon's own
+MONADO_RUNTIME = {"XR_RUNTIME_JSON": "/usr/share/openxr/1/openxr_monado.json"}
+SESSION_ENV = {
+    "monado": MONADO_RUNTIME,
+    "steamvr": MONADO_RUNTIME,
+}
+
+# Same files vr_manager.sh writes, so the log viewer and frame timing find them
+SESSION_LOGS = {
+    "monado": "monado.log",
+    "steamvr": "steamvr.log",
+}
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+class HachidError(Exception):
+    pass
+
+def _json_default(value):
+    # numpy arrays and scalars from the tracker, tuples in snapshots
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    return str(value)
+
+def encode(message):
+    return json.dumps(message, default=_json_default, separators=(",", ":")).encode() + b"\n"
+
+def is_private_dir(directory):
+    """Whether directory is a real directory owned by this user with mode 0700"""
+    try:
+        info = os.lstat(directory)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid()
+            and stat.S_IMODE(info.st_mode) == 0o700)
+
+def private_dir(directory):
+    """Create the socket directory for this user only, or check an existing one is"""
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        directory.mkdir(mode=0o700)
+        # mkdir's mode is masked by the umask
+        os.chmod(directory, 0o700)
+    except FileExistsError:
+        pass
+    if not is_private_dir(directory):
+        raise HachidError(f"{directory} must be a directory owned by you with mode 0700")
+    return directory
+
+def snapshot_from_dict(data):
+    fields = {name: data.get(name) for name in StatusSnapshot._fields}
+    for name in ("usb", "display", "processes", "bluetooth", "tracker", "errors"):
+        fields[name] = fields[name] or {}
+    fields["seq"] = fields["seq"] or 0
+    fields["time"] = fields["time"] or 0.0
+    fields["changed"] = tuple(fields["changed"] or ())
+    return StatusSnapshot(**fields)
+
+# Daemon
+
+class Connection:
+    """One client socket on the daemon side"""
+    
+    def __init__(self, writer):
+        self.writer = writer
+        self.topics = set()
+        self.windows = set()
+    
+    def send(self, message):
+        if self.writer.is_closing():
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            print("hachid: dropping a client that stopped reading")
+            self.writer.close()
+            return
+        self.writer.write(encode(message))
+
+class Hachid:
+    """The daemon: one StatusService, one FingerTracker and the session processes
+    
+    Requests are JSON-RPC 2.0, one JSON object per line; each runs as its
+    own task, so a five second calibration doesn't hold up status calls.
+    After "subscribe" a client gets notifications (requests without an id)
+    whose method is the topic: status, tracker, gesture or session.
+    """
+    
+    def __init__(self, path=SOCKET_PATH, idle_exit=IDLE_EXIT):
+        self.path = Path(path)
+        self.idle_exit = idle_exit
+        self.clients = set()
+        self.sessions = {}
+        self.status = None
+        self.tracker = None
+        self.tracker_error = None
+        self.tracker_task = None
+        self.loop = None
+        self.stopping = None
+        self.started = time.time()
+        
+        self.methods = {
+            "daemon.info": self.daemon_info,
+            "daemon.shutdown": self.daemon_shutdown,
+            "subscribe": self.subscribe,
+            "unsubscribe": self.unsubscribe,
+            "status.get": self.status_get,
+            "status.refresh": self.status_refresh,
+            "status.set_interval": self.status_set_interval,
+            "status.set_visible": self.status_set_visible,
+            "status.interact": self.status_interact,
+            "status.stats": self.status_stats,
+            "status.process_stats": self.status_process_stats,
+            "tracker.info": self.tracker_info,
+            "tracker.start": self.tracker_start,
+            "tracker.stop": self.tracker_stop,
+            "tracker.calibrate": self.tracker_calibrate,
+            "tracker.hand_data": self.tracker_hand_data,
+            "tracker.set_preview": self.tracker_set_preview,
+            "tracker.preview": self.tracker_preview,
+            "tracker.set_sensitivity": self.tracker_set_sensitivity,
+            "session.start": self.session_start,
+            "session.stop": self.session_stop,
+            "session.list": self.session_list,
+        }
+    
+    # Daemon
+    
+    def daemon_info(self, client):
+        return {
+            "pid": os.getpid(),
+            "started": self.started,
+            "clients": len(self.clients),
+            "display_probe": self.status.display_probe is not None,
+            "tracker": self.tracker is not None,
+            "sessions": sorted(self.sessions)
+        }
+    
+    def daemon_shutdown(self, client):
+        self.loop.call_soon(self.stopping.set)
+        return True
+    
+    def busy(self):
+        """Whether anything still needs the daemon"""
+        return bool(
+            self.clients
+            or any(session["process"].returncode is None for session in self.sessions.values())
+            or (self.tracker and self.tracker.running)
+        )
+    
+    async def exit_when_idle(self):
+        idle_since = None
+        while not self.stopping.is_set():
+            await asyncio.sleep(IDLE_CHECK)
+            now = time.monotonic()
+            if self.busy():
+                idle_since = None
+            elif idle_since is None:
+                idle_since = now
+            elif now - idle_since >= self.idle_exit:
+                print(f"hachid: idle for {self.idle_exit:.0f} s, exiting")
+                self.stopping.set()
+    
+    def subscribe(self, client, topics):
+        client.topics.update(topics)
+        if "tracker" in topics:
+            self.stream_tracker()
+        return sorted(client.topics)
+    
+    def unsubscribe(self, client, topics):
+        client.topics.difference_update(topics)
+        return sorted(client.topics)
+    
+    def broadcast(self, topic, params):
+        message = {"jsonrpc": "2.0", "method": topic, "params": params}
+        for client in list(self.clients):
+            if topic in client.topics:
+                client.send(message)
+    
+    # Status
+    
+    def status_get(self, client):
+        return self.status.snapshot._asdict()
+    
+    def status_refresh(self, client, section=None):
+        if section:
+            self.status.poke(section)
+        else:
+            self.status.refresh()
+        return True
+    
+    def status_set_interval(self, client, section, seconds):
+        self.status.set_interval(section, seconds)
+        return True
+    
+    def status_set_visible(self, client, window, visible):
+        # Windows are told apart per connection, and forgotten with it
+        owner = (id(client), window)
+        if visible is None:
+            client.windows.discard(owner)
+        else:
+            client.windows.add(owner)
+        self.status.set_visible(owner, visible)
+        return True
+    
+    def status_interact(self, client):
+        self.status.interact()
+        return True
+    
+    def status_stats(self, client):
+        return self.status.stats()
+    
+    def status_process_stats(self, client):
+        return self.status.process_stats()
+    
+    # Finger tracker
+    
+    def get_tracker(self):
+        """The finger tracker, created on first use (this imports OpenCV)"""
+        if self.tracker is None and self.tracker_error is None:
+            try:
+                import finger_tracking
+                self.tracker = finger_tracking.get_tracker()
+            except Exception as e:
+                self.tracker_error = str(e) or type(e).__name__
+                return None
+            self.status.set_probe("tracker", self.tracker_status)
+            events = self.tracker.subscribe_gestures()
+            if events is not None:
+                threading.Thread(target=self.forward_gestures, args=(events,), daemon=True).start()
+        return self.tracker
+    
+    def tracker_status(self):
+        data = self.tracker.get_hand_data()
+        return {
+            "enabled": data["enabled"],
+            "fps": data["fps"],
+            "detector": data["detector"],
+            "left": data["left"].get("detected", False),
+            "right": data["right"].get("detected", False)
+        }
+    
+    def forward_gestures(self, events):
+        while True:
+            event = events.get()
+            self.loop.call_soon_threadsafe(self.broadcast, "gesture", event)
+    
+    def stream_tracker(self):
+        """Push hand data to "tracker" subscribers while the tracker runs"""
+        if self.tracker_task and not self.tracker_task.done():
+            return
+        
+        async def stream():
+            while any("tracker" in client.topics for client in self.clients):
+                if self.tracker and self.tracker.running:
+                    self.broadcast("tracker", self.tracker.get_hand_data())
+                await asyncio.sleep(1.0 / TRACKER_RATE)
+        
+        self.tracker_task = asyncio.ensure_future(stream())
+    
+    async def tracker_info(self, client):
+        tracker = await asyncio.to_thread(self.get_tracker)
+        if tracker is None:
+            return {"available": False, "error": self.tracker_error}
+        return {
+            "available": True,
+            "running": tracker.running,
+            "enabled": tracker.enabled,
+            "gestures": tracker.gestures is not None,
+            "sensitivity": tracker.sensitivity,
+            "preview_fps": tracker.preview_fps,
+            "preview_enabled": tracker.preview_enabled
+        }
+    
+    def _tracker(self):
+        if self.tracker is None:
+            raise HachidError(f"Finger tracking unavailable: {self.tracker_error or 'not loaded'}")
+        return self.tracker
+    
+    async def tracker_start(self, client):
+        tracker = await asyncio.to_thread(self.get_tracker)
+        if tracker is None:
+            return False
+        started = await asyncio.to_thread(tracker.start)
+        self.broadcast("tracker", tracker.get_hand_data())
+        return started
+    
+    async def tracker_stop(self, client):
+        tracker = self._tracker()
+        await asyncio.to_thread(tracker.stop)
+        self.broadcast("tracker", tracker.get_hand_data())
+        return True
+    
+    async def tracker_calibrate(self, client, duration=5):
+        return await asyncio.to_thread(self._tracker().calibrate, duration)
+    
+    def tracker_hand_data(self, client):
+        return self._tracker().get_hand_data()
+    
+    def tracker_set_preview(self, client, enabled, width=None, max_fps=None):
+        self._tracker().set_preview(enabled, width, max_fps)
+        return True
+    
+    def tracker_preview(self, client, since=None):
+        """Latest preview frame as base64 PPM, or no data if it is still `since`"""
+        tracker = self._tracker()
+        sequence, data = tracker.get_preview()
+        return {
+            "sequence": sequence,
+            "data": data if data is not None and sequence != since else None,
+            "cost_ms": tracker.preview_cost * 1000.0
+        }
+    
+    def tracker_set_sensitivity(self, client, value):
+        tracker = self._tracker()
+        tracker.sensitivity = value
+        tracker.save_config()
+        return True
+    
+    # Sessions
+    
+    def session_info(self, name):
+        session = self.sessions[name]
+        process = session["process"]
+        return {
+            "name": name,
+            "pid": process.pid,
+            "argv": session["argv"],
+            "log": session["log"],
+            "started": session["started"],
+            "running": process.returncode is None,
+            "returncode": process.returncode
+        }
+    
+    async def session_start(self, client, name):
+        """Start one of SESSION_COMMANDS unless it is already running; it outlives the daemon"""
+        command = SESSION_COMMANDS.get(name)
+        if not command:
+            raise HachidError(f"Unknown session: {name}")
+        if name in self.sessions and self.sessions[name]["process"].returncode is None:
+            return self.session_info(name)
+        
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        log = LOG_DIR / SESSION_LOGS.get(name, f"{name}.log")
+        with open(log, "wb") as output:
+            process = await asyncio.create_subprocess_exec(
+                *command, stdin=subprocess.DEVNULL, stdout=output, stderr=subprocess.STDOUT,
+                env=dict(os.environ, **SESSION_ENV.get(name, {})), start_new_session=True
+            )
+        self.sessions[name] = {"process": process, "argv": list(command), "log": str(log), "started": time.time()}
+        asyncio.ensure_future(self.watch_session(name, process))
+        self.broadcast("session", self.session_info(name))
+        return self.session_info(name)
+    
+    async def watch_session(self, name, process):
+        await process.wait()
+        if self.sessions.get(name, {}).get("process") is process:
+            self.broadcast("session", self.session_info(name))
+    
+    async def session_stop(self, client, name, timeout=3.0):
+        session = self.sessions.get(name)
+        if session is None or session["process"].returncode is not None:
+            return False
+        process = session["process"]
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        return True
+    
+    def session_list(self, client):
+        return [self.session_info(name) for name in sorted(self.sessions)]
+    
+    # Server
+    
+    async def handle_client(self, reader, writer):
+        client = Connection(writer)
+        self.clients.add(client)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                asyncio.ensure_future(self.respond(client, line))
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.clients.discard(client)
+            for owner in client.windows:
+                self.status.set_visible(owner, None)
+            writer.close()
+    
+    async def respond(self, client, line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            client.send({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": "Parse error"}})
+            return
+        
+        request_id = request.get("id")
+        method = self.methods.get(request.get("method"))
+        params = request.get("params") or {}
+        if method is None:
+            error = {"code": METHOD_NOT_FOUND, "message": f"Unknown method: {request.get('method')}"}
+        else:
+            try:
+                result = method(client, **params)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                error = None
+            except TypeError as e:
+                error = {"code": INVALID_PARAMS, "message": str(e)}
+            except Exception as e:
+                error = {"code": SERVER_ERROR, "message": str(e) or type(e).__name__}
+        
+        # Requests without an id are notifications and get no reply
+        if request_id is None:
+            return
+        if error:
+            client.send({"jsonrpc": "2.0", "id": request_id, "error": error})
+        else:
+            client.send({"jsonrpc": "2.0", "id": request_id, "result": result})
+    
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        self.status = get_status_service()
+        self.status.subscribe(lambda snapshot: self.loop.call_soon_threadsafe(
+            self.broadcast, "status", snapshot._asdict()
+        ))
+        
+        if self.path.exists():
+            self.path.unlink()
+        # The socket must never exist with looser permissions, even briefly
+        umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(self.handle_client, path=str(self.path))
+        finally:
+            os.umask(umask)
+        os.chmod(self.path, 0o600)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            self.loop.add_signal_handler(signum, self.stopping.set)
+        print(f"hachid: listening on {self.path}")
+        if self.idle_exit:
+            asyncio.ensure_future(self.exit_when_idle())
+        
+        async with server:
+            await self.stopping.wait()
+            # Let each client read EOF instead of having its handler cancelled
+            for client in list(self.clients):
+                client.writer.close()
+            while self.clients:
+                await asyncio.sleep(0.01)
+        
+        # VR sessions keep running; only what lives in this process stops
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+        if self.tracker and self.tracker.running:
+            await asyncio.to_thread(self.tracker.stop)
+        self.status.stop()
+
+def run_daemon(path=SOCKET_PATH, idle_exit=IDLE_EXIT):
+    """Run the daemon in the foreground; returns False if one is already running"""
+    path = Path(path)
+    try:
+        private_dir(path.parent)
+    except (HachidError, OSError) as e:
+        print(f"hachid: {e}")
+        return False
+    # Next to the socket, so a daemon on another socket has its own lock
+    lock = open(path.with_suffix(".lock"), "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print(f"hachid: already running ({path})")
+        return False
+    
+    asyncio.run(Hachid(path, idle_exit).serve())
+    return True
+
+# Client
+
+class HachidClient:
+    """Connection to hachid; call() from any thread
+    
+    Notification callbacks run on a dispatch thread of their own, so they
+    may call() back into the daemon. If the daemon goes away the client
+    reconnects (starting it again when autostart is set), re-subscribes
+    and runs the on_connect callbacks.
+    """
+    
+    def __init__(self, path=SOCKET_PATH, autostart=True, timeout=5.0):
+        self.path = Path(path)
+        self.autostart = autostart
+        self.timeout = timeout
+        self.sock = None
+        self.connected = False
+        self.closed = False
+        self.handlers = {}
+        self.on_connect = []
+        self._next_id = 1
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._notifications = queue.Queue()
+    
+    def connect(self, wait=True):
+        """Connect, starting the daemon if needed; returns whether it worked
+        
+        With wait False a daemon that isn't running is started in the
+        background and this returns False at once instead of waiting for it.
+        """
+        sock = self._open()
+        if sock is None and self.autostart:
+            self.start_daemon()
+            deadline = time.monotonic() + (STARTUP_TIMEOUT if wait else 0.0)
+            while sock is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+                sock = self._open()
+        if sock is None:
+            return False
+        
+        self.sock = sock
+        self.connected = True
+        threading.Thread(target=self._reader, daemon=True).start()
+        threading.Thread(target=self._dispatcher, daemon=True).start()
+        return True
+    
+    def _open(self):
+        # A socket in a directory others can write to may not be the daemon's
+        if not is_private_dir(self.path.parent):
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(self.path))
+        except OSError:
+            sock.close()
+            return None
+        return sock
+    
+    def start_daemon(self):
+        DAEMON_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(DAEMON_LOG, "ab") as log:
+            subprocess.Popen(
+                [sys.executable, str(HACHID_SCRIPT), "--socket", str(self.path)],
+                stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                start_new_session=True
+            )
+    
+    def close(self):
+        self.closed = True
+        self.connected = False
+        if self.sock:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.sock.close()
+    
+    def _send(self, message):
+        if not self.connected:
+            raise HachidError("Not connected to hachid")
+        try:
+            with self._send_lock:
+                self.sock.sendall(encode(message))
+        except OSError as e:
+            raise HachidError(f"Lost connection to hachid: {e}")
+    
+    def call(self, method, timeout=None, **params):
+        """Call a daemon method and wait for its result"""
+        with self._lock:
+            request_id = self._next_id
+            self._next_id += 1
+            waiter = self._pending[request_id] = [threading.Event(), None]
+        try:
+            self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            if not waiter[0].wait(timeout or self.timeout):
+                raise HachidError(f"{method} timed out")
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+        
+        response = waiter[1]
+        if response is None:
+            raise HachidError("Lost connection to hachid")
+        if "error" in response:
+            raise HachidError(response["error"]["message"])
+        return response["result"]
+    
+    def notify(self, method, **params):
+        """Send a request without waiting (or asking) for a reply; never raises"""
+        try:
+            self._send({"jsonrpc": "2.0", "method": method, "params": params})
+        except HachidError:
+            pass
+    
+    def subscribe(self, topic, callback):
+        """Call callback(params) for every notification on topic"""
+        first = topic not in self.handlers
+        self.handlers.setdefault(topic, []).append(callback)
+        if first:
+            self.call("subscribe", topics=[topic])
+        return callback
+    
+    def _reader(self):
+        while not self.closed:
+            try:
+                for line in self.sock.makefile("rb"):
+                    message = json.loads(line)
+                    if "id" in message:
+                        with self._lock:
+                            waiter = self._pending.get(message["id"])
+                        if waiter:
+                            waiter[1] = message
+                            waiter[0].set()
+                    else:
+                        self._notifications.put((message.get("method"), message.get("params")))
+            except (OSError, ValueError):
+                pass
+            
+            # Disconnected: fail whatever is waiting, then try to get back
+            self.connected = False
+            with self._lock:
+                for waiter in self._pending.values():
+                    waiter[0].set()
+            if self.closed or not self._reconnect():
+                return
+    
+    def _reconnect(self):
+        delay = 0.5
+        while not self.closed:
+            time.sleep(delay)
+            sock = self._open()
+            if sock is None and self.autostart:
+                self.start_daemon()
+                time.sleep(STARTUP_TIMEOUT / 2)
+                sock = self._open()
+            if sock is not None:
+                self.sock = sock
+                self.connected = True
+                # Re-register on the dispatch thread; this one has to keep reading
+                self._notifications.put((None, None))
+                return True
+            delay = min(delay * 2, 10.0)
+        return False
+    
+    def _dispatcher(self):
+        while not self.closed:
+            topic, params = self._notifications.get()
+            if topic is None:
+                self._restore()
+                continue
+            for callback in list(self.handlers.get(topic, ())):
+                try:
+                    callback(params)
+                except Exception as e:
+                    print(f"hachid {topic} handler failed: {e}")
+    
+    def _restore(self):
+        try:
+            if self.handlers:
+                self.call("subscribe", topics=sorted(self.handlers))
+            for callback in list(self.on_connect):
+                callback()
+        except HachidError as e:
+            print(f"hachid: could not restore subscriptions: {e}")
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client(autostart=True, wait=True):
+    """The process-wide daemon connection, or None if hachid can't be reached
+    
+    With autostart False only a daemon that is already running is used.
+    Once connected, a daemon that goes away is started again either way,
+    since this process now depends on it.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            client = HachidClient(autostart=autostart)
+            if client.connect(wait):
+                client.autostart = True
+                _client = client
+    return _client
+
+def connect_status():
+    """(client, RemoteStatus) if hachid is already running, else (None, None)
+    
+    Never starts or waits for a daemon: a window that found none runs its
+    own probes, and a daemon started alongside would only duplicate them.
+    One that fails right after connecting counts as absent.
+    """
+    client = get_client(autostart=False)
+    if client is None:
+        return None, None
+    try:
+        return client, RemoteStatus(client)
+    except HachidError as e:
+        print(f"hachid: {e}; running the status probes in this process")
+        return None, None
+
+# Stand-ins for the in-process objects, backed by the daemon
+
+class RemoteUsbMonitor:
+    """UsbHotplugMonitor queries answered from the daemon's snapshot"""
+    
+    def __init__(self, status):
+        self.status = status
+    
+    def is_connected(self, vendor, product=None):
+        return usb_connected(self.status.snapshot, vendor, product)
+    
+    def connected_devices(self):
+        return [(d["name"], d["vendor"], d["product"]) for d in self.status.snapshot.usb.get("devices", [])]
+
+class RemoteProcessWatcher:
+    """ProcessWatcher queries answered from the daemon's snapshot; stats() asks the daemon"""
+    
+    def __init__(self, status):
+        self.status = status
+    
+    def is_running(self, name):
+        return process_running(self.status.snapshot, name)
+    
+    def stats(self):
+        try:
+            return self.status.client.call("status.process_stats")
+        except HachidError:
+            return {}
+
+class RemoteDisplayProbe:
+    """DisplayProbe queries answered from the daemon's snapshot"""
+    
+    def __init__(self, status):
+        self.status = status
+    
+    def hmd_connector(self):
+        return self.status.snapshot.display.get("hmd")
+
+class RemoteStatus:
+    """StatusService stand-in: the daemon runs the probes, this keeps its latest snapshot"""
+    
+    def __init__(self, client):
+        self.client = client
+        self.usb_monitor = RemoteUsbMonitor(self)
+        self.process_watcher = RemoteProcessWatcher(self)
+        self.display_probe = RemoteDisplayProbe(self) if client.call("daemon.info")["display_probe"] else None
+        self.snapshot = snapshot_from_dict(client.call("status.get"))
+        self.windows = {}
+        self.last_interaction = 0.0
+        self._subscribers = []
+        self._lock = threading.Lock()
+        client.subscribe("status", self._on_status)
+        client.on_connect.append(self._restore)
+    
+    def _on_status(self, data):
+        self.snapshot = snapshot = snapshot_from_dict(data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Status subscriber failed: {e}")
+    
+    def _restore(self):
+        # The daemon may have restarted: resend window state and catch up
+        for window, visible in self.windows.items():
+            self.client.notify("status.set_visible", window=window, visible=visible)
+        self._on_status(self.client.call("status.get"))
+    
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+    
+    def set_probe(self, name, probe):
+        """Probes run in the daemon, which has its own tracker probe"""
+    
+    def set_interval(self, name, seconds):
+        self.client.notify("status.set_interval", section=name, seconds=seconds)
+    
+    def poke(self, name):
+        self.client.notify("status.refresh", section=name)
+    
+    def refresh(self):
+        self.client.notify("status.refresh")
+    
+    def interact(self):
+        now = time.monotonic()
+        if now - self.last_interaction >= 1.0:
+            self.last_interaction = now
+            self.client.notify("status.interact")
+    
+    def set_visible(self, owner, visible):
+        window = str(id(owner))
+        if visible is None:
+            self.windows.pop(window, None)
+        else:
+            self.windows[window] = visible
+        self.client.notify("status.set_visible", window=window, visible=visible)
+    
+    @property
+    def paused(self):
+        return bool(self.windows) and not any(self.windows.values())
+    
+    def stats(self):
+        try:
+            return self.client.call("status.stats")
+        except HachidError:
+            return {"paused": self.paused, "cpu_time": 0.0, "probes": {}}
+
+class RemoteTracker:
+    """FingerTracker stand-in for the tracker running in the daemon"""
+    
+    def __init__(self, client, info):
+        self.client = client
+        self.sensitivity = info["sensitivity"]
+        self.preview_fps = info["preview_fps"]
+        self.preview_enabled = info["preview_enabled"]
+        self.preview_cost = 0.0
+        self.gestures = info["gestures"]
+        self.data = None
+        self._enabled = info["enabled"]
+        self._preview = (0, None)
+        self._gesture_queues = []
+        client.subscribe("tracker", self._on_hand_data)
+        if self.gestures:
+            client.subscribe("gesture", self._on_gesture)
+    
+    def _on_hand_data(self, data):
+        self.data = data
+        self._enabled = data["enabled"]
+    
+    def _on_gesture(self, event):
+        for events in list(self._gesture_queues):
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                pass
+    
+    @property
+    def enabled(self):
+        return self._enabled
+    
+    @property
+    def running(self):
+        return self._enabled
+    
+    @property
+    def fps(self):
+        return self.data["fps"] if self.data else 0
+    
+    def start(self):
+        started = self.client.call("tracker.start", timeout=30.0)
+        self._enabled = self._enabled or started
+        return started
+    
+    def stop(self):
+        self.client.call("tracker.stop", timeout=10.0)
+        self._enabled = False
+    
+    def calibrate(self, duration=5):
+        return self.client.call("tracker.calibrate", timeout=duration + 30.0, duration=duration)
+    
+    def get_hand_data(self):
+        if self.data is None or not self._enabled:
+            self.data = self.client.call("tracker.hand_data")
+        return self.data
+    
+    def set_preview(self, enabled, width=None, max_fps=None):
+        if max_fps:
+            self.preview_fps = max_fps
+        self.preview_enabled = enabled
+        self.client.notify("tracker.set_preview", enabled=enabled, width=width, max_fps=max_fps)
+    
+    def get_preview(self):
+        """Latest preview as (sequence, PPM bytes), fetched only when it changed"""
+        try:
+            result = self.client.call("tracker.preview", since=self._preview[0])
+        except HachidError:
+            return self._preview
+        self.preview_cost = result["cost_ms"] / 1000.0
+        if result["data"] is not None:
+            self._preview = (result["sequence"], base64.b64decode(result["data"]))
+        return self._preview
+    
+    def save_config(self):
+        self.client.call("tracker.set_sensitivity", value=self.sensitivity)
+    
+    def subscribe_gestures(self, maxsize=64):
+        if not self.gestures:
+            return None
+        events = queue.Queue(maxsize)
+        self._gesture_queues.append(events)
+        return events
+    
+    def unsubscribe_gestures(self, events):
+        if events in self._gesture_queues:
+            self._gesture_queues.remove(events)
+
+def remote_tracker(client):
+    """RemoteTracker for the daemon's finger tracker, or None if it has none"""
+    try:
+        info = client.call("tracker.info", timeout=30.0)
+    except HachidError as e:
+        print(f"hachid: {e}")
+        return None
+    if not info["available"]:
+        print(f"Finger tracking unavailable in hachid: {info['error']}")
+        return None
+    return RemoteTracker(client, info)
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="HACHI daemon and command-line client")
+    parser.add_argument("--socket", default=str(SOCKET_PATH), help="socket path")
+    parser.add_argument("--idle-exit", type=float, default=IDLE_EXIT, metavar="SECONDS",
+                        help=f"exit when unused this long (default {IDLE_EXIT:.0f}, 0: never)")
+    parser.add_argument("--stop", action="store_true", help="ask the running daemon to exit")
+    parser.add_argument("--call", metavar="METHOD", help="call a method; params as JSON after it")
+    parser.add_argument("--watch", metavar="TOPIC", nargs="+", help="print notifications on these topics")
+    parser.add_argument("params", nargs="?", default="{}", help="JSON object of params for --call")
+    args = parser.parse_args()
+    
+    if not (args.stop or args.call or args.watch):
+        sys.exit(0 if run_daemon(args.socket, args.idle_exit) else 1)
+    
+    client = HachidClient(args.socket, autostart=bool(args.call))
+    if not client.connect():
+        print(f"hachid is not running ({args.socket})")
+        sys.exit(1)
+    try:
+        if args.stop:
+            client.call("daemon.shutdown")
+        elif args.call:
+            print(json.dumps(client.call(args.call, timeout=60.0, **json.loads(args.params)), indent=2, default=_json_default))
+        else:
+            for topic in args.watch:
+                client.subscribe(topic, lambda params, topic=topic: print(f"{topic}: {json.dumps(params, default=_json_default)}", flush=True))
+            while True:
+                time.sleep(1)
+    except HachidError as e:
+        print(f"hachid: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+HACHI Log Index
+Persistent time and token index over the VR component logs for cross-log search
+"""
+
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+LOG_DIR = Path.home() / ".local" / "share" / "vr-logs"
+DRIVER_LOG = Path.home() / ".local" / "share" / "hachi" / "driver.log"
+INDEX_FILE = Path.home() / ".local" / "share" / "hachi" / "log_index.sqlite"
+
+# Logs are indexed in line-aligned blocks of about this size; a query only
+# reads the blocks whose time range or tokens match
+BLOCK_SIZE = 128 * 1024
+
+# Words worth indexing: 3-32 chars, not just digits/hex (addresses, counters)
+TOKEN_RE = re.compile(rb"[a-z_][a-z0-9_.\-]{2,31}")
+HEX_RE = re.compile(rb"[0-9a-f_.\-]+")
+# Dotted/dashed words are also indexed by their parts (monado-service -> monado, service)
+SUBWORD_RE = re.compile(rb"[.\-]+")
+
+# Bumped whenever tokenize() changes; older indexes are rebuilt
+INDEX_VERSION = 2
+
+MONTHS = {name: number for number, name in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
+
+# Timestamp formats at the start of a line, most specific first
+TIMESTAMP_FORMATS = (
+    # 2024-01-02 12:34:56.789 / 2024-01-02T12:34:56,789 (Monado, our tools)
+    ("iso", re.compile(rb"\[?(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d):(\d\d)(?:[.,](\d{1,6}))?")),
+    # Tue Jan 02 2024 12:34:56.789 - (SteamVR vrserver/vrcompositor)
+    ("steamvr", re.compile(rb"(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun) (\w{3}) +(\d\d?) (\d{4}) (\d\d):(\d\d):(\d\d)(?:\.(\d{1,6}))?")),
+    # [1704198896.789] Unix time
+    ("epoch", re.compile(rb"\[(1\d{9})(?:\.(\d{1,6}))?\]")),
+    # 12:34:56.789 (time only; the date comes from the previous timestamp)
+    ("clock", re.compile(rb"\[?(\d\d):(\d\d):(\d\d)(?:[.,](\d{1,6}))?")),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE,
+    inode INTEGER,
+    indexed INTEGER,
+    lines INTEGER,
+    last_time REAL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER,
+    start INTEGER,
+    end INTEGER,
+    first_line INTEGER,
+    first_time REAL,
+    last_time REAL
+);
+CREATE INDEX IF NOT EXISTS blocks_by_time ON blocks (file_id, last_time);
+CREATE TABLE IF NOT EXISTS tokens (
+    token BLOB,
+    block_id INTEGER,
+    PRIMARY KEY (token, block_id)
+) WITHOUT ROWID;
+"""
+
+def _fraction(digits):
+    return int(digits) / 10 ** len(digits) if digits else 0.0
+
+def parse_timestamp(line, previous=None):
+    """Unix time of a timestamp at the start of line (bytes), or None
+    
+    previous supplies the date for time-only formats; a clock that jumps
+    back by more than 12 hours is taken to have passed midnight.
+    """
+    head = line[:48].lstrip()
+    for name, pattern in TIMESTAMP_FORMATS:
+        match = pattern.match(head)
+        if not match:
+            continue
+        try:
+            if name == "iso":
+                year, month, day, hour, minute, second, frac = match.groups()
+                stamp = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+            elif name == "steamvr":
+                month, day, year, hour, minute, second, frac = match.groups()
+                stamp = datetime(int(year), MONTHS[month.decode()], int(day),
+                                 int(hour), int(minute), int(second))
+            elif name == "epoch":
+                seconds, frac = match.groups()
+                return int(seconds) + _fraction(frac)
+            else:
+                if previous is None:
+                    return None
+                hour, minute, second, frac = match.groups()
+                base = datetime.fromtimestamp(previous)
+                stamp = base.replace(hour=int(hour), minute=int(minute), second=int(second), microsecond=0)
+                if stamp.timestamp() < previous - 12 * 3600:
+                    stamp += timedelta(days=1)
+        except (ValueError, KeyError, OverflowError):
+            return None
+        return stamp.timestamp() + _fraction(frac)
+    return None
+
+def tokenize(data):
+    """Indexable words in data (bytes), lowercased, plus their dot/dash parts"""
+    tokens = set()
+    for token in TOKEN_RE.findall(data.lower()):
+        if HEX_RE.fullmatch(token):
+            continue
+        tokens.add(token)
+        if b"." in token or b"-" in token:
+            tokens.update(part for part in SUBWORD_RE.split(token)
+                          if TOKEN_RE.fullmatch(part) and not HEX_RE.fullmatch(part))
+    return tokens
+
+def default_logs():
+    return sorted(LOG_DIR.glob("*.log")) + [DRIVER_LOG]
+
+class LogIndex:
+    """On-disk index of several logs: block time ranges plus a token index
+    
+    update() indexes whatever the logs gained since the last call, so it can
+    be run after every session (or on a timer) cheaply. Lines without a
+    timestamp (stack traces, continuation lines) take the time of the line
+    before them. Block time ranges come from the first and last stamped line
+    of each block; queries then parse only the blocks they touch.
+    """
+    
+    def __init__(self, path=INDEX_FILE, logs=None):
+        self.path = Path(path)
+        self.logs = [Path(p) for p in logs] if logs else default_logs()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            # Indexed with another tokenizer: start over
+            self.db.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS blocks; "
+                                  "DROP TABLE IF EXISTS tokens;")
+            self.db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        self.db.executescript(SCHEMA)
+    
+    def close(self):
+        self.db.close()
+    
+    # ---- indexing ----
+    
+    def update(self):
+        """Index new data in every log; {log name: bytes indexed}"""
+        indexed = {}
+        for log in self.logs:
+            indexed[log.name] = self.update_file(log)
+        return indexed
+    
+    def _file_row(self, log):
+        row = self.db.execute(
+            "SELECT id, inode, indexed, lines, last_time FROM files WHERE path = ?", (str(log),)
+        ).fetchone()
+        if row:
+            return row
+        cursor = self.db.execute(
+            "INSERT INTO files (path, inode, indexed, lines, last_time) VALUES (?, 0, 0, 0, NULL)", (str(log),)
+        )
+        return cursor.lastrowid, 0, 0, 0, None
+    
+    def _forget(self, file_id):
+        self.db.execute(
+            "DELETE FROM tokens WHERE block_id IN (SELECT id FROM blocks WHERE file_id = ?)", (file_id,)
+        )
+        self.db.execute("DELETE FROM blocks WHERE file_id = ?", (file_id,))
+    
+    def update_file(self, log):
+        """Index what log gained since last time; returns bytes indexed"""
+        try:
+            stat = os.stat(log)
+        except OSError:
+            return 0
+        
+        file_id, inode, offset, lines, last_time = self._file_row(log)
+        if inode != stat.st_ino or stat.st_size < offset:
+            # New or rotated/truncated file: start over
+            self._forget(file_id)
+            inode, offset, lines, last_time = stat.st_ino, 0, 0, None
+        
+        start_offset = offset
+        with open(log, "rb") as f:
+            f.seek(offset)
+            while offset < stat.st_size:
+                data = f.read(min(BLOCK_SIZE, stat.st_size - offset))
+                # Only whole lines; a partial last line waits for the next update
+                end = data.rfind(b"\n") + 1
+                if end == 0:
+                    if len(data) < BLOCK_SIZE:
+                        break
+                    end = len(data)
+                data = data[:end]
+                f.seek(offset + end)
+                
+                first_time, last_time_in_block = self._block_times(data, last_time)
+                cursor = self.db.execute(
+                    "INSERT INTO blocks (file_id, start, end, first_line, first_time, last_time) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (file_id, offset, offset + end, lines, first_time, last_time_in_block)
+                )
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO tokens (token, block_id) VALUES (?, ?)",
+                    ((token, cursor.lastrowid) for token in tokenize(data))
+                )
+                offset += end
+                lines += data.count(b"\n")
+                last_time = last_time_in_block
+        
+        self.db.execute(
+            "UPDATE files SET inode = ?, indexed = ?, lines = ?, last_time = ? WHERE id = ?",
+            (inode, offset, lines, last_time, file_id)
+        )
+        self.db.commit()
+        return offset - start_offset
+    
+    def _block_times(self, data, carry):
+        """(first, last) time in a block from its first and last stamped lines"""
+        lines = data.split(b"\n")
+        first = last = None
+        for number, line in enumerate(lines):
+            first = parse_timestamp(line, carry)
+            if first is not None:
+                break
+        if first is None:
+            # No timestamps: the whole block has the previous line's time
+            return carry, carry
+        if number and carry is not None:
+            # Unstamped lines before the first stamp still have the old time
+            first = min(first, carry)
+        for line in reversed(lines):
+            last = parse_timestamp(line, first)
+            if last is not None:
+                break
+        return first, last
+    
+    # ---- queries ----
+    
+    def _log_ids(self, logs=None):
+        rows = self.db.execute("SELECT id, path FROM files").fetchall()
+        names = {Path(p).name for p in logs} if logs else None
+        return {file_id: Path(path) for file_id, path in rows if names is None or Path(path).name in names}
+    
+    def _read_block(self, path, start, end, first_line, carry):
+        """[(line number, time, text)] for one block, times carried forward"""
+        try:
+            with open(path, "rb") as f:
+                f.seek(start)
+                data = f.read(end - start)
+        except OSError:
+            return []
+        result = []
+        for number, line in enumerate(data.split(b"\n")[:-1], first_line):
+            stamp = parse_timestamp(line, carry)
+            if stamp is not None:
+                carry = stamp
+            result.append((number, carry, line.decode("utf-8", errors="replace").rstrip("\r")))
+        return result
+    
+    def _carry_before(self, file_id, start):
+        # Time in effect at the start of a block = last time of the block before
+        row = self.db.execute(
+            "SELECT last_time FROM blocks WHERE file_id = ? AND end <= ? ORDER BY end DESC LIMIT 1",
+            (file_id, start)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def around(self, timestamp, window=0.5, logs=None):
+        """Lines from all logs within +-window seconds of timestamp, in time order
+        
+        Returns dicts with log, line, time and text.
+        """
+        low, high = timestamp - window, timestamp + window
+        found = []
+        for file_id, path in self._log_ids(logs).items():
+            blocks = self.db.execute(
+                "SELECT start, end, first_line, first_time FROM blocks "
+                "WHERE file_id = ? AND last_time >= ? AND first_time <= ? ORDER BY start",
+                (file_id, low, high)
+            ).fetchall()
+            for start, end, first_line, first_time in blocks:
+                carry = self._carry_before(file_id, start)
+                for number, stamp, text in self._read_block(path, start, end, first_line, carry):
+                    if stamp is not None and low <= stamp <= high:
+                        found.append({"log": path.name, "line": number, "time": stamp, "text": text})
+        found.sort(key=lambda entry: entry["time"])
+        return found
+    
+    def search(self, query, logs=None, limit=500):
+        """Lines containing every word of query, across logs, in time order
+        
+        Indexed words (see TOKEN_RE) match whole words or their dot/dash
+        separated parts, so "monado" finds "monado-service". The index narrows
+        the search to blocks that have all of them. Numbers and short words
+        are not indexed and only filter the lines in those blocks.
+        """
+        words = query.lower().split()
+        if not words:
+            return []
+        
+        tokens = sorted(tokenize(query.encode()))
+        log_ids = self._log_ids(logs)
+        sql = "SELECT id, file_id, start, end, first_line FROM blocks"
+        params = []
+        if tokens:
+            sql += " WHERE id IN (" + " INTERSECT ".join(
+                "SELECT block_id FROM tokens WHERE token = ?" for _ in tokens) + ")"
+            params = tokens
+        sql += " ORDER BY file_id, start"
+        
+        found = []
+        for block_id, file_id, start, end, first_line in self.db.execute(sql, params).fetchall():
+            if file_id not in log_ids:
+                continue
+            carry = self._carry_before(file_id, start)
+            for number, stamp, text in self._read_block(log_ids[file_id], start, end, first_line, carry):
+                lowered = text.lower()
+                if not all(word in lowered for word in words):
+                    continue
+                if tokens and not tokenize(lowered.encode()).issuperset(tokens):
+                    continue
+                found.append({"log": log_ids[file_id].name, "line": number, "time": stamp, "text": text})
+        found.sort(key=lambda entry: (entry["time"] is None, entry["time"] or 0))
+        return found[:limit]
+    
+    def stats(self):
+        """{log name: {"bytes", "lines", "blocks"}} as indexed"""
+        rows = self.db.execute(
+            "SELECT f.path, f.indexed, f.lines, COUNT(b.id) FROM files f "
+            "LEFT JOIN blocks b ON b.file_id = f.id GROUP BY f.id"
+        ).fetchall()
+        return {Path(path).name: {"bytes": size, "lines": lines, "blocks": blocks}
+                for path, size, lines, blocks in rows}
+
+def format_entry(entry):
+    stamp = "--:--:--.---"
+    if entry["time"] is not None:
+        stamp = datetime.fromtimestamp(entry["time"]).strftime("%H:%M:%S.%f")[:-3]
+    return f"{stamp} {entry['log']:>12}:{entry['line'] + 1:<7} {entry['text']}"
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Index and search the VR logs")
+    parser.add_argument("--index", default=str(INDEX_FILE), help="index database")
+    parser.add_argument("--log", action="append", help="log file (repeatable; default: all VR logs)")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("update", help="index new log data")
+    around = commands.add_parser("around", help="lines from all logs near a time")
+    around.add_argument("time", help="'2024-01-02 12:34:56.5', 'HH:MM:SS.mmm' (today) or Unix time")
+    around.add_argument("--window", type=int, default=500, help="milliseconds either side (default 500)")
+    search = commands.add_parser("search", help="lines containing all words")
+    search.add_argument("words", nargs="+")
+    args = parser.parse_args()
+    
+    index = LogIndex(args.index, args.log)
+    started = time.perf_counter()
+    updated = index.update()
+    if args.command in (None, "update"):
+        print(f"Indexed {sum(updated.values()) / 1048576:.1f} MB new log data "
+              f"in {time.perf_counter() - started:.2f} s")
+        for name, info in index.stats().items():
+            print(f"  {name:>16}: {info['lines']:>9,} lines {info['bytes'] / 1048576:8.1f} MB {info['blocks']:>6} blocks")
+        return
+    
+    if args.command == "around":
+        try:
+            timestamp = float(args.time)
+        except ValueError:
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+            timestamp = parse_timestamp(args.time.encode(), today)
+            if timestamp is None:
+                parser.error(f"can't read time '{args.time}'")
+        entries = index.around(timestamp, args.window / 1000.0)
+    else:
+        entries = index.search(" ".join(args.words))
+    
+    for entry in entries:
+        print(format_entry(entry))
+    index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+HACHI Probe Scheduler
+Per-probe polling intervals that back off while nothing changes and pause while no window is showing
+"""
+
+import resource
+import threading
+import time
+
+# Unchanged runs before a probe starts backing off, and the growth per run after that
+STABLE_RUNS = 3
+BACKOFF_FACTOR = 2.0
+
+# Input speeds probes back up at most this often (seconds)
+INTERACTION_INTERVAL = 1.0
+
+def child_cpu_time():
+    """CPU seconds used by reaped child processes (lsusb, pgrep, ...)"""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+class AdaptiveInterval:
+    """Polling interval for one probe
+    
+    Stays at base while results change; after STABLE_RUNS unchanged runs
+    it grows by BACKOFF_FACTOR per run up to maximum.
+    """
+    
+    def __init__(self, base, maximum=None, stable_runs=STABLE_RUNS, factor=BACKOFF_FACTOR):
+        self.base = base
+        self.maximum = max(base, maximum or base)
+        self.stable_runs = stable_runs
+        self.factor = factor
+        self.interval = base
+        self.unchanged = 0
+    
+    def record(self, changed):
+        """Note whether a run changed anything; returns the seconds to wait next"""
+        if changed:
+            self.reset()
+        else:
+            self.unchanged += 1
+            if self.unchanged >= self.stable_runs:
+                self.interval = min(self.interval * self.factor, self.maximum)
+        return self.interval
+    
+    def reset(self):
+        self.interval = self.base
+        self.unchanged = 0
+    
+    def set_base(self, base):
+        self.maximum = max(base, self.maximum * base / self.base)
+        self.base = base
+        self.reset()
+
+class Visibility:
+    """Which windows are showing; paused once every one of them is hidden"""
+    
+    def __init__(self):
+        self.windows = {}
+    
+    def set(self, owner, visible):
+        """visible None forgets the window (it was destroyed)"""
+        if visible is None:
+            self.windows.pop(owner, None)
+        else:
+            self.windows[owner] = visible
+    
+    @property
+    def paused(self):
+        return bool(self.windows) and not any(self.windows.values())
+
+class ProbeScheduler:
+    """Probe functions run on one thread, each on its own adaptive interval
+    
+    A probe's return value (or state(), if given) is compared with the
+    previous run; while it stays the same the probe backs off towards its
+    maximum interval. poke() runs probes now, interact() drops them back to
+    their base intervals, and set_visible() pauses everything while all the
+    windows using the scheduler are hidden.
+    """
+    
+    def __init__(self):
+        self.probes = {}
+        self.visibility = Visibility()
+        self.cpu_time = 0.0
+        self.running = False
+        self.thread = None
+        self.last_interaction = 0.0
+        self._wakeup = threading.Condition()
+    
+    def add(self, name, function, interval, maximum=None, state=None):
+        with self._wakeup:
+            self.probes[name] = {
+                "function": function,
+                "state": state,
+                "interval": AdaptiveInterval(interval, maximum),
+                "due": 0.0,
+                "ran": 0.0,
+                "last": None,
+                "runs": 0,
+                "changes": 0,
+                "cpu_time": 0.0
+            }
+            self._wakeup.notify()
+    
+    def poke(self, name=None):
+        """Run one probe (None = all) now instead of at its next interval (any thread)"""
+        with self._wakeup:
+            for probe_name, probe in self.probes.items():
+                if name is None or probe_name == name:
+                    probe["due"] = 0.0
+            self._wakeup.notify()
+    
+    def interact(self):
+        """The user did something: back to base intervals (any thread)"""
+        now = time.monotonic()
+        if now - self.last_interaction < INTERACTION_INTERVAL:
+            return
+        self.last_interaction = now
+        with self._wakeup:
+            for probe in self.probes.values():
+                probe["interval"].reset()
+                # Results older than the base interval are refreshed right away
+                probe["due"] = min(probe["due"], probe["ran"] + probe["interval"].base)
+            self._wakeup.notify()
+    
+    def set_visible(self, owner, visible):
+        """A window was mapped (True), iconified (False) or destroyed (None)"""
+        with self._wakeup:
+            was_paused = self.visibility.paused
+            self.visibility.set(owner, visible)
+            if was_paused and not self.visibility.paused:
+                # Everything may have changed while hidden
+                for probe in self.probes.values():
+                    probe["interval"].reset()
+                    probe["due"] = 0.0
+            self._wakeup.notify()
+    
+    @property
+    def paused(self):
+        return self.visibility.paused
+    
+    def stats(self):
+        """Runs, changes, current interval and CPU seconds per probe"""
+        with self._wakeup:
+            return {
+                "paused": self.visibility.paused,
+                "cpu_time": self.cpu_time,
+                "probes": {
+                    name: {
+                        "runs": probe["runs"],
+                        "changes": probe["changes"],
+                        "interval": probe["interval"].interval,
+                        "cpu_time": probe["cpu_time"]
+                    }
+                    for name, probe in self.probes.items()
+                }
+            }
+    
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        with self._wakeup:
+            self.running = False
+            self._wakeup.notify()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+    
+    def _run(self):
+        while True:
+            with self._wakeup:
+                if not self.running:
+                    return
+                if self.visibility.paused or not self.probes:
+                    self._wakeup.wait()
+                    continue
+                name, probe = min(self.probes.items(), key=lambda item: item[1]["due"])
+                delay = probe["due"] - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+                # A poke during the run sets due back to 0 and is kept
+                probe["due"] = float("inf")
+            self._run_probe(name, probe)
+    
+    def _run_probe(self, name, probe):
+        cost = time.thread_time()
+        children = child_cpu_time()
+        try:
+            result = probe["function"]()
+            value = probe["state"]() if probe["state"] else result
+        except Exception as e:
+            print(f"Probe {name} failed: {e}")
+            value = probe["last"]
+        spent = time.thread_time() - cost + child_cpu_time() - children
+        
+        with self._wakeup:
+            changed = probe["runs"] > 0 and value != probe["last"]
+            probe["last"] = value
+            probe["runs"] += 1
+            probe["changes"] += changed
+            probe["cpu_time"] += spent
+            self.cpu_time += spent
+            probe["ran"] = time.monotonic()
+            probe["due"] = min(probe["due"], probe["ran"] + probe["interval"].record(changed))
+
+def watch_window(window, target):
+    """Pause target while window is iconified and speed it up on input
+    
+    target is anything with set_visible(owner, visible) and interact(): a
+    ProbeScheduler or the shared StatusService.
+    """
+    def on_map(event):
+        if event.widget is window:
+            target.set_visible(window, True)
+    
+    def on_unmap(event):
+        if event.widget is window:
+            target.set_visible(window, False)
+    
+    def on_destroy(event):
+        if event.widget is window:
+            target.set_visible(window, None)
+    
+    window.bind("<Map>", on_map, "+")
+    window.bind("<Unmap>", on_unmap, "+")
+    window.bind("<Destroy>", on_destroy, "+")
+    window.bind_all("<ButtonPress>", lambda event: target.interact(), "+")
+    window.bind_all("<KeyPress>", lambda event: target.interact(), "+")
+    target.set_visible(window, True)
+
+# Show a probe backing off if run directly
+if __name__ == "__main__":
+    import subprocess
+    
+    scheduler = ProbeScheduler()
+    scheduler.add("lsusb", lambda: subprocess.run(["lsusb"], capture_output=True, text=True).stdout, 1.0, 30.0)
+    scheduler.start()
+    try:
+        while True:
+            time.sleep(5)
+            stats = scheduler.stats()
+            probe = stats["probes"]["lsusb"]
+            print(f"{probe['runs']} runs, {probe['changes']} changes, next in {probe['interval']:.0f} s, "
+                  f"{stats['cpu_time'] * 1000:.1f} ms CPU")
+    except KeyboardInterrupt:
+        scheduler.stop()
@@ -14,6 +14,45 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+# Time to first paint is measured from here
+STARTUP_TIME = time.perf_counter()
+
+# PCI sysfs GPU detection is optional - falls back to lspci
+try:
+    from hardware_profile import cached_profile, load_profile_async, retheme
+except ImportError:
+    load_profile_async = None
+
+# USB hotplug events are optional - falls back to polling lsusb
+try:
+    from hotplug import UsbHotplugMonitor
+except ImportError:
+    UsbHotplugMonitor = None
+
+# /proc process watching is optional - falls back to pgrep
+try:
+    from process_watcher import ProcessWatcher
+except ImportError:
+    ProcessWatcher = None
+
+# Shared status probes are optional - falls back to a local monitor thread
+try:
+    from hachi_status import get_status_service, usb_connected, process_running
+except ImportError:
+    get_status_service = None
+
+# Adaptive probe intervals are optional - falls back to checking every 2 s
+try:
+    from probe_scheduler import ProbeScheduler, watch_window
+except ImportError:
+    ProbeScheduler = None
+
+# The hachid daemon is optional - falls back to running probes and processes in this window
+try:
+    from hachid import connect_status
+except ImportError:
+    connect_status = None
+
 class CosmosControlCenter:
     def __init__(self, root):
         self.root = root
@@ -50,9 +89,26 @@ class CosmosControlCenter:
         
         # Show dashboard by default
         self.show_dashboard()
+        
+        # Finish GPU detection in the background and note time to first paint
+        if self.gpu_detection:
+            self.root.after(10, self.finish_gpu_detection)
+        self._paint_binding = self.root.bind('<Expose>', self.report_first_paint, '+')
     
     def detect_gpu(self):
         """Detect GPU vendor for color theme"""
+        self.gpu_detection = None
+        if load_profile_async:
+            # Cached for this boot it's instant; otherwise paint with the
+            # default theme and switch accents when the PCI scan is done
+            profile = cached_profile()
+            if profile:
+                self.gpu_vendor = profile['gpu_vendor']
+            else:
+                self.gpu_vendor = 'unknown'
+                self.gpu_detection = load_profile_async()
+            return
+        
         gpu_file = self.config_dir / "gpu_vendor.txt"
         
         if gpu_file.exists():
@@ -75,6 +131,31 @@ class CosmosControlCenter:
             with open(gpu_file, 'w') as f:
                 f.write(self.gpu_vendor)
     
+    def finish_gpu_detection(self):
+        """Move the already drawn window to the detected GPU's accents"""
+        if not self.gpu_detection.done():
+            self.root.after(10, self.finish_gpu_detection)
+            return
+        try:
+            vendor = self.gpu_detection.result()['gpu_vendor']
+        except Exception:
+            vendor = 'unknown'
+        self.gpu_detection = None
+        if vendor == self.gpu_vendor:
+            return
+        
+        old_colors, old_name = dict(self.colors), self.gpu_name
+        self.gpu_vendor = vendor
+        self.setup_theme()
+        changed = {old_colors[key]: value for key, value in self.colors.items() if old_colors.get(key) != value}
+        retheme(self.root, changed, {old_name: self.gpu_name})
+    
+    def report_first_paint(self, event=None):
+        self.root.unbind('<Expose>', self._paint_binding)
+        self.first_paint_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        if os.environ.get('HACHI_STARTUP_TIMING'):
+            print(f"Time to first paint: {self.first_paint_ms:.0f} ms")
+    
     def setup_theme(self):
         """Setup color theme based on GPU"""
         # Triple black base colors
@@ -703,6 +784,55 @@ class CosmosControlCenter:
     
     def start_monitoring(self):
         """Start background monitoring thread"""
+        # One status service runs the probes for every window in the process
+        self.status_service = None
+        self.probe_scheduler = None
+        
+        # With hachid running the probes and VR processes live there and are
+        # shared with every other window; this one only draws what it pushes.
+        # Without one this window runs its own probes; no daemon is started
+        # that it would not use
+        self.daemon = None
+        if connect_status and get_status_service:
+            self.daemon, self.status_service = connect_status()
+        if self.status_service is None and get_status_service:
+            self.status_service = get_status_service()
+        
+        if self.status_service:
+            self.usb_monitor = self.status_service.usb_monitor
+            self.process_watcher = self.status_service.process_watcher
+            self.status_service.subscribe(lambda snapshot: self.check_device_status())
+            if ProbeScheduler:
+                watch_window(self.root, self.status_service)
+            self.check_device_status()
+            return
+        
+        # Headset plug/unplug is pushed by the kernel; no lsusb polling needed
+        self.usb_monitor = None
+        if UsbHotplugMonitor:
+            self.usb_monitor = UsbHotplugMonitor()
+            self.usb_monitor.subscribe(lambda event: self.check_device_status())
+            self.usb_monitor.start()
+        
+        # Monado exits are reported through a pidfd as they happen
+        self.process_watcher = None
+        if ProcessWatcher:
+            self.process_watcher = ProcessWatcher()
+            self.process_watcher.subscribe(lambda event: self.check_device_status())
+            self.process_watcher.start()
+        
+        # The check backs off while nothing changes and stops while iconified
+        if ProbeScheduler:
+            self.probe_scheduler = ProbeScheduler()
+            self.probe_scheduler.add(
+                'device', self.check_device_status, 2.0,
+                30.0 if self.usb_monitor and self.process_watcher else 10.0,
+                state=lambda: (self.device_connected, self.monado_running)
+            )
+            self.probe_scheduler.start()
+            watch_window(self.root, self.probe_scheduler)
+            return
+        
         def monitor():
             while True:
                 self.check_device_status()
@@ -714,8 +844,13 @@ class CosmosControlCenter:
     def check_device_status(self):
         """Check if Cosmos is connected"""
         try:
-            result = subprocess.run(['lsusb'], capture_output=True, text=True)
-            self.device_connected = '0bb4:0313' in result.stdout
+            if self.status_service:
+                self.device_connected = usb_connected(self.status_service.snapshot, 0x0bb4, 0x0313)
+            elif self.usb_monitor:
+                self.device_connected = self.usb_monitor.is_connected(0x0bb4, 0x0313)
+            else:
+                result = subprocess.run(['lsusb'], capture_output=True, text=True)
+                self.device_connected = '0bb4:0313' in result.stdout
             
             # Update status label
             if self.device_connected:
@@ -730,9 +865,14 @@ class CosmosControlCenter:
                 )
             
             # Check Monado
-            result = subprocess.run(['pgrep', '-x', 'monado-service'],
-                                  capture_output=True)
-            self.monado_running = result.returncode == 0
+            if self.status_service:
+                self.monado_running = process_running(self.status_service.snapshot, 'monado-service')
+            elif self.process_watcher:
+                self.monado_running = self.process_watcher.is_running('monado-service')
+            else:
+                result = subprocess.run(['pgrep', '-x', 'monado-service'],
+                                      capture_output=True)
+                self.monado_running = result.returncode == 0
             
         except:
             pass
@@ -753,6 +893,15 @@ class CosmosControlCenter:
             info.append(f"  Monado: {'Running' if self.monado_running else 'Stopped'}")
             info.append("")
             
+            # CPU and memory of the VR processes
+            if self.process_watcher:
+                info.append("VR Processes:")
+                for name, processes in self.process_watcher.stats().items():
+                    for proc in processes:
+                        info.append(f"  {name} ({proc['pid']}): {proc['cpu_percent']:.1f}% CPU, "
+                                    f"{proc['rss_mb']:.0f} MB")
+                info.append("")
+            
             # System info
             result = subprocess.run(['uname', '-r'], capture_output=True, text=True)
             info.append(f"Kernel: {result.stdout.strip()}")
@@ -771,7 +920,11 @@ class CosmosControlCenter:
     
     def _launch_vr_thread(self):
         try:
-            subprocess.Popen(['bash', '-c', 'vr_manager.sh'])
+            if self.daemon:
+                # Started by the daemon, so the session outlives this window
+                self.daemon.call('session.start', name='vr_manager')
+            else:
+                subprocess.Popen(['bash', '-c', 'vr_manager.sh'])
             self.status_bar_label.config(text="VR Manager launched")
         except:
             self.status_bar_label.config(text="Failed to launch VR")
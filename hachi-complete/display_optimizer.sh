@@ -260,56 +260,25 @@ create_performance_monitor() {
     
     mkdir -p "$HOME/.local/bin"
     
+    # perf_monitor.py reads /proc and sysfs (NVML on NVIDIA) directly at 10 Hz
+    # instead of forking nvidia-smi/radeontop/top/free every cycle
+    local script_dir
+    script_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+    if [ -f "$script_dir/perf_monitor.py" ]; then
+        cp "$script_dir/perf_monitor.py" "$HOME/.local/bin/"
+        chmod +x "$HOME/.local/bin/perf_monitor.py"
+    fi
+    if [ ! -f "$HOME/.local/bin/perf_monitor.py" ]; then
+        echo -e "${RED}✗ perf_monitor.py not found${NC}"
+        return
+    fi
+    
     cat > "$HOME/.local/bin/vr-perf-monitor.sh" << 'EOF'
 #!/bin/bash
 
 # VR Performance Monitor
-
-echo "=== VR Performance Monitor ==="
-echo "Press Ctrl+C to stop"
-echo ""
-
-while true; do
-    clear
-    echo "=== System Performance ($(date +%H:%M:%S)) ==="
-    echo ""
-    
-    # GPU info
-    if command -v nvidia-smi &> /dev/null; then
-        echo "--- NVIDIA GPU ---"
-        nvidia-smi --query-gpu=name,temperature.gpu,utilization.gpu,utilization.memory,memory.used,memory.total,clocks.gr,clocks.mem --format=csv,noheader,nounits | while IFS=',' read name temp gpu_util mem_util mem_used mem_total clock_gpu clock_mem; do
-            echo "GPU: $name"
-            echo "Temperature: ${temp}°C"
-            echo "GPU Load: ${gpu_util}%"
-            echo "VRAM Load: ${mem_util}%"
-            echo "VRAM: ${mem_used}MB / ${mem_total}MB"
-            echo "GPU Clock: ${clock_gpu}MHz"
-            echo "Memory Clock: ${clock_mem}MHz"
-        done
-    elif command -v radeontop &> /dev/null; then
-        echo "--- AMD GPU ---"
-        radeontop -d - -l 1 | head -1
-    fi
-    
-    echo ""
-    echo "--- CPU ---"
-    top -bn1 | grep "Cpu(s)" | sed "s/.*, *\([0-9.]*\)%* id.*/\1/" | awk '{print "CPU Usage: " 100 - $1"%"}'
-    
-    echo ""
-    echo "--- RAM ---"
-    free -h | awk 'NR==2{printf "Memory: %s / %s (%.2f%%)\n", $3,$2,$3*100/$2 }'
-    
-    echo ""
-    echo "--- Frame Timing ---"
-    if pgrep -x vrcompositor > /dev/null; then
-        echo "SteamVR Compositor: Running ✓"
-        # Could add more detailed frame timing if available
-    else
-        echo "SteamVR Compositor: Not running"
-    fi
-    
-    sleep 2
-done
+# Terminal view when run from a terminal, a window otherwise (--tk forces it)
+exec python3 "$HOME/.local/bin/perf_monitor.py" "$@"
 EOF
     
     chmod +x "$HOME/.local/bin/vr-perf-monitor.sh"
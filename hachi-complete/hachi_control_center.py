@@ -14,6 +14,21 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+# Time to first paint is measured from here
+STARTUP_TIME = time.perf_counter()
+
+# PCI sysfs GPU detection is optional - falls back to lspci
+try:
+    from hardware_profile import cached_profile, load_profile_async, retheme
+except ImportError:
+    load_profile_async = None
+
+# Adaptive probe intervals are optional - falls back to checking every 2 s
+try:
+    from probe_scheduler import ProbeScheduler, watch_window
+except ImportError:
+    ProbeScheduler = None
+
 class HachiControlCenter:
     def __init__(self, root):
         self.root = root
@@ -56,6 +71,11 @@ class HachiControlCenter:
         
         # Show dashboard by default
         self.show_dashboard()
+        
+        # Finish GPU detection in the background and note time to first paint
+        if self.gpu_detection:
+            self.root.after(10, self.finish_gpu_detection)
+        self._paint_binding = self.root.bind('<Expose>', self.report_first_paint, '+')
     
     def load_config(self):
         """Load configuration"""
@@ -79,6 +99,18 @@ class HachiControlCenter:
     
     def detect_gpu(self):
         """Detect GPU vendor for color theme"""
+        self.gpu_detection = None
+        if load_profile_async:
+            # Cached for this boot it's instant; otherwise paint with the
+            # default theme and switch accents when the PCI scan is done
+            profile = cached_profile()
+            if profile:
+                self.gpu_vendor = profile['gpu_vendor']
+            else:
+                self.gpu_vendor = 'unknown'
+                self.gpu_detection = load_profile_async()
+            return
+        
         gpu_file = self.config_dir / "gpu_vendor.txt"
         
         if gpu_file.exists():
@@ -99,6 +131,31 @@ class HachiControlCenter:
             with open(gpu_file, 'w') as f:
                 f.write(self.gpu_vendor)
     
+    def finish_gpu_detection(self):
+        """Move the already drawn window to the detected GPU's accents"""
+        if not self.gpu_detection.done():
+            self.root.after(10, self.finish_gpu_detection)
+            return
+        try:
+            vendor = self.gpu_detection.result()['gpu_vendor']
+        except Exception:
+            vendor = 'unknown'
+        self.gpu_detection = None
+        if vendor == self.gpu_vendor:
+            return
+        
+        old_colors, old_name = dict(self.colors), self.gpu_name
+        self.gpu_vendor = vendor
+        self.setup_theme()
+        changed = {old_colors[key]: value for key, value in self.colors.items() if old_colors.get(key) != value}
+        retheme(self.root, changed, {old_name: self.gpu_name})
+    
+    def report_first_paint(self, event=None):
+        self.root.unbind('<Expose>', self._paint_binding)
+        self.first_paint_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        if os.environ.get('HACHI_STARTUP_TIMING'):
+            print(f"Time to first paint: {self.first_paint_ms:.0f} ms")
+    
     def setup_theme(self):
         """Setup color theme based on GPU"""
         # Triple black base
@@ -732,6 +789,18 @@ Notes:
     
     def start_monitoring(self):
         """Start background monitoring"""
+        # The lsusb check backs off while nothing changes and stops while iconified
+        self.probe_scheduler = None
+        if ProbeScheduler:
+            self.probe_scheduler = ProbeScheduler()
+            self.probe_scheduler.add(
+                'device', self.check_device_status, 2.0, 10.0,
+                state=lambda: (self.device_connected, self.finger_tracking_active)
+            )
+            self.probe_scheduler.start()
+            watch_window(self.root, self.probe_scheduler)
+            return
+        
         def monitor():
             while True:
                 self.check_device_status()
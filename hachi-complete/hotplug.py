@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+HACHI USB Hotplug Monitor
+Tracks VR USB devices from kernel uevents instead of polling lsusb
+"""
+
+import os
+import queue
+import socket
+import threading
+import time
+from pathlib import Path
+
+SYSFS_USB_DEVICES = Path("/sys/bus/usb/devices")
+
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_KERNEL_GROUP = 1  # Raw kernel broadcasts (udev rebroadcasts on group 2)
+
+# Devices reported by default; a product of None matches the whole vendor
+VR_USB_DEVICES = {
+    (0x0bb4, 0x0313): "HTC Vive Cosmos",
+    (0x0bb4, 0x0abb): "HTC Vive Cosmos",
+    (0x0bb4, 0x0178): "HTC Vive Cosmos Camera",
+    (0x0bb4, 0x030e): "HTC Vive Cosmos Hub",
+    (0x28de, None): "Valve device",
+}
+
+def parse_uevent(data):
+    """Turn a raw uevent datagram into a property dict, None if not a kernel event"""
+    parts = data.split(b"\0")
+    
+    # Kernel messages start with "action@devpath"; udev's own start with "libudev"
+    if b"@" not in parts[0]:
+        return None
+    
+    properties = {}
+    for part in parts[1:]:
+        key, sep, value = part.partition(b"=")
+        if sep:
+            properties[key.decode(errors="replace")] = value.decode(errors="replace")
+    return properties
+
+def parse_product(product):
+    """Vendor and product IDs from a uevent PRODUCT value like "bb4/313/100" """
+    try:
+        vendor, product_id = product.split("/")[:2]
+        return int(vendor, 16), int(product_id, 16)
+    except (AttributeError, ValueError):
+        return None
+
+class NetlinkUeventSource:
+    """Kernel uevents from a NETLINK_KOBJECT_UEVENT socket"""
+    
+    def __init__(self, group=UEVENT_KERNEL_GROUP):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        # Port 0 lets the kernel pick, so several monitors can share a process
+        self.sock.bind((0, group))
+    
+    def receive(self, timeout=1.0):
+        """Next uevent as a property dict, or None after the timeout"""
+        self.sock.settimeout(timeout)
+        try:
+            data = self.sock.recv(16384)
+        except socket.timeout:
+            return None
+        return parse_uevent(data)
+    
+    def close(self):
+        self.sock.close()
+
+class FakeUeventSource:
+    """Uevent source fed by hand, for tests and for trying the GUIs without hardware"""
+    
+    def __init__(self):
+        self.events = queue.Queue()
+    
+    def inject(self, action, devpath, subsystem="usb", **properties):
+        """Queue an event, e.g. inject("add", "/devices/usb1/1-2", PRODUCT="bb4/313/100")"""
+        event = {"ACTION": action, "DEVPATH": devpath, "SUBSYSTEM": subsystem}
+        if subsystem == "usb":
+            event["DEVTYPE"] = "usb_device"
+        event.update(properties)
+        self.events.put(event)
+    
+    def receive(self, timeout=1.0):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def close(self):
+        pass
+
+class UsbHotplugMonitor:
+    """Connected VR USB devices, kept current from kernel uevents
+    
+    /sys/bus/usb/devices is scanned once on start, after that only uevents
+    are processed. Subscribers are called on the monitor thread with event
+    dicts {type: "connected"/"disconnected", name, vendor, product, device,
+    time}. Without a netlink socket (containers, old kernels) the monitor
+    rescans sysfs every fallback_interval seconds instead.
+    """
+    
+    def __init__(self, devices=None, source=None, sysfs_root=SYSFS_USB_DEVICES,
+                 fallback_interval=2.0):
+        self.devices = VR_USB_DEVICES if devices is None else devices
+        self.source = source
+        self.sysfs_root = Path(sysfs_root)
+        self.fallback_interval = fallback_interval
+        self.running = False
+        self.thread = None
+        
+        # Kernel device name (e.g. "1-2") -> (vendor, product)
+        self.connected = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+    
+    def _device_name(self, vendor, product):
+        name = self.devices.get((vendor, product))
+        if name is None:
+            name = self.devices.get((vendor, None))
+        return name
+    
+    def is_connected(self, vendor, product=None):
+        """Whether a device with these IDs is plugged in (product None = any)"""
+        with self._lock:
+            ids = list(self.connected.values())
+        return any(v == vendor and (product is None or p == product) for v, p in ids)
+    
+    def connected_devices(self):
+        """List of (name, vendor, product) for the watched devices present"""
+        with self._lock:
+            ids = list(self.connected.values())
+        return [(self._device_name(v, p), v, p) for v, p in ids]
+    
+    def subscribe(self, callback):
+        """Call callback(event) on every connect/disconnect"""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+    
+    def scan(self):
+        """Read the watched devices currently present from sysfs"""
+        found = {}
+        try:
+            entries = list(self.sysfs_root.iterdir())
+        except OSError:
+            return found
+        
+        for entry in entries:
+            # Interfaces ("1-2:1.0") and root hubs carry no idVendor of their own
+            try:
+                vendor = int((entry / "idVendor").read_text().strip(), 16)
+                product = int((entry / "idProduct").read_text().strip(), 16)
+            except (OSError, ValueError):
+                continue
+            if self._device_name(vendor, product):
+                found[entry.name] = (vendor, product)
+        return found
+    
+    def start(self):
+        """Scan sysfs and start listening for uevents"""
+        if self.running:
+            return
+        
+        with self._lock:
+            self.connected = self.scan()
+        
+        if self.source is None:
+            try:
+                self.source = NetlinkUeventSource()
+            except OSError as e:
+                print(f"USB hotplug events unavailable ({e}), rescanning sysfs instead")
+        
+        self.running = True
+        target = self._listen if self.source else self._rescan
+        self.thread = threading.Thread(target=target, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        if self.source:
+            self.source.close()
+    
+    def handle_uevent(self, event):
+        """Apply one uevent property dict"""
+        if event.get("SUBSYSTEM") != "usb" or event.get("DEVTYPE") != "usb_device":
+            return
+        
+        device = os.path.basename(event.get("DEVPATH", ""))
+        action = event.get("ACTION")
+        if action == "add":
+            ids = parse_product(event.get("PRODUCT"))
+            if ids is None or not self._device_name(*ids):
+                return
+            with self._lock:
+                known = device in self.connected
+                self.connected[device] = ids
+            if not known:
+                self._publish("connected", device, ids)
+        elif action == "remove":
+            with self._lock:
+                ids = self.connected.pop(device, None)
+            if ids is not None:
+                self._publish("disconnected", device, ids)
+    
+    def _listen(self):
+        while self.running:
+            try:
+                event = self.source.receive(timeout=1.0)
+            except OSError as e:
+                print(f"USB hotplug error: {e}")
+                time.sleep(1.0)
+                continue
+            if event:
+                self.handle_uevent(event)
+    
+    def _rescan(self):
+        while self.running:
+            time.sleep(self.fallback_interval)
+            found = self.scan()
+            with self._lock:
+                previous = self.connected
+                self.connected = found
+            for device in previous.keys() - found.keys():
+                self._publish("disconnected", device, previous[device])
+            for device in found.keys() - previous.keys():
+                self._publish("connected", device, found[device])
+    
+    def _publish(self, kind, device, ids):
+        event = {
+            "type": kind,
+            "name": self._device_name(*ids),
+            "vendor": ids[0],
+            "product": ids[1],
+            "device": device,
+            "time": time.time()
+        }
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"USB hotplug subscriber failed: {e}")
+
+# Print events if run directly
+if __name__ == "__main__":
+    monitor = UsbHotplugMonitor()
+    monitor.subscribe(lambda event: print(
+        f"{event['type']:>12}: {event['name']} "
+        f"({event['vendor']:04x}:{event['product']:04x}) on {event['device']}"
+    ))
+    monitor.start()
+    
+    for name, vendor, product in monitor.connected_devices():
+        print(f"     present: {name} ({vendor:04x}:{product:04x})")
+    print("Watching for USB VR devices. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        monitor.stop()
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+HACHI Log Viewer
+Memory-mapped, incrementally indexed log viewer that only draws the visible lines
+"""
+
+import ctypes
+import mmap
+import os
+import struct
+from array import array
+from itertools import accumulate
+from pathlib import Path
+
+LOG_DIR = Path.home() / ".local" / "share" / "vr-logs"
+DRIVER_LOG = Path.home() / ".local" / "share" / "hachi" / "driver.log"
+VR_LOGS = ("monado.log", "steamvr.log", "bridge.log")
+
+# Bytes indexed per step; small enough to keep the window responsive
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")
+
+class LogIndex:
+    """Line start offsets of a (growing) log file
+    
+    The file is memory-mapped and scanned CHUNK_SIZE bytes per update(), so
+    a huge log shows its first screen right away and the rest is indexed in
+    the background. Appends are picked up by the next update(); a file that
+    shrinks or is replaced (log rotation) is indexed again from the start.
+    """
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = None
+        self.map = None
+        self.inode = None
+        self.reset()
+    
+    def reset(self):
+        self.close()
+        # offsets[i] is where line i starts; the last entry is the start of
+        # the line after the last newline, which may still be empty
+        self.offsets = array("Q", [0])
+        self.indexed = 0
+        self.size = 0
+    
+    @property
+    def exists(self):
+        return self.file is not None
+    
+    def _open(self):
+        try:
+            self.file = open(self.path, "rb")
+        except OSError:
+            self.file = None
+            return False
+        self.inode = os.fstat(self.file.fileno()).st_ino
+        return True
+    
+    def update(self, max_bytes=CHUNK_SIZE):
+        """Index up to max_bytes more; True while there is more to index"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            if self.exists:
+                self.reset()
+            return False
+        
+        if self.exists and (stat.st_ino != self.inode or stat.st_size < self.indexed):
+            self.reset()
+        if not self.exists and not self._open():
+            return False
+        
+        self.size = stat.st_size
+        if self.size == self.indexed:
+            return False
+        if self.map is None or len(self.map) < self.size:
+            if self.map is not None:
+                self.map.close()
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.size = len(self.map)
+        
+        end = min(self.size, self.indexed + max_bytes)
+        pieces = self.map[self.indexed:end].split(b"\n")
+        # Every piece but the last ends in a newline, so a new line starts after it
+        starts = accumulate((len(piece) + 1 for piece in pieces[:-1]), initial=self.indexed)
+        next(starts)  # the line being continued already has its offset
+        self.offsets.extend(starts)
+        self.indexed = end
+        return self.indexed < self.size
+    
+    def line_count(self):
+        # Text after the last newline counts as a line
+        partial = self.indexed > self.offsets[-1]
+        return len(self.offsets) - (0 if partial else 1)
+    
+    def lines(self, start, count):
+        """Up to count decoded lines from line number start"""
+        lines = []
+        total = self.line_count()
+        for number in range(max(start, 0), min(start + count, total)):
+            begin = self.offsets[number]
+            end = self.offsets[number + 1] - 1 if number + 1 < len(self.offsets) else self.indexed
+            lines.append(self.map[begin:end].decode("utf-8", errors="replace").rstrip("\r"))
+        return lines
+    
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def tail_lines(path, count):
+    """The last count lines of a file, read from the end without scanning it"""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                end = len(data)
+                if data[end - 1:end] == b"\n":
+                    end -= 1
+                start = end
+                for _ in range(count):
+                    start = data.rfind(b"\n", 0, start)
+                    if start < 0:
+                        break
+                text = data[start + 1:end]
+    except OSError:
+        return []
+    return text.decode("utf-8", errors="replace").splitlines()
+
+class LogWatcher:
+    """inotify watch on the directories of some log files
+    
+    Watching the directory rather than the file also catches logs that are
+    created later or rotated. changes() returns the watched paths that were
+    touched since the last call. When inotify is unavailable fileno() is
+    None and callers poll instead.
+    """
+    
+    def __init__(self, paths):
+        self.paths = {Path(p).resolve() for p in paths}
+        self.fd = None
+        self.dirs = {}
+        
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+        
+        for directory in {p.parent for p in self.paths}:
+            wd = libc.inotify_add_watch(fd, bytes(directory), WATCH_MASK)
+            if wd >= 0:
+                self.dirs[wd] = directory
+        if self.dirs:
+            self.fd = fd
+        else:
+            os.close(fd)
+    
+    def fileno(self):
+        return self.fd
+    
+    def changes(self):
+        changed = set()
+        if self.fd is None:
+            return changed
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except OSError:
+                # EAGAIN: nothing more queued
+                break
+            offset = 0
+            while offset + INOTIFY_EVENT.size <= len(data):
+                wd, mask, cookie, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                path = self.dirs.get(wd, Path("/")) / name
+                if path in self.paths:
+                    changed.add(path)
+        return changed
+    
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+class LogViewer:
+    """Log window showing one of several logs, drawing only visible lines
+    
+    The Text widget never holds more than a screenful; scrolling re-renders
+    that window from the LogIndex. With Follow on, the view sticks to the
+    end as lines are appended (scrolling up turns it off, End turns it on).
+    """
+    
+    def __init__(self, window, paths, empty_text="No log found yet.",
+                 bg='#1a1a1a', fg='#00ff88', font=('Courier', 10)):
+        import tkinter as tk
+        import tkinter.font
+        self.tk = tk
+        self.window = window
+        self.paths = [Path(p) for p in paths]
+        self.empty_text = empty_text
+        self.indexes = {}
+        self.top = 0
+        self.rows = 40
+        self.indexing = None
+        self.poll = None
+        
+        toolbar = tk.Frame(window, bg=bg)
+        toolbar.pack(fill=tk.X, padx=10, pady=(10, 0))
+        
+        self.selected = tk.StringVar(value=self.paths[0].name)
+        names = [p.name for p in self.paths]
+        selector = tk.OptionMenu(toolbar, self.selected, *names, command=lambda name: self.select())
+        selector.config(bg=bg, fg=fg, activebackground=bg, highlightthickness=0)
+        selector.pack(side=tk.LEFT)
+        
+        self.follow = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            toolbar, text="Follow", variable=self.follow, command=self.on_follow,
+            bg=bg, fg=fg, selectcolor=bg, activebackground=bg
+        ).pack(side=tk.LEFT, padx=10)
+        
+        self.status = tk.Label(toolbar, text="", bg=bg, fg='#888888', font=('Arial', 9))
+        self.status.pack(side=tk.RIGHT)
+        
+        body = tk.Frame(window, bg=bg)
+        body.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self.scrollbar = tk.Scrollbar(body, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        xscroll = tk.Scrollbar(body, orient=tk.HORIZONTAL)
+        xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        self.text = tk.Text(body, bg=bg, fg=fg, font=font, wrap=tk.NONE,
+                            xscrollcommand=xscroll.set, state=tk.DISABLED)
+        self.text.pack(fill=tk.BOTH, expand=True)
+        xscroll.config(command=self.text.xview)
+        
+        self.text.bind('<Configure>', self.on_resize)
+        for widget in (self.text, self.scrollbar):
+            widget.bind('<MouseWheel>', lambda e: self.scroll_by(-3 if e.delta > 0 else 3))
+            widget.bind('<Button-4>', lambda e: self.scroll_by(-3))
+            widget.bind('<Button-5>', lambda e: self.scroll_by(3))
+        window.bind('<Prior>', lambda e: self.scroll_by(-self.rows))
+        window.bind('<Next>', lambda e: self.scroll_by(self.rows))
+        window.bind('<Up>', lambda e: self.scroll_by(-1))
+        window.bind('<Down>', lambda e: self.scroll_by(1))
+        window.bind('<Home>', lambda e: self.scroll_to(0))
+        window.bind('<End>', lambda e: self.scroll_to_end())
+        window.bind('<Destroy>', self.on_destroy, add='+')
+        
+        # Appends arrive through inotify; without it the logs are polled
+        self.watcher = LogWatcher(self.paths)
+        if self.watcher.fileno() is not None:
+            window.tk.createfilehandler(self.watcher.fileno(), tk.READABLE, self.on_inotify)
+        else:
+            self.poll = window.after(500, self.poll_logs)
+        
+        self.select()
+    
+    @property
+    def index(self):
+        path = self.paths[[p.name for p in self.paths].index(self.selected.get())]
+        if path not in self.indexes:
+            self.indexes[path] = LogIndex(path)
+        return self.indexes[path]
+    
+    def select(self):
+        """Show the log picked in the selector"""
+        if self.indexing:
+            self.window.after_cancel(self.indexing)
+        self.top = 0
+        self.follow.set(True)
+        self.index_more()
+    
+    def index_more(self):
+        """Index the next chunk of the selected log and redraw"""
+        self.indexing = None
+        more = self.index.update()
+        if self.follow.get():
+            self.top = max(0, self.index.line_count() - self.rows)
+        self.render()
+        if more:
+            self.indexing = self.window.after(1, self.index_more)
+    
+    def render(self):
+        tk = self.tk
+        index = self.index
+        total = index.line_count()
+        self.top = max(0, min(self.top, total - self.rows))
+        
+        if index.exists:
+            content = "\n".join(index.lines(self.top, self.rows))
+        else:
+            content = self.empty_text
+        self.text.config(state=tk.NORMAL)
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', content)
+        self.text.config(state=tk.DISABLED)
+        
+        if total > self.rows:
+            self.scrollbar.set(self.top / total, (self.top + self.rows) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        
+        state = f"{total:,} lines, {index.indexed / 1048576:.1f} MB"
+        if index.indexed < index.size:
+            state += f" (indexing {index.indexed * 100 // index.size}%)"
+        self.status.config(text=state)
+    
+    def scroll_to(self, line):
+        self.top = max(0, line)
+        # Scrolling away from the end stops following
+        if self.top + self.rows < self.index.line_count():
+            self.follow.set(False)
+        self.render()
+    
+    def scroll_by(self, lines):
+        self.scroll_to(self.top + lines)
+        return "break"
+    
+    def scroll_to_end(self):
+        self.follow.set(True)
+        self.on_follow()
+    
+    def on_follow(self):
+        if self.follow.get():
+            self.top = max(0, self.index.line_count() - self.rows)
+            self.render()
+    
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.index.line_count()))
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.rows)
+        else:
+            self.scroll_by(int(amount))
+    
+    def on_resize(self, event):
+        linespace = self.tk.font.Font(font=self.text.cget('font')).metrics('linespace')
+        rows = max(1, event.height // linespace)
+        if rows != self.rows:
+            self.rows = rows
+            if self.follow.get():
+                self.top = max(0, self.index.line_count() - self.rows)
+            self.render()
+    
+    def on_inotify(self, fd, mask):
+        changed = self.watcher.changes()
+        if self.index.path.resolve() in changed and self.indexing is None:
+            self.index_more()
+    
+    def poll_logs(self):
+        if self.indexing is None:
+            self.index_more()
+        self.poll = self.window.after(500, self.poll_logs)
+    
+    def on_destroy(self, event):
+        if event.widget is not self.window:
+            return
+        for pending in (self.indexing, self.poll):
+            if pending:
+                self.window.after_cancel(pending)
+        if self.watcher.fileno() is not None:
+            self.window.tk.deletefilehandler(self.watcher.fileno())
+        self.watcher.close()
+        for index in self.indexes.values():
+            index.close()
+
+def default_logs():
+    return [DRIVER_LOG] + [LOG_DIR / name for name in VR_LOGS]
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="View HACHI / VR logs")
+    parser.add_argument("logs", nargs="*", help="log files (default: driver and VR logs)")
+    parser.add_argument("--tail", type=int, metavar="N", help="print the last N lines of each log and exit")
+    args = parser.parse_args()
+    paths = [Path(p) for p in args.logs] or default_logs()
+    
+    if args.tail is not None:
+        for path in paths:
+            if len(paths) > 1:
+                print(f"\n=== {path.name} ===")
+            if not path.exists():
+                print("(not found)")
+                continue
+            for line in tail_lines(path, args.tail):
+                print(line)
+        return
+    
+    if not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        # No GUI session: less pages large files without loading them
+        existing = [str(p) for p in paths if p.exists()]
+        if not existing:
+            print("No logs found")
+            return
+        os.execvp("less", ["less"] + existing)
+    
+    import tkinter as tk
+    root = tk.Tk()
+    root.title("HACHI Logs")
+    root.geometry("900x600")
+    root.configure(bg='#0a0a0a')
+    LogViewer(root, paths)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+HACHI Performance Monitor
+Samples CPU, memory, pressure and GPU counters from /proc and sysfs without forking tools
+"""
+
+import ctypes
+import os
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+PROC_STAT = "/proc/stat"
+PROC_MEMINFO = "/proc/meminfo"
+PROC_PRESSURE = Path("/proc/pressure")
+SYSFS_DRM = Path("/sys/class/drm")
+SYSFS_HWMON = Path("/sys/class/hwmon")
+
+# hwmon drivers that report the CPU package temperature
+CPU_HWMON = ("k10temp", "zenpower", "coretemp", "cpu_thermal")
+
+# (key, label, unit, scale maximum for graphs; None = the largest value seen)
+METRICS = (
+    ("cpu", "CPU", "%", 100),
+    ("cpu_iowait", "CPU iowait", "%", 100),
+    ("cpu_temp", "CPU temp", "°C", 100),
+    ("mem_used_mb", "Memory", "MB", None),
+    ("mem_percent", "Memory", "%", 100),
+    ("psi_cpu", "CPU pressure", "%", 100),
+    ("psi_memory", "Memory pressure", "%", 100),
+    ("psi_io", "IO pressure", "%", 100),
+    ("gpu_busy", "GPU load", "%", 100),
+    ("gpu_temp", "GPU temp", "°C", 100),
+    ("gpu_clock_mhz", "GPU clock", "MHz", None),
+    ("gpu_power_w", "GPU power", "W", None),
+    ("vram_used_mb", "VRAM", "MB", None),
+)
+
+def _read_fd(fd, size=16384):
+    # sysfs and procfs regenerate their contents for every read from offset 0
+    return os.pread(fd, size, 0).decode(errors="replace")
+
+def _open(path):
+    try:
+        return os.open(str(path), os.O_RDONLY | os.O_CLOEXEC)
+    except OSError:
+        return None
+
+class CpuSource:
+    """Total CPU and iowait percentage from /proc/stat deltas"""
+    
+    def __init__(self):
+        self.fd = _open(PROC_STAT)
+        self.last = None
+    
+    def sample(self):
+        if self.fd is None:
+            return {}
+        fields = [int(v) for v in _read_fd(self.fd, 256).split("\n", 1)[0].split()[1:]]
+        # user nice system idle iowait irq softirq steal (guest is inside user)
+        idle = fields[3] + fields[4]
+        total = sum(fields[:8])
+        last, self.last = self.last, (total, idle, fields[4])
+        if last is None or total == last[0]:
+            return {}
+        elapsed = total - last[0]
+        return {
+            "cpu": round(100.0 * (elapsed - (idle - last[1])) / elapsed, 1),
+            "cpu_iowait": round(100.0 * (fields[4] - last[2]) / elapsed, 1)
+        }
+
+class MemorySource:
+    """Used memory from /proc/meminfo (MemTotal - MemAvailable)"""
+    
+    def __init__(self):
+        self.fd = _open(PROC_MEMINFO)
+    
+    def sample(self):
+        if self.fd is None:
+            return {}
+        values = {}
+        for line in _read_fd(self.fd, 4096).splitlines()[:8]:
+            name, _, rest = line.partition(":")
+            values[name] = int(rest.split()[0])
+        if "MemAvailable" not in values:
+            return {}
+        used = values["MemTotal"] - values["MemAvailable"]
+        return {
+            "mem_used_mb": used // 1024,
+            "mem_percent": round(100.0 * used / values["MemTotal"], 1)
+        }
+
+class PressureSource:
+    """PSI 'some avg10' for cpu, memory and io (kernel 4.20+)"""
+    
+    def __init__(self):
+        self.fds = {}
+        for name in ("cpu", "memory", "io"):
+            fd = _open(PROC_PRESSURE / name)
+            if fd is not None:
+                self.fds[name] = fd
+    
+    def sample(self):
+        result = {}
+        for name, fd in self.fds.items():
+            try:
+                some = _read_fd(fd, 256).split("\n", 1)[0]
+            except OSError:
+                continue
+            # some avg10=1.23 avg60=0.50 avg300=0.10 total=12345
+            result["psi_" + name] = float(some.split()[1].split("=")[1])
+        return result
+
+class HwmonSource:
+    """CPU package temperature from hwmon"""
+    
+    def __init__(self, root=SYSFS_HWMON):
+        self.fd = None
+        for hwmon in sorted(Path(root).glob("hwmon*")):
+            try:
+                name = (hwmon / "name").read_text().strip()
+            except OSError:
+                continue
+            if name in CPU_HWMON:
+                self.fd = _open(hwmon / "temp1_input")
+                if self.fd is not None:
+                    break
+    
+    def sample(self):
+        if self.fd is None:
+            return {}
+        return {"cpu_temp": int(_read_fd(self.fd, 32)) / 1000.0}
+
+class DrmGpuSource:
+    """amdgpu / i915 counters from the DRM card's sysfs nodes"""
+    
+    def __init__(self, device):
+        self.device = Path(device)
+        self.busy = _open(self.device / "gpu_busy_percent")
+        self.vram = _open(self.device / "mem_info_vram_used")
+        self.sclk = _open(self.device / "pp_dpm_sclk")
+        # i915 reports only its current frequency
+        self.freq = _open(self.device.parent / "gt_cur_freq_mhz") if self.sclk is None else None
+        
+        self.temp = self.power = None
+        hwmon = next(iter(sorted(self.device.glob("hwmon/hwmon*"))), None)
+        if hwmon:
+            self.temp = _open(hwmon / "temp1_input")
+            self.power = _open(hwmon / "power1_average")
+            if self.power is None:
+                self.power = _open(hwmon / "power1_input")
+    
+    def sample(self):
+        result = {}
+        try:
+            if self.busy is not None:
+                result["gpu_busy"] = int(_read_fd(self.busy, 16))
+            if self.vram is not None:
+                result["vram_used_mb"] = int(_read_fd(self.vram, 32)) // 1048576
+            if self.sclk is not None:
+                # "1: 1800Mhz *" marks the active DPM level
+                for line in _read_fd(self.sclk, 512).splitlines():
+                    if line.endswith("*"):
+                        result["gpu_clock_mhz"] = int(line.split()[1].lower().rstrip("mhz"))
+            elif self.freq is not None:
+                result["gpu_clock_mhz"] = int(_read_fd(self.freq, 16))
+            if self.temp is not None:
+                result["gpu_temp"] = int(_read_fd(self.temp, 16)) / 1000.0
+            if self.power is not None:
+                result["gpu_power_w"] = round(int(_read_fd(self.power, 32)) / 1e6, 1)
+        except (OSError, ValueError):
+            pass
+        return result
+
+class NvmlGpuSource:
+    """NVIDIA counters through NVML (libnvidia-ml), the library nvidia-smi uses"""
+    
+    class Utilization(ctypes.Structure):
+        _fields_ = [("gpu", ctypes.c_uint), ("memory", ctypes.c_uint)]
+    
+    class Memory(ctypes.Structure):
+        _fields_ = [("total", ctypes.c_ulonglong), ("free", ctypes.c_ulonglong), ("used", ctypes.c_ulonglong)]
+    
+    def __init__(self):
+        # Raises OSError when the driver isn't installed
+        self.nvml = ctypes.CDLL("libnvidia-ml.so.1")
+        if self.nvml.nvmlInit_v2() != 0:
+            raise OSError("nvmlInit failed")
+        self.handle = ctypes.c_void_p()
+        if self.nvml.nvmlDeviceGetHandleByIndex_v2(0, ctypes.byref(self.handle)) != 0:
+            raise OSError("no NVIDIA device")
+    
+    def sample(self):
+        result = {}
+        util = self.Utilization()
+        if self.nvml.nvmlDeviceGetUtilizationRates(self.handle, ctypes.byref(util)) == 0:
+            result["gpu_busy"] = util.gpu
+        value = ctypes.c_uint()
+        if self.nvml.nvmlDeviceGetTemperature(self.handle, 0, ctypes.byref(value)) == 0:
+            result["gpu_temp"] = float(value.value)
+        if self.nvml.nvmlDeviceGetClockInfo(self.handle, 0, ctypes.byref(value)) == 0:
+            result["gpu_clock_mhz"] = value.value
+        if self.nvml.nvmlDeviceGetPowerUsage(self.handle, ctypes.byref(value)) == 0:
+            result["gpu_power_w"] = round(value.value / 1000.0, 1)
+        memory = self.Memory()
+        if self.nvml.nvmlDeviceGetMemoryInfo(self.handle, ctypes.byref(memory)) == 0:
+            result["vram_used_mb"] = memory.used // 1048576
+        return result
+
+def gpu_sources(drm_root=SYSFS_DRM):
+    """A source for the first GPU with usable counters"""
+    for card in sorted(Path(drm_root).glob("card[0-9]*")):
+        if "-" in card.name:
+            continue
+        try:
+            vendor = int((card / "device" / "vendor").read_text(), 16)
+        except (OSError, ValueError):
+            continue
+        if vendor == 0x10de:
+            try:
+                return [NvmlGpuSource()]
+            except (OSError, AttributeError):
+                continue
+        if vendor in (0x1002, 0x8086):
+            return [DrmGpuSource(card / "device")]
+    return []
+
+class PerfMonitor:
+    """Samples every source at a fixed rate into per-metric ring buffers
+    
+    Everything is read from already-open /proc and sysfs descriptors (or
+    NVML), so a 10 Hz sample costs well under a millisecond and doesn't
+    show up in the numbers it measures. overhead() reports what the
+    sampler itself uses.
+    """
+    
+    def __init__(self, interval=0.1, history=600, sources=None):
+        self.interval = interval
+        self.sources = sources if sources is not None else (
+            [CpuSource(), MemorySource(), PressureSource(), HwmonSource()] + gpu_sources()
+        )
+        self.times = deque(maxlen=history)
+        self.history = {key: deque(maxlen=history) for key, _, _, _ in METRICS}
+        self.current = {}
+        self.running = False
+        self.thread = None
+        self.cpu_time = 0.0
+        self.started = None
+        self._lock = threading.Lock()
+    
+    def sample(self):
+        """Take one sample of every source (normally done by the thread)"""
+        cost = time.thread_time()
+        values = {}
+        for source in list(self.sources):
+            try:
+                values.update(source.sample())
+            except (OSError, ValueError, IndexError) as e:
+                # Stop asking a source that can't be read
+                print(f"Performance source {type(source).__name__} failed: {e}")
+                self.sources.remove(source)
+        now = time.monotonic()
+        with self._lock:
+            self.times.append(now)
+            for key, series in self.history.items():
+                series.append(values.get(key))
+            self.current = values
+        self.cpu_time += time.thread_time() - cost
+        return values
+    
+    def latest(self):
+        with self._lock:
+            return dict(self.current)
+    
+    def series(self, key):
+        """Recent values of one metric, oldest first (None = not sampled)"""
+        with self._lock:
+            return list(self.history[key])
+    
+    def overhead(self):
+        """Sampler CPU time as a percentage of one core"""
+        if not self.started:
+            return 0.0
+        return 100.0 * self.cpu_time / max(time.monotonic() - self.started, 1e-6)
+    
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.started = time.monotonic()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+    
+    def _run(self):
+        next_time = time.monotonic()
+        while self.running:
+            self.sample()
+            next_time += self.interval
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.monotonic()
+
+SPARKS = "▁▂▃▄▅▆▇█"
+
+def sparkline(values, width, maximum=None):
+    values = [v for v in values[-width:] if v is not None]
+    if not values:
+        return ""
+    top = maximum or max(values) or 1
+    return "".join(SPARKS[min(len(SPARKS) - 1, int(v / top * (len(SPARKS) - 1)))] for v in values)
+
+def format_value(value, unit):
+    if value is None:
+        return "-"
+    return f"{value:.1f} {unit}" if isinstance(value, float) else f"{value} {unit}"
+
+def run_curses(monitor, refresh=0.25):
+    """Full-screen terminal view; q quits"""
+    import curses
+    
+    def draw(screen):
+        curses.curs_set(0)
+        screen.timeout(int(refresh * 1000))
+        while True:
+            screen.erase()
+            height, width = screen.getmaxyx()
+            screen.addstr(0, 0, f"=== VR Performance Monitor ({time.strftime('%H:%M:%S')}) ===  q: quit"[:width - 1],
+                          curses.A_BOLD)
+            current = monitor.latest()
+            row = 2
+            for key, label, unit, maximum in METRICS:
+                if key not in current or row >= height - 2:
+                    continue
+                text = f"{label:<16} {format_value(current[key], unit):>12}  "
+                graph = sparkline(monitor.series(key), max(0, width - len(text) - 1), maximum)
+                screen.addstr(row, 0, (text + graph)[:width - 1])
+                row += 1
+            screen.addstr(min(row + 1, height - 1), 0,
+                          f"Sampling every {monitor.interval * 1000:.0f} ms, "
+                          f"monitor overhead {monitor.overhead():.2f}% CPU"[:width - 1])
+            screen.refresh()
+            if screen.getch() in (ord("q"), ord("Q")):
+                return
+    
+    curses.wrapper(draw)
+
+class PerfPanel:
+    """Tk panel with a value and a small graph per metric
+    
+    Embed with PerfPanel(parent, monitor).frame.pack(...); it redraws from
+    the monitor's buffers every refresh ms and never samples itself.
+    """
+    
+    def __init__(self, parent, monitor, refresh=250, bg='#1a1a1a', fg='#ffffff',
+                 dim='#888888', accent='#00ff88', graph_width=240):
+        import tkinter as tk
+        self.monitor = monitor
+        self.refresh = refresh
+        self.accent = accent
+        self.graph_width = graph_width
+        self.rows = {}
+        
+        self.frame = tk.Frame(parent, bg=bg)
+        for row, (key, label, unit, maximum) in enumerate(METRICS):
+            name = tk.Label(self.frame, text=label, bg=bg, fg=dim, font=('Arial', 10), anchor=tk.W)
+            value = tk.Label(self.frame, text="-", bg=bg, fg=fg, font=('Courier', 10), width=12, anchor=tk.E)
+            graph = tk.Canvas(self.frame, width=graph_width, height=18, bg=bg, highlightthickness=0)
+            self.rows[key] = (name, value, graph, unit, maximum)
+        self.overhead_label = tk.Label(self.frame, text="", bg=bg, fg=dim, font=('Arial', 8))
+        self.overhead_label.grid(row=len(METRICS), column=0, columnspan=3, sticky=tk.W, pady=(6, 0))
+        
+        self.shown = set()
+        self.tick = self.frame.after(self.refresh, self.update)
+    
+    def update(self):
+        current = self.monitor.latest()
+        for row, (key, _, _, _) in enumerate(METRICS):
+            name, value, graph, unit, maximum = self.rows[key]
+            if key not in current:
+                continue
+            if key not in self.shown:
+                # Only metrics this machine actually reports get a row
+                name.grid(row=row, column=0, sticky='w', padx=(0, 10))
+                value.grid(row=row, column=1, sticky='e')
+                graph.grid(row=row, column=2, padx=(10, 0))
+                self.shown.add(key)
+            value.config(text=format_value(current[key], unit))
+            self.draw_graph(graph, self.monitor.series(key), maximum)
+        
+        self.overhead_label.config(text=f"Sampling every {self.monitor.interval * 1000:.0f} ms, "
+                                        f"overhead {self.monitor.overhead():.2f}% CPU")
+        self.tick = self.frame.after(self.refresh, self.update)
+    
+    def draw_graph(self, graph, values, maximum):
+        values = [v for v in values[-self.graph_width // 2:] if v is not None]
+        graph.delete("all")
+        if len(values) < 2:
+            return
+        top = maximum or max(values) or 1
+        height = int(graph.cget("height"))
+        step = self.graph_width / (len(values) - 1)
+        points = []
+        for index, v in enumerate(values):
+            points += [index * step, height - 1 - min(v / top, 1.0) * (height - 2)]
+        graph.create_line(*points, fill=self.accent)
+    
+    def stop(self):
+        if self.tick:
+            self.frame.after_cancel(self.tick)
+            self.tick = None
+
+def open_window(monitor, master=None):
+    """PerfPanel in its own window; stops the monitor when closed"""
+    import tkinter as tk
+    window = tk.Toplevel(master) if master else tk.Tk()
+    window.title("VR Performance Monitor")
+    window.configure(bg='#1a1a1a')
+    panel = PerfPanel(window, monitor)
+    panel.frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+    
+    def close():
+        panel.stop()
+        monitor.stop()
+        window.destroy()
+    
+    window.protocol("WM_DELETE_WINDOW", close)
+    return window
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="VR performance monitor")
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between samples (default 0.1)")
+    parser.add_argument("--once", action="store_true", help="print one sample and exit")
+    parser.add_argument("--tk", action="store_true", help="open a window instead of the terminal view")
+    args = parser.parse_args()
+    
+    monitor = PerfMonitor(interval=args.interval)
+    if args.once:
+        monitor.sample()
+        time.sleep(args.interval)
+        current = monitor.sample()
+        for key, label, unit, maximum in METRICS:
+            if key in current:
+                print(f"{label:<16} {format_value(current[key], unit)}")
+        return
+    
+    monitor.start()
+    # Launched from a GUI there is no terminal; show a window instead
+    if args.tk or not sys.stdout.isatty():
+        open_window(monitor).mainloop()
+    else:
+        try:
+            run_curses(monitor)
+        except KeyboardInterrupt:
+            pass
+    monitor.stop()
+
+if __name__ == "__main__":
+    main()
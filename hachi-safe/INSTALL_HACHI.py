@@ -11,6 +11,12 @@ import threading
 import os
 from pathlib import Path
 
+# PCI sysfs GPU detection is optional - falls back to lspci
+try:
+    from hardware_profile import load_profile
+except ImportError:
+    load_profile = None
+
 class HachiInstaller:
     def __init__(self, root):
         self.root = root
@@ -147,15 +153,23 @@ After installation, just log out and back in, then run: hachi
             # Detect GPU
             self.log("\n[2/8] Detecting GPU (for theme only)...")
             try:
-                result = subprocess.run(['lspci'], capture_output=True, text=True)
-                if 'nvidia' in result.stdout.lower():
-                    gpu = 'nvidia'
+                if load_profile:
+                    # Reads PCI sysfs and primes the control center's per-boot cache
+                    gpu = load_profile(refresh=True)['gpu_vendor']
+                else:
+                    result = subprocess.run(['lspci'], capture_output=True, text=True)
+                    if 'nvidia' in result.stdout.lower():
+                        gpu = 'nvidia'
+                    elif 'amd' in result.stdout.lower():
+                        gpu = 'amd'
+                    else:
+                        gpu = 'unknown'
+                
+                if gpu == 'nvidia':
                     self.log("✓ NVIDIA GPU detected (green theme)")
-                elif 'amd' in result.stdout.lower():
-                    gpu = 'amd'
+                elif gpu == 'amd':
                     self.log("✓ AMD GPU detected (red theme)")
                 else:
-                    gpu = 'unknown'
                     self.log("✓ GPU detected (blue theme)")
                 
                 with open(self.install_dir / "gpu_vendor.txt", 'w') as f:
@@ -246,6 +260,18 @@ SUBSYSTEM=="video4linux", ATTRS{idVendor}=="0bb4", MODE="0666", GROUP="video", T
                 'enhanced_tracking.py',
                 'controller_manager.py',
                 'cosmos_monitor.py',
+                'hotplug.py',
+                'process_watcher.py',
+                'hachi_status.py',
+                'ui_dispatch.py',
+                'display_probe.py',
+                'hardware_profile.py',
+                'log_viewer.py',
+                'log_index.py',
+                'perf_monitor.py',
+                'frame_timing.py',
+                'probe_scheduler.py',
+                'hachid.py',
                 'display_optimizer.sh',
                 'firmware_manager.sh',
                 'vr_manager.sh',
@@ -14,6 +14,57 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+# Time to first paint is measured from here
+STARTUP_TIME = time.perf_counter()
+
+# PCI sysfs GPU detection is optional - falls back to lspci
+try:
+    from hardware_profile import cached_profile, load_profile_async, retheme
+except ImportError:
+    load_profile_async = None
+
+# USB hotplug events are optional - falls back to polling lsusb
+try:
+    from hotplug import UsbHotplugMonitor
+except ImportError:
+    UsbHotplugMonitor = None
+
+# Shared status probes are optional - falls back to a local monitor thread
+try:
+    from hachi_status import get_status_service, usb_connected, process_running
+except ImportError:
+    get_status_service = None
+
+# Adaptive probe intervals are optional - falls back to checking every 2 s
+try:
+    from probe_scheduler import ProbeScheduler, watch_window
+except ImportError:
+    ProbeScheduler = None
+
+# Queued widget updates are optional - falls back to configuring directly
+try:
+    from ui_dispatch import UiDispatcher
+except ImportError:
+    UiDispatcher = None
+
+# In-process performance sampler is optional - falls back to vr-perf-monitor.sh
+try:
+    from perf_monitor import PerfMonitor, open_window as open_perf_window
+except ImportError:
+    PerfMonitor = None
+
+# Compositor frame timing is optional - the dashboard just leaves it out
+try:
+    from frame_timing import FrameTimingCollector, format_stats, format_histogram
+except ImportError:
+    FrameTimingCollector = None
+
+# The hachid daemon is optional - falls back to running probes and processes in this window
+try:
+    from hachid import connect_status, HachidError
+except ImportError:
+    connect_status = None
+
 class HachiControlCenter:
     def __init__(self, root):
         self.root = root
@@ -43,6 +94,7 @@ class HachiControlCenter:
         self.monado_running = False
         self.finger_tracking_enabled = False
         self.finger_tracking_active = False
+        self.finger_tracking_process = None
         
         # Create UI
         self.create_menu()
@@ -51,11 +103,19 @@ class HachiControlCenter:
         self.create_main_area()
         self.create_status_bar()
         
+        # Monitor threads hand widget updates to the Tk thread through this
+        self.ui = UiDispatcher(self.root) if UiDispatcher else None
+        
         # Start monitoring
         self.start_monitoring()
         
         # Show dashboard by default
         self.show_dashboard()
+        
+        # Finish GPU detection in the background and note time to first paint
+        if self.gpu_detection:
+            self.root.after(10, self.finish_gpu_detection)
+        self._paint_binding = self.root.bind('<Expose>', self.report_first_paint, '+')
     
     def load_config(self):
         """Load configuration"""
@@ -74,11 +134,26 @@ class HachiControlCenter:
     
     def save_config(self):
         """Save configuration"""
-        with open(self.config_file, 'w') as f:
+        # Replace the file in one step; the running tracker reloads it live
+        tmp_file = self.config_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w') as f:
             json.dump(self.config, indent=2, fp=f)
+        os.replace(tmp_file, self.config_file)
     
     def detect_gpu(self):
         """Detect GPU vendor for color theme"""
+        self.gpu_detection = None
+        if load_profile_async:
+            # Cached for this boot it's instant; otherwise paint with the
+            # default theme and switch accents when the PCI scan is done
+            profile = cached_profile()
+            if profile:
+                self.gpu_vendor = profile['gpu_vendor']
+            else:
+                self.gpu_vendor = 'unknown'
+                self.gpu_detection = load_profile_async()
+            return
+        
         gpu_file = self.config_dir / "gpu_vendor.txt"
         
         if gpu_file.exists():
@@ -101,6 +176,31 @@ class HachiControlCenter:
             with open(gpu_file, 'w') as f:
                 f.write(self.gpu_vendor)
     
+    def finish_gpu_detection(self):
+        """Move the already drawn window to the detected GPU's accents"""
+        if not self.gpu_detection.done():
+            self.root.after(10, self.finish_gpu_detection)
+            return
+        try:
+            vendor = self.gpu_detection.result()['gpu_vendor']
+        except Exception:
+            vendor = 'unknown'
+        self.gpu_detection = None
+        if vendor == self.gpu_vendor:
+            return
+        
+        old_colors, old_name = dict(self.colors), self.gpu_name
+        self.gpu_vendor = vendor
+        self.setup_theme()
+        changed = {old_colors[key]: value for key, value in self.colors.items() if old_colors.get(key) != value}
+        retheme(self.root, changed, {old_name: self.gpu_name})
+    
+    def report_first_paint(self, event=None):
+        self.root.unbind('<Expose>', self._paint_binding)
+        self.first_paint_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        if os.environ.get('HACHI_STARTUP_TIMING'):
+            print(f"Time to first paint: {self.first_paint_ms:.0f} ms")
+    
     def setup_theme(self):
         """Setup color theme based on GPU"""
         # Triple black base
@@ -205,6 +305,12 @@ class HachiControlCenter:
                            fg=self.colors['text'])
         help_menu.add_command(label="About HACHI", command=self.show_about)
         menubar.add_cascade(label="Help", menu=help_menu)
+        
+        debug_menu = tk.Menu(menubar, tearoff=0, bg=self.colors['bg_light'],
+                            fg=self.colors['text'])
+        debug_menu.add_command(label="View Statistics", command=self.show_view_stats)
+        debug_menu.add_command(label="Rebuild Views", command=self.rebuild_views)
+        menubar.add_cascade(label="Debug", menu=debug_menu)
     
     def create_header(self):
         """Create header"""
@@ -277,6 +383,7 @@ class HachiControlCenter:
         ]
         
         self.nav_buttons = {}
+        self.nav_commands = {text: command for text, command, icon in nav_buttons}
         for text, command, icon in nav_buttons:
             btn_frame = tk.Frame(sidebar, bg=self.colors['bg_medium'])
             btn_frame.pack(fill=tk.X, padx=10, pady=2)
@@ -308,6 +415,12 @@ class HachiControlCenter:
         """Create main content area"""
         self.main_area = tk.Frame(self.root, bg=self.colors['bg_dark'])
         self.main_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        # Views are stacked in one grid cell and raised when selected
+        self.main_area.grid_rowconfigure(0, weight=1)
+        self.main_area.grid_columnconfigure(0, weight=1)
+        self.views = {}
+        self.current_view = None
     
     def create_status_bar(self):
         """Create status bar"""
@@ -335,17 +448,95 @@ class HachiControlCenter:
         
         update_time()
     
+    def show_view(self, name, build, refresh=None):
+        """Raise a view, building it the first time it is shown
+        
+        Views stay alive in self.views once built; switching only raises
+        the frame and runs the view's refresh hook, which updates just the
+        fields that change.
+        """
+        started = time.perf_counter()
+        self.highlight_nav_button(name)
+        
+        view = self.views.get(name)
+        if view is None:
+            frame = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+            frame.grid(row=0, column=0, sticky='nsew')
+            build(frame)
+            view = self.views[name] = {
+                "frame": frame,
+                "refresh": refresh,
+                "build_ms": (time.perf_counter() - started) * 1000,
+                "switches": 0,
+                "switch_ms": 0.0,
+                "total_switch_ms": 0.0
+            }
+        
+        self.current_view = name
+        view["frame"].tkraise()
+        if refresh:
+            refresh()
+            if self.ui:
+                self.ui.flush()
+        
+        # The switch is done once Tk has redrawn, which happens when it goes idle
+        self.root.after_idle(self.record_view_switch, view, started)
+    
+    def record_view_switch(self, view, started):
+        view["switch_ms"] = (time.perf_counter() - started) * 1000
+        view["total_switch_ms"] += view["switch_ms"]
+        view["switches"] += 1
+    
+    def refresh_view(self):
+        """Run the current view's refresh hook (any thread)"""
+        view = self.views.get(self.current_view)
+        if view and view["refresh"]:
+            view["refresh"]()
+    
     def clear_main_area(self):
-        """Clear the main content area"""
+        """Drop all cached views; they are rebuilt when next shown"""
         for widget in self.main_area.winfo_children():
             widget.destroy()
+        self.views = {}
+    
+    def rebuild_views(self):
+        """Throw away the cached views and rebuild the current one (Debug menu)"""
+        current = self.current_view
+        self.clear_main_area()
+        if current:
+            self.nav_commands[current]()
+    
+    def count_widgets(self, widget):
+        return 1 + sum(self.count_widgets(child) for child in widget.winfo_children())
+    
+    def show_view_stats(self):
+        """View build/switch times and widget counts (Debug menu)"""
+        lines = []
+        for name, view in self.views.items():
+            average = view["total_switch_ms"] / view["switches"] if view["switches"] else 0.0
+            lines.append(
+                f"{name}: built in {view['build_ms']:.1f} ms, {self.count_widgets(view['frame'])} widgets\n"
+                f"    last switch {view['switch_ms']:.1f} ms, average {average:.1f} ms over {view['switches']}"
+            )
+        lines.append(f"\nWidgets in window: {self.count_widgets(self.root)}")
+        if self.ui:
+            stats = self.ui.stats
+            lines.append(f"Queued updates: {stats['queued']} ({stats['applied']} applied, {stats['skipped']} unchanged)")
+        probes = self.status_service or self.probe_scheduler
+        if probes and hasattr(probes, 'stats'):
+            stats = probes.stats()
+            intervals = ", ".join(f"{name} {probe['interval']:.0f} s" for name, probe in stats['probes'].items())
+            lines.append(f"Status probes: {stats['cpu_time'] * 1000:.0f} ms CPU{' (paused)' if stats['paused'] else ''}")
+            lines.append(f"    intervals: {intervals}")
+        messagebox.showinfo("View Statistics", "\n".join(lines))
     
     def show_dashboard(self):
         """Show dashboard"""
-        self.clear_main_area()
-        self.highlight_nav_button("Dashboard")
-        
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Dashboard", self.build_dashboard, self.refresh_dashboard)
+    
+    def build_dashboard(self, view):
+        """Build the dashboard view"""
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
         
         title = tk.Label(
@@ -375,6 +566,31 @@ class HachiControlCenter:
             cards_frame, "Controllers", "0/2", self.colors['text_dim']
         )
         
+        # Frame timing from the compositor logs
+        if self.frame_timing:
+            timing_frame = tk.Frame(container, bg=self.colors['bg_medium'])
+            timing_frame.pack(fill=tk.X, pady=(0, 20))
+            
+            timing_title = tk.Label(
+                timing_frame, text=f"Frame Timing ({self.frame_timing.frequency:.0f} Hz)",
+                font=('Arial', 16, 'bold'),
+                bg=self.colors['bg_medium'], fg=self.colors['text']
+            )
+            timing_title.pack(anchor=tk.W, padx=20, pady=(15, 5))
+            
+            self.frame_timing_label = tk.Label(
+                timing_frame, text="No compositor frames yet",
+                font=('Arial', 11), bg=self.colors['bg_medium'],
+                fg=self.colors['text_dim'], anchor=tk.W
+            )
+            self.frame_timing_label.pack(fill=tk.X, padx=20)
+            
+            self.frame_histogram_label = tk.Label(
+                timing_frame, text="", font=('Courier', 9), justify=tk.LEFT,
+                bg=self.colors['bg_medium'], fg=self.colors['text_dim'], anchor=tk.W
+            )
+            self.frame_histogram_label.pack(fill=tk.X, padx=20, pady=(5, 15))
+        
         # Quick actions
         actions_frame = tk.Frame(container, bg=self.colors['bg_medium'])
         actions_frame.pack(fill=tk.BOTH, expand=True)
@@ -403,12 +619,44 @@ class HachiControlCenter:
             self.pair_controllers, 25
         ).pack(side=tk.LEFT, padx=5)
     
+    def refresh_dashboard(self):
+        """Update the dashboard's status cards"""
+        if self.device_connected:
+            self.update_widget(self.headset_card, text="● Connected", fg=self.colors['status_good'])
+        else:
+            self.update_widget(self.headset_card, text="● Disconnected", fg=self.colors['status_error'])
+        
+        if self.finger_tracking_active:
+            self.update_widget(self.finger_card, text="Active", fg=self.colors['status_good'])
+        else:
+            self.update_widget(self.finger_card, text="Disabled", fg=self.colors['text_dim'])
+        
+        if self.frame_timing:
+            self.refresh_frame_timing(self.frame_timing.stats())
+    
+    def refresh_frame_timing(self, stats):
+        """Show rolling frame-time percentiles (collector thread or Tk)"""
+        if self.current_view != "Dashboard":
+            return
+        if not stats["frames"]:
+            color = self.colors['text_dim']
+        elif stats["missed_rate"] < 0.01:
+            color = self.colors['status_good']
+        elif stats["missed_rate"] < 0.05:
+            color = self.colors['status_warning']
+        else:
+            color = self.colors['status_error']
+        self.update_widget(self.frame_timing_label, text=format_stats(stats), fg=color)
+        histogram = format_histogram(self.frame_timing.histogram(), stats["vsync_ms"]) if stats["frames"] else ""
+        self.update_widget(self.frame_histogram_label, text=histogram)
+    
     def show_finger_tracking(self):
         """Show finger tracking configuration"""
-        self.clear_main_area()
-        self.highlight_nav_button("Finger Tracking")
-        
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Finger Tracking", self.build_finger_tracking, self.refresh_finger_tracking)
+    
+    def build_finger_tracking(self, view):
+        """Build the finger tracking view"""
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
         
         title = tk.Label(
@@ -442,13 +690,11 @@ class HachiControlCenter:
             bg=self.colors['bg_medium'], fg=self.colors['text'], pady=15
         ).pack(anchor=tk.W, padx=20)
         
-        status_text = "Active ✓" if self.finger_tracking_active else "Inactive"
-        status_color = self.colors['status_good'] if self.finger_tracking_active else self.colors['text_dim']
-        
+        # Text and color are set by refresh_finger_tracking
         self.ft_status_label = tk.Label(
-            status_frame, text=f"Status: {status_text}",
+            status_frame, text="Status: Inactive",
             font=('Arial', 12),
-            bg=self.colors['bg_medium'], fg=status_color
+            bg=self.colors['bg_medium'], fg=self.colors['text_dim']
         )
         self.ft_status_label.pack(anchor=tk.W, padx=40, pady=(0, 15))
         
@@ -465,16 +711,11 @@ class HachiControlCenter:
         btn_frame = tk.Frame(controls_frame, bg=self.colors['bg_medium'])
         btn_frame.pack(padx=20, pady=(0, 15))
         
-        if self.finger_tracking_active:
-            self.create_styled_button(
-                btn_frame, "Disable Finger Tracking",
-                self.disable_finger_tracking, 30
-            ).pack(side=tk.LEFT, padx=5)
-        else:
-            self.create_styled_button(
-                btn_frame, "Enable Finger Tracking",
-                self.enable_finger_tracking, 30
-            ).pack(side=tk.LEFT, padx=5)
+        self.ft_toggle_button = self.create_styled_button(
+            btn_frame, "Enable Finger Tracking",
+            self.toggle_finger_tracking, 30
+        )
+        self.ft_toggle_button.pack(side=tk.LEFT, padx=5)
         
         self.create_styled_button(
             btn_frame, "Calibrate Hands",
@@ -573,12 +814,22 @@ Notes:
 """)
         info_text.config(state=tk.DISABLED)
     
+    def refresh_finger_tracking(self):
+        """Update the finger tracking status and toggle button"""
+        if self.finger_tracking_active:
+            self.update_widget(self.ft_status_label, text="Status: Active ✓", fg=self.colors['status_good'])
+            self.update_widget(self.ft_toggle_button, text="Disable Finger Tracking")
+        else:
+            self.update_widget(self.ft_status_label, text="Status: Inactive", fg=self.colors['text_dim'])
+            self.update_widget(self.ft_toggle_button, text="Enable Finger Tracking")
+    
     def show_tracking(self):
         """Show tracking configuration"""
-        self.clear_main_area()
-        self.highlight_nav_button("Tracking")
-        
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Tracking", self.build_tracking)
+    
+    def build_tracking(self, view):
+        """Build the tracking view"""
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
         
         title = tk.Label(
@@ -619,10 +870,11 @@ Notes:
     
     def show_controllers(self):
         """Show controller configuration"""
-        self.clear_main_area()
-        self.highlight_nav_button("Controllers")
-        
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Controllers", self.build_controllers)
+    
+    def build_controllers(self, view):
+        """Build the controllers view"""
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
         
         title = tk.Label(
@@ -656,10 +908,11 @@ Notes:
     
     def show_display(self):
         """Show display settings"""
-        self.clear_main_area()
-        self.highlight_nav_button("Display")
-        
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Display", self.build_display)
+    
+    def build_display(self, view):
+        """Build the display view"""
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
         
         title = tk.Label(
@@ -685,10 +938,11 @@ Notes:
     
     def show_firmware(self):
         """Show firmware management"""
-        self.clear_main_area()
-        self.highlight_nav_button("Firmware")
-        
-        container = tk.Frame(self.main_area, bg=self.colors['bg_dark'])
+        self.show_view("Firmware", self.build_firmware)
+    
+    def build_firmware(self, view):
+        """Build the firmware view"""
+        container = tk.Frame(view, bg=self.colors['bg_dark'])
         container.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
         
         title = tk.Label(
@@ -738,6 +992,53 @@ Notes:
     
     def start_monitoring(self):
         """Start background monitoring"""
+        # Compositor frame times are tailed from the VR logs
+        self.frame_timing = None
+        if FrameTimingCollector:
+            self.frame_timing = FrameTimingCollector()
+            self.frame_timing.subscribe(self.refresh_frame_timing)
+            self.frame_timing.start()
+        
+        # One status service runs the probes for every window in the process
+        self.status_service = None
+        self.probe_scheduler = None
+        
+        # With hachid running the probes and VR processes live there and are
+        # shared with every other window; this one only draws what it pushes.
+        # Without one this window runs its own probes; no daemon is started
+        # that it would not use
+        self.daemon = None
+        if connect_status and get_status_service:
+            self.daemon, self.status_service = connect_status()
+        if self.status_service is None and get_status_service:
+            self.status_service = get_status_service()
+        
+        if self.status_service:
+            self.usb_monitor = self.status_service.usb_monitor
+            self.status_service.subscribe(lambda snapshot: self.check_device_status())
+            if ProbeScheduler:
+                watch_window(self.root, self.status_service)
+            self.check_device_status()
+            return
+        
+        # Headset plug/unplug is pushed by the kernel; no lsusb polling needed
+        self.usb_monitor = None
+        if UsbHotplugMonitor:
+            self.usb_monitor = UsbHotplugMonitor()
+            self.usb_monitor.subscribe(lambda event: self.check_device_status())
+            self.usb_monitor.start()
+        
+        # The check backs off while nothing changes and stops while iconified
+        if ProbeScheduler:
+            self.probe_scheduler = ProbeScheduler()
+            self.probe_scheduler.add(
+                'device', self.check_device_status, 2.0, 30.0 if self.usb_monitor else 10.0,
+                state=lambda: (self.device_connected, self.finger_tracking_active)
+            )
+            self.probe_scheduler.start()
+            watch_window(self.root, self.probe_scheduler)
+            return
+        
         def monitor():
             while True:
                 self.check_device_status()
@@ -749,35 +1050,61 @@ Notes:
     def check_device_status(self):
         """Check device status"""
         try:
-            result = subprocess.run(['lsusb'], capture_output=True, text=True)
-            self.device_connected = '0bb4:0313' in result.stdout
+            if self.status_service:
+                self.device_connected = usb_connected(self.status_service.snapshot, 0x0bb4, 0x0313)
+            elif self.usb_monitor:
+                self.device_connected = self.usb_monitor.is_connected(0x0bb4, 0x0313)
+            else:
+                result = subprocess.run(['lsusb'], capture_output=True, text=True)
+                self.device_connected = '0bb4:0313' in result.stdout
             
             if self.device_connected:
-                self.status_label.config(
+                self.update_widget(
+                    self.status_label,
                     text="● Headset Connected",
                     fg=self.colors['status_good']
                 )
             else:
-                self.status_label.config(
+                self.update_widget(
+                    self.status_label,
                     text="● Headset Disconnected",
                     fg=self.colors['status_error']
                 )
             
             # Update finger tracking status
             if self.finger_tracking_active:
-                self.finger_tracking_label.config(
+                self.update_widget(
+                    self.finger_tracking_label,
                     text="✋ Finger Tracking: Active",
                     fg=self.colors['status_good']
                 )
             else:
-                self.finger_tracking_label.config(
+                self.update_widget(
+                    self.finger_tracking_label,
                     text="✋ Finger Tracking: Disabled",
                     fg=self.colors['text_dim']
                 )
+            
+            # Only the visible view is kept current; others refresh when shown
+            self.refresh_view()
         except:
             pass
     
+    def update_widget(self, widget, **options):
+        """Configure a widget from any thread"""
+        if self.ui:
+            self.ui.config(widget, **options)
+        else:
+            widget.config(**options)
+    
     # Finger tracking methods
+    def toggle_finger_tracking(self):
+        """Enable or disable finger tracking, whichever applies"""
+        if self.finger_tracking_active:
+            self.disable_finger_tracking()
+        else:
+            self.enable_finger_tracking()
+    
     def enable_finger_tracking(self):
         """Enable finger tracking"""
         result = messagebox.askyesno(
@@ -797,19 +1124,24 @@ Notes:
     def _enable_finger_tracking_thread(self):
         """Enable finger tracking in background"""
         try:
-            # Create finger tracking script if it doesn't exist
+            # Create finger tracking script if it doesn't exist or is outdated
             ft_script = self.config_dir / "finger_tracking.py"
-            if not ft_script.exists():
+            if self.finger_tracking_module_outdated(ft_script):
                 self.create_finger_tracking_module()
             
-            # Launch finger tracking module
-            subprocess.Popen(['python3', str(ft_script)])
+            # Launch finger tracking module. Setting changes reach it through
+            # config.json, so it is never restarted for them
+            if self.daemon:
+                self.daemon.call('session.start', name='finger_tracking')
+            elif self.finger_tracking_process is None or self.finger_tracking_process.poll() is not None:
+                self.finger_tracking_process = subprocess.Popen(['python3', str(ft_script)])
             
             self.finger_tracking_active = True
             self.config['finger_tracking_enabled'] = True
             self.save_config()
             
             self.status_bar_label.config(text="Finger tracking enabled!")
+            self.refresh_view()
             
         except Exception as e:
             self.status_bar_label.config(text=f"Failed to enable finger tracking: {e}")
@@ -820,10 +1152,27 @@ Notes:
         self.config['finger_tracking_enabled'] = False
         self.save_config()
         
-        # Kill finger tracking process
-        subprocess.run(['pkill', '-f', 'finger_tracking.py'], check=False)
+        # Stop the tracker we started; pkill only for one left by an earlier session
+        process = self.finger_tracking_process
+        self.finger_tracking_process = None
+        if self.daemon:
+            try:
+                stopped = self.daemon.call('session.stop', name='finger_tracking')
+            except HachidError:
+                stopped = False
+            if not stopped:
+                subprocess.run(['pkill', '-f', 'finger_tracking.py'], check=False)
+        elif process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=3)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        else:
+            subprocess.run(['pkill', '-f', 'finger_tracking.py'], check=False)
         
         self.status_bar_label.config(text="Finger tracking disabled")
+        self.refresh_view()
         messagebox.showinfo("Success", "Finger tracking has been disabled")
     
     def calibrate_finger_tracking(self):
@@ -862,6 +1211,20 @@ Notes:
         self.config['hand_model'] = self.hand_model_var.get()
         self.save_config()
     
+    # Bump when the generated module changes so old copies get replaced
+    FINGER_TRACKING_MODULE_VERSION = 7
+    
+    def finger_tracking_module_outdated(self, ft_script):
+        """Check whether the generated tracker needs to be (re)written"""
+        if not ft_script.exists():
+            return True
+        
+        header = ft_script.read_text(errors='ignore')[:400]
+        if "HACHI Finger Tracking Module" not in header:
+            # Not ours (e.g. the HACHI-Complete tracker) - leave it alone
+            return False
+        return f"Module version: {self.FINGER_TRACKING_MODULE_VERSION}" not in header
+    
     def create_finger_tracking_module(self):
         """Create the finger tracking Python module"""
         ft_script = self.config_dir / "finger_tracking.py"
@@ -870,25 +1233,377 @@ Notes:
 """
 HACHI Finger Tracking Module
 Experimental hand and finger tracking using Cosmos cameras
+Module version: 7
 """
 
 import cv2
 import numpy as np
+import os
 import time
 import json
+import threading
+from collections import deque
 from pathlib import Path
 
+CONFIG_DIR = Path.home() / ".local" / "share" / "hachi"
+DEFAULT_MODEL = CONFIG_DIR / "models" / "hand_detector.onnx"
+
+def config_stamp():
+    """Modification stamp of config.json, None if it is missing"""
+    try:
+        stat = os.stat(CONFIG_DIR / "config.json")
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def read_config():
+    config_file = CONFIG_DIR / "config.json"
+    if config_file.exists():
+        with open(config_file) as f:
+            return json.load(f)
+    return {
+        "finger_tracking_sensitivity": 0.7,
+        "hand_model": "basic"
+    }
+
+class SkinDetector:
+    """HSV skin thresholding"""
+    
+    name = "skin"
+    
+    def __init__(self, config):
+        # Skin color range (adjust as needed)
+        self.lower_skin = np.array([0, 20, 70], dtype=np.uint8)
+        self.upper_skin = np.array([20, 255, 255], dtype=np.uint8)
+        self.kernel = np.ones((5, 5), np.uint8)
+        self.stacks = {}
+    
+    def threshold(self, frame):
+        """Raw skin mask; per pixel, so a stack of frames can go at once"""
+        # Convert to HSV for skin detection
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        
+        # Create mask
+        return cv2.inRange(hsv, self.lower_skin, self.upper_skin)
+    
+    def clean(self, mask):
+        """Close holes and drop specks in the mask of a single frame"""
+        # Morphology treats the image border specially, so it must see each
+        # frame's own edges rather than its neighbours in a stack
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel)
+        return cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
+    
+    def segment(self, frame):
+        """Skin mask of a frame"""
+        return self.clean(self.threshold(frame))
+    
+    def contours(self, mask, min_area=5000):
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        return [contour for contour in contours if cv2.contourArea(contour) > min_area]
+    
+    def detect(self, frame, min_area=5000):
+        mask = self.segment(frame)
+        return self.contours(mask, min_area), mask
+    
+    def detect_batch(self, frames):
+        """Detect in several frames with one thresholding pass per format
+        
+        Frames of the same shape are copied into one contiguous stack, so
+        colour conversion and thresholding run once over all of them.
+        Morphology and contour extraction run per frame on views of the
+        stacked mask, which gives exactly the masks detect() does.
+        """
+        results = [None] * len(frames)
+        groups = {}
+        for i, frame in enumerate(frames):
+            groups.setdefault(frame.shape, []).append(i)
+        
+        for shape, indices in groups.items():
+            if len(indices) == 1:
+                results[indices[0]] = self.detect(frames[indices[0]])
+                continue
+            
+            height = shape[0]
+            key = (shape, len(indices))
+            stack = self.stacks.get(key)
+            if stack is None:
+                stack = np.zeros((height * len(indices),) + shape[1:], dtype=np.uint8)
+                self.stacks[key] = stack
+            
+            for row, i in enumerate(indices):
+                stack[row * height:(row + 1) * height] = frames[i]
+            
+            mask = self.threshold(stack)
+            for row, i in enumerate(indices):
+                frame_mask = self.clean(mask[row * height:(row + 1) * height])
+                results[i] = (self.contours(frame_mask), frame_mask)
+        
+        return results
+
+class OnnxDetector:
+    """Learned hand detector run on the CPU through onnxruntime
+    
+    Loads a local model (finger_tracking_model) taking float32 NCHW RGB in
+    0..1 and returning (N, 5) rows of normalised x1, y1, x2, y2, score.
+    Hand contours come from the skin mask inside each box.
+    """
+    
+    name = "onnx"
+    
+    def __init__(self, config):
+        import onnxruntime
+        
+        model = Path(config.get("finger_tracking_model", str(DEFAULT_MODEL))).expanduser()
+        if not model.exists():
+            raise FileNotFoundError(f"model not found: {model}")
+        
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = config.get("finger_tracking_detector_threads", 2)
+        self.session = onnxruntime.InferenceSession(
+            str(model), options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        height, width = model_input.shape[2:4]
+        self.size = (
+            width if isinstance(width, int) else 192,
+            height if isinstance(height, int) else 192
+        )
+        self.threshold = config.get("finger_tracking_detector_threshold", 0.5)
+        self.skin = SkinDetector(config)
+    
+    def detect(self, frame):
+        h, w = frame.shape[:2]
+        blob = cv2.dnn.blobFromImage(frame, 1.0 / 255, self.size, swapRB=True)
+        output = np.asarray(self.session.run(None, {self.input_name: blob})[0], dtype=np.float32)
+        
+        hands = []
+        mask = np.zeros((h, w), np.uint8)
+        for x1, y1, x2, y2, score in output.reshape(-1, output.shape[-1])[:, :5]:
+            if score < self.threshold:
+                continue
+            x0, y0 = max(0, int(x1 * w)), max(0, int(y1 * h))
+            x3, y3 = min(w, int(x2 * w)), min(h, int(y2 * h))
+            if x3 <= x0 or y3 <= y0:
+                continue
+            
+            roi_hands, roi_mask = self.skin.detect(frame[y0:y3, x0:x3], min_area=0)
+            mask[y0:y3, x0:x3] = roi_mask
+            offset = np.array([x0, y0], dtype=np.int32)
+            hands.extend(contour + offset for contour in roi_hands)
+        
+        return hands, mask
+    
+    def detect_batch(self, frames):
+        return [self.detect(frame) for frame in frames]
+
+# Selected with "finger_tracking_detector" in config.json
+DETECTORS = {
+    "skin": SkinDetector,
+    "onnx": OnnxDetector,
+}
+
+def create_detector(config):
+    name = config.get("finger_tracking_detector", "skin")
+    try:
+        return DETECTORS[name](config)
+    except Exception as e:
+        print(f"Detector {name} unavailable ({e}), using skin detector")
+        return SkinDetector(config)
+
+def benchmark(path, max_frames=300):
+    """Replay a recording (video or .npy) through every detector backend"""
+    if path.endswith(".npy"):
+        frames = list(np.load(path)[:max_frames])
+    else:
+        frames = []
+        capture = cv2.VideoCapture(path)
+        while len(frames) < max_frames:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            frames.append(frame)
+        capture.release()
+    
+    if not frames:
+        print(f"No frames could be read from {path}")
+        return
+    
+    config = read_config()
+    for name, backend in DETECTORS.items():
+        try:
+            detector = backend(config)
+        except Exception as e:
+            print(f"{name:>8}: unavailable ({e})")
+            continue
+        
+        detector.detect(frames[0])
+        start = time.perf_counter()
+        for frame in frames:
+            detector.detect(frame)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8}: {len(frames) / elapsed:7.1f} fps  "
+              f"{elapsed * 1000 / len(frames):6.2f} ms/frame  ({len(frames)} frames)")
+        
+        # Same frames as if four cameras delivered them together
+        batches = [frames[i:i + 4] for i in range(0, len(frames) - 3, 4)]
+        if batches:
+            # Batching is only an optimisation: the masks must not change
+            different = sum(
+                not np.array_equal(batched[1], detector.detect(frame)[1])
+                for batch in batches
+                for batched, frame in zip(detector.detect_batch(batch), batch)
+            )
+            if different:
+                print(f"{name:>8}: batched masks differ from per-frame ones in "
+                      f"{different} of {4 * len(batches)} frames")
+            
+            start = time.perf_counter()
+            for batch in batches:
+                detector.detect_batch(batch)
+            elapsed = time.perf_counter() - start
+            count = 4 * len(batches)
+            print(f"{name:>8}: {count / elapsed:7.1f} fps  "
+                  f"{elapsed * 1000 / count:6.2f} ms/frame  (batches of 4)")
+
+class CameraReader:
+    """Reads one camera on its own thread and keeps only the newest frame"""
+    
+    def __init__(self, index, capture):
+        self.index = index
+        self.capture = capture
+        self.frame = None
+        self.timestamp = (0.0, 0.0)  # Device and host time of the frame
+        self.sequence = 0
+        self.fps = 0
+        self.running = True
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+    
+    def loop(self):
+        frame_count = 0
+        last_fps_time = time.time()
+        while self.running:
+            ret, frame = self.capture.read()
+            if not ret:
+                time.sleep(0.05)
+                continue
+            received = time.perf_counter()
+            device_time = self.capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            with self.lock:
+                self.frame = frame
+                self.timestamp = (device_time, received)
+                self.sequence += 1
+            
+            frame_count += 1
+            if time.time() - last_fps_time >= 1.0:
+                self.fps = frame_count
+                frame_count = 0
+                last_fps_time = time.time()
+    
+    def latest(self):
+        with self.lock:
+            return self.sequence, self.frame, self.timestamp
+    
+    def stop(self):
+        self.running = False
+        self.thread.join(timeout=1.0)
+        self.capture.release()
+
+class HandFusion:
+    """Confidence-weighted merge of per-camera hand observations
+    
+    Only the latest observation per camera and hand is kept, so fusing costs
+    the same every frame. Capture times are aligned to the host clock and
+    old observations fade out, so a slow camera never holds up the output.
+    Positions are pixels in each camera's own view and there is no mapping
+    between views, so only detection and confidence are merged; the position
+    is the best camera's, tagged with that camera.
+    """
+    
+    def __init__(self, max_age=0.1, half_life=0.033):
+        self.max_age = max_age
+        self.half_life = half_life
+        self.slots = {}
+        self.offsets = {}
+    
+    def align(self, camera, device_time, host_time):
+        """Capture time of a frame on the host clock"""
+        if not device_time:
+            return host_time
+        offsets = self.offsets.setdefault(camera, deque(maxlen=120))
+        offsets.append(host_time - device_time)
+        # Delivery delay only adds to the offset; the smallest is closest
+        return device_time + min(offsets)
+    
+    def observe(self, camera, side, hand, timestamp):
+        self.slots[(camera, side)] = (timestamp, hand)
+    
+    def fuse(self, now):
+        fused = {}
+        for side in ("left", "right"):
+            missed = 1.0
+            cameras = 0
+            best, best_camera, best_weight = None, None, 0.0
+            for (camera, slot_side), (timestamp, hand) in self.slots.items():
+                age = max(0.0, now - timestamp)
+                if slot_side != side or hand is None or age > self.max_age:
+                    continue
+                weight = hand["confidence"] * 0.5 ** (age / self.half_life)
+                missed *= 1.0 - min(hand["confidence"], 1.0)
+                cameras += 1
+                if weight > best_weight:
+                    best, best_camera, best_weight = hand, camera, weight
+            
+            if best is None:
+                fused[side] = None
+                continue
+            fused[side] = {
+                "position": best["position"],
+                "camera": best_camera,
+                "confidence": 1.0 - missed,
+                "cameras": cameras
+            }
+        return fused
+
+def hand_observation(contour, sensitivity):
+    """Centroid and confidence of one hand contour"""
+    M = cv2.moments(contour)
+    if M["m00"] == 0:
+        return None
+    return {
+        "position": (int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"])),
+        "confidence": min(1.0, cv2.contourArea(contour) / 100000) * sensitivity
+    }
+
 class FingerTracker:
+    # Settings that need a new detector when they change
+    DETECTOR_KEYS = (
+        "finger_tracking_detector",
+        "finger_tracking_model",
+        "finger_tracking_detector_threshold",
+        "finger_tracking_detector_threads",
+    )
+    
     def __init__(self):
-        self.config_dir = Path.home() / ".local" / "share" / "hachi"
+        self.config_dir = CONFIG_DIR
+        self.config_stamp = config_stamp()
+        self.last_config_check = time.monotonic()
         self.load_config()
+        self.detector = create_detector(self.config)
+        self.fusion = HandFusion(self.config.get("finger_tracking_fusion_max_age", 0.1))
+        
+        # Stacked segmentation pays off with several cores; compare both
+        # with --benchmark and turn it off where it does not
+        self.batch = self.config.get("finger_tracking_batch_segmentation", True)
         
         # Try to open Cosmos cameras
         self.cameras = []
         for i in range(5):  # Try first 5 video devices
             cap = cv2.VideoCapture(i)
             if cap.isOpened():
-                self.cameras.append(cap)
+                self.cameras.append(CameraReader(i, cap))
         
         print(f"Found {len(self.cameras)} cameras")
         
@@ -900,95 +1615,147 @@ class FingerTracker:
         self.running = True
     
     def load_config(self):
-        config_file = self.config_dir / "config.json"
-        if config_file.exists():
-            with open(config_file) as f:
-                self.config = json.load(f)
-        else:
-            self.config = {
-                "finger_tracking_sensitivity": 0.7,
-                "hand_model": "basic"
-            }
+        self.config = read_config()
     
-    def detect_hands(self, frame):
-        """Basic hand detection using color and contours"""
-        # Convert to HSV for skin detection
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        
-        # Skin color range (adjust as needed)
-        lower_skin = np.array([0, 20, 70], dtype=np.uint8)
-        upper_skin = np.array([20, 255, 255], dtype=np.uint8)
-        
-        # Create mask
-        mask = cv2.inRange(hsv, lower_skin, upper_skin)
-        
-        # Apply morphological operations
-        kernel = np.ones((5, 5), np.uint8)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+    def check_config(self):
+        """Apply config.json edits between passes, without reopening cameras"""
+        now = time.monotonic()
+        if now - self.last_config_check < 0.5:
+            return
+        self.last_config_check = now
         
-        # Find contours
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        stamp = config_stamp()
+        if stamp is None or stamp == self.config_stamp:
+            return
+        self.config_stamp = stamp
         
-        hands = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > 5000:  # Minimum hand size
-                hands.append(contour)
+        try:
+            config = read_config()
+        except (OSError, ValueError):
+            # Half-written; the finished write changes the stamp again
+            return
         
-        return hands, mask
+        old = self.config
+        self.config = config
+        if any(old.get(key) != config.get(key) for key in self.DETECTOR_KEYS):
+            self.detector = create_detector(config)
+        self.fusion.max_age = config.get("finger_tracking_fusion_max_age", 0.1)
+        self.batch = config.get("finger_tracking_batch_segmentation", True)
+        print("Configuration reloaded")
+    
+    def detect_hands(self, frame):
+        """Hand detection with the configured backend"""
+        return self.detector.detect(frame)
+    
+    def observe(self, camera, hands, frame_width, timestamp):
+        """Feed one camera's detections to the fusion stage"""
+        sensitivity = self.config.get("finger_tracking_sensitivity", 0.7)
+        found = [obs for obs in (hand_observation(h, sensitivity) for h in hands) if obs]
+        found.sort(key=lambda obs: obs["confidence"], reverse=True)
+        found = sorted(found[:2], key=lambda obs: obs["position"][0])
+        
+        left = right = None
+        if len(found) == 2:
+            left, right = found
+        elif found and found[0]["position"][0] < frame_width // 2:
+            left = found[0]
+        elif found:
+            right = found[0]
+        
+        self.fusion.observe(camera, "left", left, timestamp)
+        self.fusion.observe(camera, "right", right, timestamp)
+    
+    def draw_hands(self, frame, camera, hands, fused):
+        for hand in hands:
+            # Draw contour
+            cv2.drawContours(frame, [hand], -1, (0, 255, 0), 2)
+            
+            # Find convex hull (rough finger detection)
+            hull = cv2.convexHull(hand, returnPoints=False)
+            defects = cv2.convexityDefects(hand, hull)
+            
+            if defects is not None:
+                for i in range(defects.shape[0]):
+                    s, e, f, d = defects[i, 0]
+                    far = tuple(hand[f][0])
+                    
+                    # Draw finger points
+                    cv2.circle(frame, far, 5, (0, 0, 255), -1)
+        
+        # Fused hand state from all cameras, marked where this camera sees the hand
+        for row, side in enumerate(("left", "right")):
+            hand = fused[side]
+            if hand is None:
+                continue
+            _, own = self.fusion.slots.get((camera, side), (0, None))
+            if own is not None:
+                cv2.circle(frame, own["position"], 10, (255, 255, 0), 2)
+            cv2.putText(frame, f"{side}: {hand['confidence']:.2f} ({hand['cameras']} cams)",
+                        (10, 30 + 25 * row), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
     
     def run(self):
         """Main tracking loop"""
         print("Finger tracking started!")
         print("Press 'q' to quit")
         
+        # Cameras are read on their own threads; each pass handles whichever
+        # ones have a new frame, so a slow camera never stalls the others
+        seen = {reader.index: 0 for reader in self.cameras}
         while self.running and self.cameras:
-            for camera in self.cameras:
-                ret, frame = camera.read()
-                if not ret:
+            self.check_config()
+            fresh = []
+            for reader in self.cameras:
+                sequence, frame, (device_time, received) = reader.latest()
+                if frame is None or sequence == seen[reader.index]:
                     continue
-                
-                # Detect hands
-                hands, mask = self.detect_hands(frame)
-                
-                # Draw detected hands
-                for hand in hands:
-                    # Draw contour
-                    cv2.drawContours(frame, [hand], -1, (0, 255, 0), 2)
-                    
-                    # Find convex hull (rough finger detection)
-                    hull = cv2.convexHull(hand, returnPoints=False)
-                    defects = cv2.convexityDefects(hand, hull)
-                    
-                    if defects is not None:
-                        for i in range(defects.shape[0]):
-                            s, e, f, d = defects[i, 0]
-                            start = tuple(hand[s][0])
-                            end = tuple(hand[e][0])
-                            far = tuple(hand[f][0])
-                            
-                            # Draw finger points
-                            cv2.circle(frame, far, 5, (0, 0, 255), -1)
+                seen[reader.index] = sequence
+                timestamp = self.fusion.align(reader.index, device_time, received)
+                fresh.append((reader.index, frame, timestamp))
+            
+            if not fresh:
+                time.sleep(0.002)
+                continue
+            
+            # Detect hands in all new frames at once
+            frames = [frame for _, frame, _ in fresh]
+            if self.batch:
+                results = self.detector.detect_batch(frames)
+            else:
+                results = [self.detect_hands(frame) for frame in frames]
+            for (index, frame, timestamp), (hands, mask) in zip(fresh, results):
+                self.observe(index, hands, frame.shape[1], timestamp)
+            
+            fused = self.fusion.fuse(time.perf_counter())
+            for (index, frame, _), (hands, mask) in zip(fresh, results):
+                self.draw_hands(frame, index, hands, fused)
                 
                 # Show frame
-                cv2.imshow('HACHI Finger Tracking', frame)
-                cv2.imshow('Hand Mask', mask)
-                
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    self.running = False
-                    break
+                cv2.imshow(f'HACHI Finger Tracking {index}', frame)
+                cv2.imshow(f'Hand Mask {index}', mask)
+            
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                self.running = False
         
         # Cleanup
-        for camera in self.cameras:
-            camera.release()
+        for reader in self.cameras:
+            reader.stop()
         cv2.destroyAllWindows()
         print("Finger tracking stopped")
 
 if __name__ == "__main__":
-    tracker = FingerTracker()
-    if tracker.cameras:
-        tracker.run()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="HACHI finger tracking")
+    parser.add_argument("--benchmark", metavar="FILE",
+                        help="replay a recording through the detector backends")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark(args.benchmark)
+    else:
+        tracker = FingerTracker()
+        if tracker.cameras:
+            tracker.run()
 '''
         
         with open(ft_script, 'w') as f:
@@ -1000,9 +1767,21 @@ if __name__ == "__main__":
     def launch_vr(self):
         """Launch VR"""
         self.status_bar_label.config(text="Launching VR session...")
+        if self.daemon:
+            # Started by the daemon, so the session outlives this window
+            threading.Thread(target=self._launch_vr_session, daemon=True).start()
+            return
         threading.Thread(target=lambda: subprocess.Popen(['bash', '-c', 'vr_manager.sh']), 
                         daemon=True).start()
     
+    def _launch_vr_session(self):
+        try:
+            self.daemon.call('session.start', name='vr_manager')
+        except HachidError as e:
+            self.update_widget(self.status_bar_label, text=f"Failed to launch VR: {e}")
+            return
+        self.update_widget(self.status_bar_label, text="VR session launched")
+    
     def configure_tracking(self, mode):
         """Configure tracking"""
         self.status_bar_label.config(text=f"Configuring: {mode}")
@@ -1033,7 +1812,12 @@ if __name__ == "__main__":
     
     def launch_perf_monitor(self):
         """Launch performance monitor"""
-        subprocess.Popen(['bash', '-c', 'vr-perf-monitor.sh'])
+        if PerfMonitor:
+            monitor = PerfMonitor()
+            monitor.start()
+            open_perf_window(monitor, self.root)
+        else:
+            subprocess.Popen(['bash', '-c', 'vr-perf-monitor.sh'])
     
     def show_logs(self):
         """Show logs"""
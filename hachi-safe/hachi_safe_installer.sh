@@ -235,7 +235,7 @@ else
 fi
 
 # Copy other tools
-for file in enhanced_tracking.py controller_manager.py cosmos_monitor.py; do
+for file in enhanced_tracking.py controller_manager.py cosmos_monitor.py hotplug.py process_watcher.py hachi_status.py ui_dispatch.py display_probe.py hardware_profile.py log_viewer.py log_index.py perf_monitor.py frame_timing.py probe_scheduler.py hachid.py; do
     if [ -f "$SCRIPT_DIR/$file" ]; then
         cp "$SCRIPT_DIR/$file" "$BIN_DIR/"
         chmod +x "$BIN_DIR/$file"
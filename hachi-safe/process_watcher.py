@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+HACHI Process Watcher
+Finds VR runtime processes through /proc instead of forking pgrep
+"""
+
+import os
+import select
+import threading
+import time
+
+# Processes the control centers care about (comm or argv[0] basename)
+VR_PROCESSES = ("monado-service", "vrserver", "vrcompositor", "cosmos_bridge")
+
+# /proc/<pid>/stat states of processes that have exited but not been reaped
+DEAD_STATES = (b"Z", b"X")
+
+class ProcessWatcher:
+    """Running VR processes with per-process CPU and RSS
+    
+    Each scan lists /proc once and reads each process's stat. A PID is only
+    identified again when the start time or comm in its stat changes, so a
+    reused PID or a launcher that execs into a VR runtime is noticed, while
+    cmdline is read just once per process. Watched processes are held through pidfds, which makes
+    an exit visible the moment it happens rather than on the next scan.
+    Subscribers are called with {type: "started"/"exited", name, pid, time}.
+    """
+    
+    def __init__(self, names=VR_PROCESSES, interval=2.0, proc_root="/proc"):
+        self.names = tuple(names)
+        self.interval = interval
+        self.proc_root = proc_root
+        self.running = False
+        self.thread = None
+        
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        
+        # pid -> info dict for watched processes
+        self.processes = {}
+        
+        # PID cache: pid -> ((starttime, comm), watched name or None)
+        self._cache = {}
+        self._pidfds = {}
+        self._poller = select.poll()
+        self._subscribers = []
+        self._lock = threading.Lock()
+    
+    def _read(self, pid, entry):
+        with open(f"{self.proc_root}/{pid}/{entry}", "rb") as f:
+            return f.read()
+    
+    def _identify(self, pid, comm):
+        """Watched name of a process, or None"""
+        comm = comm.decode(errors="replace")
+        if comm in self.names:
+            return comm
+        
+        # comm is cut to 15 characters and may name a wrapper; try argv[0]
+        try:
+            argv0 = self._read(pid, "cmdline").split(b"\0", 1)[0]
+        except OSError:
+            return None
+        name = os.path.basename(argv0.decode(errors="replace"))
+        return name if name in self.names else None
+    
+    def _read_stat(self, pid):
+        """(starttime, comm), state letter and utime + stime in clock ticks"""
+        data = self._read(pid, "stat")
+        # comm may contain spaces or parentheses; fields resume after the last ")"
+        end = data.rindex(b")")
+        comm = data[data.index(b"(") + 1:end]
+        fields = data[end + 2:].split()
+        return (int(fields[19]), comm), fields[0], int(fields[11]) + int(fields[12])
+    
+    def _track(self, pid, name, now, state, ticks):
+        """Start following a newly found watched process"""
+        if state in DEAD_STATES:
+            # An unreaped zombie: its pidfd would be readable straight away
+            return None
+        
+        info = {
+            "pid": pid,
+            "name": name,
+            "started": now,
+            "ticks": ticks,
+            "sampled": now,
+            "cpu_percent": 0.0,
+            "rss": 0,
+            "pidfd": None
+        }
+        self._sample_rss(info)
+        
+        # pidfd_open needs Linux 5.3; older kernels notice exits on the next scan
+        try:
+            fd = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            fd = None
+        if fd is not None:
+            info["pidfd"] = fd
+            self._pidfds[fd] = pid
+            self._poller.register(fd, select.POLLIN)
+        return info
+    
+    def _sample_rss(self, info):
+        try:
+            info["rss"] = int(self._read(info["pid"], "statm").split()[1]) * self.page_size
+        except (OSError, ValueError, IndexError):
+            pass
+    
+    def _sample(self, info, now, state, ticks):
+        """Update CPU use since the previous sample, and RSS; False once it has died"""
+        if state in DEAD_STATES:
+            return False
+        elapsed = now - info["sampled"]
+        if elapsed > 0:
+            info["cpu_percent"] = (ticks - info["ticks"]) / self.clock_ticks / elapsed * 100.0
+        info["ticks"] = ticks
+        info["sampled"] = now
+        self._sample_rss(info)
+        return True
+    
+    def _forget(self, pid):
+        """Stop following a process, returns its info"""
+        info = self.processes.pop(pid, None)
+        if info and info["pidfd"] is not None:
+            self._pidfds.pop(info["pidfd"], None)
+            try:
+                self._poller.unregister(info["pidfd"])
+            except KeyError:
+                pass
+            os.close(info["pidfd"])
+        return info
+    
+    def scan(self):
+        """Rescan /proc and sample the watched processes"""
+        now = time.monotonic()
+        try:
+            pids = {int(entry) for entry in os.listdir(self.proc_root) if entry.isdigit()}
+        except OSError:
+            return
+        
+        started, exited = [], []
+        with self._lock:
+            for pid in list(self._cache):
+                if pid not in pids:
+                    if pid in self.processes:
+                        exited.append(self._forget(pid))
+                    del self._cache[pid]
+            
+            for pid in pids:
+                try:
+                    key, state, ticks = self._read_stat(pid)
+                except (OSError, ValueError):
+                    continue
+                
+                cached = self._cache.get(pid)
+                if cached is None or cached[0] != key:
+                    # New, reused or exec'd into another program: identify it again
+                    if pid in self.processes:
+                        exited.append(self._forget(pid))
+                    self._cache[pid] = (key, self._identify(pid, key[1]))
+                name = self._cache[pid][1]
+                if name is None:
+                    continue
+                
+                info = self.processes.get(pid)
+                if info is None:
+                    info = self._track(pid, name, now, state, ticks)
+                    if info:
+                        self.processes[pid] = info
+                        started.append(info)
+                    else:
+                        # Zombie or gone; not looked at again while the pid is listed
+                        self._cache[pid] = (key, None)
+                elif not self._sample(info, now, state, ticks):
+                    exited.append(self._forget(pid))
+                    self._cache[pid] = (key, None)
+        
+        for info in exited:
+            self._publish("exited", info)
+        for info in started:
+            self._publish("started", info)
+    
+    def _process_exited(self, fd):
+        with self._lock:
+            pid = self._pidfds.get(fd)
+            info = self._forget(pid) if pid is not None else None
+            if info and pid in self._cache:
+                # /proc keeps listing the pid until its parent reaps it
+                self._cache[pid] = (self._cache[pid][0], None)
+        if info:
+            self._publish("exited", info)
+    
+    def is_running(self, name):
+        """Whether any process with this name is running"""
+        with self._lock:
+            return any(info["name"] == name for info in self.processes.values())
+    
+    def pids(self, name):
+        with self._lock:
+            return sorted(pid for pid, info in self.processes.items() if info["name"] == name)
+    
+    def stats(self):
+        """CPU and memory of the watched processes, by name"""
+        result = {name: [] for name in self.names}
+        with self._lock:
+            for info in self.processes.values():
+                result[info["name"]].append({
+                    "pid": info["pid"],
+                    "cpu_percent": info["cpu_percent"],
+                    "rss_mb": info["rss"] / (1024 * 1024),
+                    "uptime": time.monotonic() - info["started"]
+                })
+        return result
+    
+    def subscribe(self, callback):
+        """Call callback(event) when a watched process starts or exits"""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+    
+    def _publish(self, kind, info):
+        event = {"type": kind, "name": info["name"], "pid": info["pid"], "time": time.time()}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Process watcher subscriber failed: {e}")
+    
+    def start(self):
+        """Scan every interval seconds and report exits as they happen"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=self.interval + 1.0)
+        with self._lock:
+            for pid in list(self.processes):
+                self._forget(pid)
+                self._cache.pop(pid, None)
+    
+    def _run(self):
+        next_scan = 0.0
+        while self.running:
+            now = time.monotonic()
+            if now >= next_scan:
+                self.scan()
+                next_scan = now + self.interval
+            
+            # Sleep in poll() so a pidfd turning readable (exit) wakes us at once
+            timeout = max(0.0, next_scan - time.monotonic())
+            for fd, _ in self._poller.poll(timeout * 1000):
+                self._process_exited(fd)
+
+def find_processes(name, proc_root="/proc"):
+    """One-off lookup of the PIDs of a process, like pgrep -x"""
+    watcher = ProcessWatcher((name,), proc_root=proc_root)
+    watcher.scan()
+    pids = watcher.pids(name)
+    watcher.stop()
+    return pids
+
+# Show VR process usage if run directly
+if __name__ == "__main__":
+    watcher = ProcessWatcher()
+    watcher.subscribe(lambda event: print(f"{event['type']:>8}: {event['name']} (pid {event['pid']})"))
+    watcher.start()
+    try:
+        while True:
+            time.sleep(watcher.interval)
+            for name, processes in watcher.stats().items():
+                for proc in processes:
+                    print(f"{name:>15} {proc['pid']:>7}  {proc['cpu_percent']:5.1f}% CPU  "
+                          f"{proc['rss_mb']:7.1f} MB")
+    except KeyboardInterrupt:
+        watcher.stop()
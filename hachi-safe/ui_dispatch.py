@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+HACHI UI Dispatcher
+Queues Tk widget updates from worker threads and applies them on the Tk thread
+"""
+
+import threading
+import tkinter as tk
+
+class UiDispatcher:
+    """Coalescing widget update queue
+    
+    config() and call() may be used from any thread; nothing touches Tk
+    until the next flush, which runs on the Tk thread from a single after()
+    tick. Several config() calls for one widget before a flush merge into
+    one, and options that already hold the requested value are skipped, so
+    a status check that finds nothing new causes no redraw at all.
+    """
+    
+    def __init__(self, root, interval=50):
+        # Must be created on the Tk thread
+        self.root = root
+        self.interval = interval
+        self.stats = {"queued": 0, "applied": 0, "skipped": 0, "flushes": 0}
+        
+        self._pending = {}
+        self._calls = []
+        self._lock = threading.Lock()
+        self._tick = self.root.after(self.interval, self.flush)
+    
+    def config(self, widget, **options):
+        """Queue widget.config(**options); later values win"""
+        with self._lock:
+            self._pending.setdefault(widget, {}).update(options)
+            self.stats["queued"] += 1
+    
+    def call(self, func, *args):
+        """Queue func(*args) to run on the Tk thread, e.g. a dialog"""
+        with self._lock:
+            self._calls.append((func, args))
+    
+    def flush(self):
+        """Apply everything queued (Tk thread only)
+        
+        Runs from the after() tick; may also be called directly, e.g. right
+        after a view switch, so queued updates land before the next redraw.
+        """
+        if self._tick:
+            self.root.after_cancel(self._tick)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            calls, self._calls = self._calls, []
+        
+        if pending or calls:
+            self.stats["flushes"] += 1
+        
+        for widget, options in pending.items():
+            try:
+                changed = {key: value for key, value in options.items()
+                           if str(widget.cget(key)) != str(value)}
+                self.stats["skipped"] += len(options) - len(changed)
+                if changed:
+                    widget.config(**changed)
+                    self.stats["applied"] += len(changed)
+            except tk.TclError:
+                # Widget was destroyed (e.g. view switched) before the flush
+                pass
+        
+        for func, args in calls:
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"UI update failed: {e}")
+        
+        self._tick = self.root.after(self.interval, self.flush)
+    
+    def stop(self):
+        if self._tick:
+            self.root.after_cancel(self._tick)
+            self._tick = None
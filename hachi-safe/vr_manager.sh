@@ -17,6 +17,8 @@ MONADO_BIN="/usr/local/bin/monado-service"
 COSMOS_BRIDGE="/usr/local/bin/cosmos_bridge"
 COSMOS_MONITOR="/usr/local/bin/cosmos_monitor"
 LOG_DIR="$HOME/.local/share/vr-logs"
+LOG_VIEWER="$HOME/.local/bin/log_viewer.py"
+LOG_INDEX="$HOME/.local/bin/log_index.py"
 mkdir -p "$LOG_DIR"
 
 # Functions
@@ -158,49 +160,89 @@ monitor_devices() {
     fi
 }
 
+# Open a log in the HACHI log viewer (memory-mapped, follows appends);
+# less if the viewer isn't installed
+show_log() {
+    if [ -f "$LOG_VIEWER" ]; then
+        python3 "$LOG_VIEWER" "$1"
+    elif [ -f "./log_viewer.py" ]; then
+        python3 ./log_viewer.py "$1"
+    else
+        less "$1"
+    fi
+}
+
+# Last lines of each log, read from the end of the file
+tail_logs() {
+    if [ -f "$LOG_VIEWER" ]; then
+        python3 "$LOG_VIEWER" --tail 20 "$LOG_DIR/monado.log" "$LOG_DIR/steamvr.log" "$LOG_DIR/bridge.log"
+        return
+    fi
+    echo -e "\n${BLUE}=== Monado Log ===${NC}"
+    [ -f "$LOG_DIR/monado.log" ] && tail -n 20 "$LOG_DIR/monado.log"
+    echo -e "\n${BLUE}=== SteamVR Log ===${NC}"
+    [ -f "$LOG_DIR/steamvr.log" ] && tail -n 20 "$LOG_DIR/steamvr.log"
+    echo -e "\n${BLUE}=== Bridge Log ===${NC}"
+    [ -f "$LOG_DIR/bridge.log" ] && tail -n 20 "$LOG_DIR/bridge.log"
+    echo ""
+}
+
 view_logs() {
     echo -e "\n${YELLOW}Available logs:${NC}"
     echo "1. Monado log"
     echo "2. SteamVR log"
     echo "3. Bridge driver log"
     echo "4. All logs"
-    echo "5. Back to menu"
+    if [ -f "$LOG_INDEX" ]; then
+        echo "5. Search all logs"
+        echo "6. All logs around a time"
+    fi
+    echo "0. Back to menu"
     echo ""
     read -p "Choose log to view: " log_choice
     
     case $log_choice in
         1)
             if [ -f "$LOG_DIR/monado.log" ]; then
-                less "$LOG_DIR/monado.log"
+                show_log "$LOG_DIR/monado.log"
             else
                 echo "No Monado log found"
             fi
             ;;
         2)
             if [ -f "$LOG_DIR/steamvr.log" ]; then
-                less "$LOG_DIR/steamvr.log"
+                show_log "$LOG_DIR/steamvr.log"
             else
                 echo "No SteamVR log found"
             fi
             ;;
         3)
             if [ -f "$LOG_DIR/bridge.log" ]; then
-                less "$LOG_DIR/bridge.log"
+                show_log "$LOG_DIR/bridge.log"
             else
                 echo "No bridge log found"
             fi
             ;;
         4)
-            echo -e "\n${BLUE}=== Monado Log ===${NC}"
-            [ -f "$LOG_DIR/monado.log" ] && tail -n 20 "$LOG_DIR/monado.log"
-            echo -e "\n${BLUE}=== SteamVR Log ===${NC}"
-            [ -f "$LOG_DIR/steamvr.log" ] && tail -n 20 "$LOG_DIR/steamvr.log"
-            echo -e "\n${BLUE}=== Bridge Log ===${NC}"
-            [ -f "$LOG_DIR/bridge.log" ] && tail -n 20 "$LOG_DIR/bridge.log"
-            echo ""
+            tail_logs
             read -p "Press Enter to continue..."
             ;;
         5)
+            # Indexes new log data first, then searches every log at once
+            if [ -f "$LOG_INDEX" ]; then
+                read -p "Search for: " search_words
+                python3 "$LOG_INDEX" search $search_words
+                read -p "Press Enter to continue..."
+            fi
+            ;;
+        6)
+            if [ -f "$LOG_INDEX" ]; then
+                read -p "Time (e.g. 12:34:56.789): " log_time
+                python3 "$LOG_INDEX" around "$log_time" --window 500
+                read -p "Press Enter to continue..."
+            fi
+            ;;
+        0)
             return
             ;;
     esac
@@ -211,7 +253,7 @@ full_vr_session() {
     
     if ! check_device; then
         echo -e "${RED}Cannot start VR session without detected device${NC}"
-        read -p "Press Enter to continue..."
+        [ -n "$NONINTERACTIVE" ] || read -p "Press Enter to continue..."
         return 1
     fi
     
@@ -220,6 +262,9 @@ full_vr_session() {
     start_steamvr
     
     echo -e "\n${GREEN}VR session started!${NC}"
+    if [ -n "$NONINTERACTIVE" ]; then
+        return 0
+    fi
     echo -e "${YELLOW}When finished, choose 'Stop All Services' from the menu${NC}"
     read -p "Press Enter to continue..."
 }
@@ -258,6 +303,13 @@ print_menu() {
     echo ""
 }
 
+# Non-interactive quick start (hachid and scripts): vr_manager.sh full
+if [ "$1" = "full" ]; then
+    NONINTERACTIVE=1
+    full_vr_session
+    exit $?
+fi
+
 # Main loop
 while true; do
     print_header